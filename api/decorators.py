@@ -19,3 +19,17 @@ def require_role_editor(view_func):
         return view_func(request, *args, **kwargs)
 
     return wrapped
+
+
+def require_staff(view_func):
+    @wraps(view_func)
+    def wrapped(request, *args, **kwargs):
+        if not (request.user.is_authenticated and request.user.is_staff):
+            return json_error(
+                code="forbidden",
+                message="Доступно только сотрудникам.",
+                status=403,
+            )
+        return view_func(request, *args, **kwargs)
+
+    return wrapped
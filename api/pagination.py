@@ -0,0 +1,105 @@
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from .utils import json_error
+
+CURSOR_SALT = "api.cursor"
+FALSE_VALUES = {"0", "false", "no", "off"}
+
+
+def _invalid(message):
+    return None, None, json_error(code="validation_error", message=message, status=400)
+
+
+def _field_name(ordering_item):
+    return ordering_item.lstrip("-")
+
+
+def encode_cursor(obj, keyset_ordering):
+    values = []
+    for item in keyset_ordering:
+        value = getattr(obj, _field_name(item))
+        if value is None:
+            return None
+        values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+    return signing.dumps(values, salt=CURSOR_SALT, compress=True)
+
+
+def decode_cursor(token, model, keyset_ordering):
+    try:
+        values = signing.loads(token, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        return None
+    if not isinstance(values, list) or len(values) != len(keyset_ordering):
+        return None
+
+    try:
+        return [
+            model._meta.get_field(_field_name(item)).to_python(value)
+            for item, value in zip(keyset_ordering, values)
+        ]
+    except ValidationError:
+        return None
+
+
+def keyset_condition(keyset_ordering, values):
+    # (a, b) after (x, y) in DESC order: a < x OR (a = x AND b < y).
+    condition = Q()
+    equal = {}
+    for item, value in zip(keyset_ordering, values):
+        name = _field_name(item)
+        lookup = "lt" if item.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
+def paginate(request, queryset, keyset_ordering=None, default_page_size=10, max_page_size=50):
+    try:
+        page = int(request.GET.get("page", "1"))
+        page_size = int(request.GET.get("page_size", str(default_page_size)))
+    except ValueError:
+        return _invalid("Параметры page и page_size должны быть числами.")
+
+    page = max(page, 1)
+    page_size = max(1, min(page_size, max_page_size))
+    include_total = request.GET.get("include_total", "1").strip().lower() not in FALSE_VALUES
+
+    if "cursor" in request.GET:
+        if keyset_ordering is None:
+            return _invalid("Параметр cursor не поддерживается для выбранной сортировки.")
+
+        queryset = queryset.filter(
+            **{f"{_field_name(item)}__isnull": False for item in keyset_ordering}
+        )
+        window = queryset.order_by(*keyset_ordering)
+        token = request.GET.get("cursor", "").strip()
+        if token:
+            values = decode_cursor(token, queryset.model, keyset_ordering)
+            if values is None:
+                return _invalid("Некорректный параметр cursor.")
+            window = window.filter(keyset_condition(keyset_ordering, values))
+
+        rows = list(window[: page_size + 1])
+        pagination = {"page_size": page_size}
+    else:
+        start = (page - 1) * page_size
+        rows = list(queryset[start : start + page_size + 1])
+        pagination = {"page": page, "page_size": page_size}
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+
+    if include_total:
+        total = queryset.count()
+        pagination["total"] = total
+        if "page" in pagination:
+            pagination["pages"] = (total + page_size - 1) // page_size
+
+    pagination["has_more"] = has_more
+    if keyset_ordering is not None:
+        pagination["next_cursor"] = (
+            encode_cursor(rows[-1], keyset_ordering) if has_more and rows else None
+        )
+    return rows, pagination, None
@@ -1,3 +1,97 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from articles.models import Article
+from core.models import SyncRun
+from taxonomy.models import Category
+
+
+class ApiCursorPaginationTests(TestCase):
+    def setUp(self):
+        author = User.objects.create_user(username="api-author", password="pass12345")
+        self.category = Category.objects.create(name="API категория")
+        now = timezone.now()
+        self.articles = []
+        for index in range(5):
+            article = Article.objects.create(
+                title=f"API статья {index}",
+                content="Текст.",
+                kind=Article.KIND_SPORT,
+                status=Article.STATUS_PUBLISHED,
+                published_at=now - timedelta(hours=index // 2),
+                author=author,
+            )
+            article.categories.add(self.category)
+            self.articles.append(article)
+
+    def test_cursor_walks_all_articles_once(self):
+        url = reverse("api:articles_collection")
+        expected = list(
+            Article.objects.filter(categories=self.category)
+            .order_by("-published_at", "-id")
+            .values_list("id", flat=True)
+        )
+
+        seen = []
+        params = {"cursor": "", "page_size": 2, "category": self.category.slug}
+        while True:
+            data = self.client.get(url, params).json()["data"]
+            seen.extend(item["id"] for item in data["items"])
+            self.assertEqual(data["pagination"]["total"], 5)
+            if not data["pagination"]["has_more"]:
+                break
+            params["cursor"] = data["pagination"]["next_cursor"]
+
+        self.assertEqual(seen, expected)
+
+    def test_page_contract_and_total_opt_out(self):
+        url = reverse("api:articles_collection")
+        pagination = self.client.get(url, {"page": 2, "page_size": 2}).json()["data"]["pagination"]
+        self.assertEqual(pagination["page"], 2)
+        self.assertEqual(pagination["pages"], 3)
+
+        pagination = self.client.get(url, {"include_total": "0"}).json()["data"]["pagination"]
+        self.assertNotIn("total", pagination)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse("api:articles_collection"), {"cursor": "garbage"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_tournaments_list_paginates(self):
+        response = self.client.get(reverse("api:tournaments_list"), {"cursor": "", "page_size": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(response.json()["data"]["items"]), 1)
+
+
+class ApiSyncRunsTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        run = SyncRun.objects.create(
+            started_at=now - timedelta(seconds=3),
+            finished_at=now,
+            duration_seconds=3.0,
+            fetch_seconds=2.5,
+            write_seconds=0.4,
+            rows_created=12,
+        )
+        run.providers.create(provider="football", status="ok", fetch_seconds=2.5, http_requests=3)
+
+    def test_only_staff_can_read_sync_runs(self):
+        url = reverse("api:sync_runs")
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        User.objects.create_user(username="api-reader", password="pass12345")
+        self.client.login(username="api-reader", password="pass12345")
+        self.assertEqual(self.client.get(url).status_code, 403)
 
-# Create your tests here.
+        User.objects.create_user(username="api-staff", password="pass12345", is_staff=True)
+        self.client.login(username="api-staff", password="pass12345")
+        data = self.client.get(url, {"limit": 5}).json()["data"]
+        self.assertEqual(data["runs"][0]["rows"]["created"], 12)
+        self.assertEqual(data["runs"][0]["providers"]["football"]["http_requests"], 3)
+        self.assertEqual(data["percentiles"]["fetch_seconds"]["p99"], 2.5)
+        self.assertEqual(self.client.get(url, {"limit": "0"}).status_code, 400)
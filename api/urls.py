@@ -12,4 +12,5 @@ urlpatterns = [
     path("teams/", views.teams_list, name="teams_list"),
     path("tournaments/", views.tournaments_list, name="tournaments_list"),
     path("search/", views.global_search, name="search"),
+    path("sync/runs/", views.sync_runs, name="sync_runs"),
 ]
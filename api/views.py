@@ -1,13 +1,18 @@
-﻿from django.db.models import Count, Q
+﻿from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.views.decorators.csrf import csrf_exempt
 
 from articles.models import Article
+from articles.search import search_articles
 from core.utils import get_public_name
+from lib.sync_report import DEFAULT_LIMIT, MAX_LIMIT, sync_report
 from taxonomy.models import Category, Tag
 from teams.models import Team
 from tournaments.models import Tournament
 
-from .decorators import is_editor_or_staff, require_role_editor
+from .decorators import is_editor_or_staff, require_role_editor, require_staff
+from .pagination import paginate
 from .utils import json_error, json_ok, parse_json_body
 
 
@@ -39,6 +44,7 @@ def _serialize_article(article, request):
         "discipline": article.discipline,
         "status": article.status,
         "published_at": article.published_at.isoformat() if article.published_at else None,
+        "publish_at": article.publish_at.isoformat() if article.publish_at else None,
         "views_count": article.views_count,
         "author": {
             "username": article.author.username,
@@ -50,6 +56,18 @@ def _serialize_article(article, request):
     }
 
 
+def _parse_publish_at(value):
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(str(value))
+    except ValueError:
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
 def _validate_article_payload(payload, partial=False):
     errors = {}
 
@@ -76,6 +94,9 @@ def _validate_article_payload(payload, partial=False):
     if "status" in payload and payload.get("status") not in valid_statuses:
         errors["status"] = "Недопустимое значение status."
 
+    if payload.get("publish_at") and _parse_publish_at(payload["publish_at"]) is None:
+        errors["publish_at"] = "Поле publish_at должно быть датой в формате ISO 8601."
+
     if "category_slugs" in payload and not isinstance(payload.get("category_slugs"), list):
         errors["category_slugs"] = "Поле category_slugs должно быть списком."
 
@@ -123,21 +144,26 @@ def articles_collection(request):
         )
 
         q = request.GET.get("q", "").strip()
-        if q:
-            queryset = queryset.filter(
-                Q(title__icontains=q)
-                | Q(excerpt__icontains=q)
-                | Q(content__icontains=q)
-                | Q(author__username__icontains=q)
-            )
 
         category_slug = request.GET.get("category", "").strip()
         if category_slug:
-            queryset = queryset.filter(categories__slug=category_slug)
+            queryset = queryset.filter(
+                Exists(
+                    Article.categories.through.objects.filter(
+                        article_id=OuterRef("pk"), category__slug=category_slug
+                    )
+                )
+            )
 
         tag_slug = request.GET.get("tag", "").strip()
         if tag_slug:
-            queryset = queryset.filter(tags__slug=tag_slug)
+            queryset = queryset.filter(
+                Exists(
+                    Article.tags.through.objects.filter(
+                        article_id=OuterRef("pk"), tag__slug=tag_slug
+                    )
+                )
+            )
 
         kind = request.GET.get("kind", "").strip()
         valid_kinds = {choice[0] for choice in Article.CONTENT_KIND_CHOICES}
@@ -150,43 +176,31 @@ def articles_collection(request):
             queryset = queryset.filter(discipline=discipline)
 
         ordering = request.GET.get("ordering", "new").strip()
+        if ordering == "relevance" and not q:
+            ordering = "new"
+        queryset = search_articles(
+            queryset,
+            q,
+            extra_q=Q(author__username__icontains=q),
+            rank=ordering == "relevance",
+        )
+
+        keyset_ordering = None
         if ordering == "popular":
             queryset = queryset.order_by("-views_count", "-published_at")
-        else:
+        elif ordering != "relevance":
             ordering = "new"
-            queryset = queryset.order_by("-published_at", "-id")
-
-        queryset = queryset.distinct()
-
-        try:
-            page = int(request.GET.get("page", "1"))
-            page_size = int(request.GET.get("page_size", "10"))
-        except ValueError:
-            return json_error(
-                code="validation_error",
-                message="Параметры page и page_size должны быть числами.",
-                status=400,
-            )
-
-        page = max(page, 1)
-        page_size = max(1, min(page_size, 50))
+            keyset_ordering = ("-published_at", "-id")
+            queryset = queryset.order_by(*keyset_ordering)
 
-        total = queryset.count()
-        pages = (total + page_size - 1) // page_size
-        start = (page - 1) * page_size
-        end = start + page_size
-
-        items = [_serialize_article(article, request) for article in queryset[start:end]]
+        articles, pagination, error_response = paginate(request, queryset, keyset_ordering)
+        if error_response:
+            return error_response
 
         return json_ok(
             {
-                "items": items,
-                "pagination": {
-                    "page": page,
-                    "page_size": page_size,
-                    "total": total,
-                    "pages": pages,
-                },
+                "items": [_serialize_article(article, request) for article in articles],
+                "pagination": pagination,
             }
         )
 
@@ -229,6 +243,7 @@ def articles_collection(request):
         kind=payload.get("kind"),
         discipline=str(payload.get("discipline") or "").strip(),
         status=payload.get("status") or Article.STATUS_DRAFT,
+        publish_at=_parse_publish_at(payload.get("publish_at")),
         is_featured=bool(payload.get("is_featured", False)),
         author=request.user,
     )
@@ -330,7 +345,16 @@ def article_by_pk(request, pk):
             details=taxonomy_errors,
         )
 
-    editable_fields = ["title", "excerpt", "content", "kind", "discipline", "status", "is_featured"]
+    editable_fields = [
+        "title",
+        "excerpt",
+        "content",
+        "kind",
+        "discipline",
+        "status",
+        "publish_at",
+        "is_featured",
+    ]
     for field in editable_fields:
         if field not in payload:
             continue
@@ -340,6 +364,8 @@ def article_by_pk(request, pk):
             value = str(value or "").strip()
         if field == "is_featured":
             value = bool(value)
+        if field == "publish_at":
+            value = _parse_publish_at(value)
         setattr(article, field, value)
 
     article.save()
@@ -374,6 +400,16 @@ def teams_list(request):
     if discipline in valid_disciplines:
         queryset = queryset.filter(discipline=discipline)
 
+    teams, pagination, error_response = paginate(
+        request,
+        queryset.order_by("name", "id"),
+        keyset_ordering=("name", "id"),
+        default_page_size=50,
+        max_page_size=100,
+    )
+    if error_response:
+        return error_response
+
     items = [
         {
             "id": team.id,
@@ -385,17 +421,17 @@ def teams_list(request):
             "logo_url": _file_url(request, team.logo),
             "players_count": team.players_count,
         }
-        for team in queryset.order_by("name")
+        for team in teams
     ]
 
-    return json_ok({"items": items})
+    return json_ok({"items": items, "pagination": pagination})
 
 
 def tournaments_list(request):
     if request.method != "GET":
         return _method_not_allowed()
 
-    queryset = Tournament.objects.annotate(matches_count=Count("matches"))
+    queryset = Tournament.objects.annotate(matches_count_db=Count("matches"))
 
     kind = request.GET.get("kind", "").strip()
     valid_kinds = {choice[0] for choice in Tournament.CONTENT_KIND_CHOICES}
@@ -407,6 +443,16 @@ def tournaments_list(request):
     if discipline in valid_disciplines:
         queryset = queryset.filter(discipline=discipline)
 
+    tournaments, pagination, error_response = paginate(
+        request,
+        queryset.order_by("-start_date", "-id"),
+        keyset_ordering=("-start_date", "-id"),
+        default_page_size=50,
+        max_page_size=100,
+    )
+    if error_response:
+        return error_response
+
     items = [
         {
             "id": tournament.id,
@@ -417,12 +463,12 @@ def tournaments_list(request):
             "start_date": tournament.start_date.isoformat() if tournament.start_date else None,
             "end_date": tournament.end_date.isoformat() if tournament.end_date else None,
             "location": tournament.location,
-            "matches_count": tournament.matches_count,
+            "matches_count": tournament.display_matches_count,
         }
-        for tournament in queryset.order_by("-start_date")
+        for tournament in tournaments
     ]
 
-    return json_ok({"items": items})
+    return json_ok({"items": items, "pagination": pagination})
 
 
 def global_search(request):
@@ -437,11 +483,11 @@ def global_search(request):
             status=400,
         )
 
-    articles = (
-        Article.objects.filter(status=Article.STATUS_PUBLISHED)
-        .filter(Q(title__icontains=q) | Q(excerpt__icontains=q) | Q(content__icontains=q))
-        .order_by("-published_at")[:5]
-    )
+    articles = search_articles(
+        Article.objects.filter(status=Article.STATUS_PUBLISHED),
+        q,
+        rank=True,
+    )[:5]
     teams = Team.objects.filter(name__icontains=q).order_by("name")[:5]
     tournaments = Tournament.objects.filter(name__icontains=q).order_by("-start_date")[:5]
 
@@ -456,6 +502,22 @@ def global_search(request):
     )
 
 
+@require_staff
+def sync_runs(request):
+    if request.method != "GET":
+        return _method_not_allowed()
+
+    limit = request.GET.get("limit", "").strip() or str(DEFAULT_LIMIT)
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+        return json_error(
+            code="validation_error",
+            message=f"Параметр limit должен быть числом от 1 до {MAX_LIMIT}.",
+            status=400,
+        )
+
+    return json_ok(sync_report(int(limit)))
+
+
 def api_root(request):
     if request.method != "GET":
         return _method_not_allowed()
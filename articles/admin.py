@@ -52,7 +52,7 @@ class ArticleAdmin(admin.ModelAdmin):
         (
             "Публикация",
             {
-                "fields": ("status", "published_at"),
+                "fields": ("status", "publish_at", "published_at"),
             },
         ),
         (
@@ -68,9 +68,10 @@ class ArticleAdmin(admin.ModelAdmin):
     @admin.action(description="Опубликовать выбранные статьи")
     def action_publish(self, request, queryset):
         now = timezone.now()
-        queryset.filter(status=Article.STATUS_DRAFT).update(
+        queryset.exclude(status=Article.STATUS_PUBLISHED).update(
             status=Article.STATUS_PUBLISHED,
             published_at=now,
+            publish_at=None,
         )
         queryset.filter(status=Article.STATUS_PUBLISHED, published_at__isnull=True).update(
             published_at=now,
@@ -78,7 +79,7 @@ class ArticleAdmin(admin.ModelAdmin):
 
     @admin.action(description="Снять с публикации выбранные статьи")
     def action_unpublish(self, request, queryset):
-        queryset.update(status=Article.STATUS_DRAFT)
+        queryset.update(status=Article.STATUS_DRAFT, publish_at=None)
 
     def get_queryset(self, request):
         queryset = super().get_queryset(request)
@@ -4,3 +4,6 @@
 class ArticlesConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "articles"
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from articles.models import Article
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored placeholder discipline of articles from their text and taxonomy."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        changed = Article.refresh_placeholder_disciplines(batch_size=max(1, options["batch_size"]))
+        self.stdout.write(
+            self.style.SUCCESS(f"backfill_placeholder_disciplines finished: changed={changed}")
+        )
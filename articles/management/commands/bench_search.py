@@ -0,0 +1,128 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from articles.models import Article
+from articles.search import search_articles, search_backend, update_search_index
+
+VOCABULARY = (
+    "футбол матч турнир команда сборная чемпионат кубок финал полуфинал игрок тренер "
+    "гол победа поражение ничья сезон лига баскетбол хоккей бокс борьба теннис "
+    "киберспорт dota cs2 pubg major квалификация стадион болельщики трансфер "
+    "Астана Алматы Шымкент Қазақстан жарыс ойыншы жеңіс командасы чемпионаты"
+).split()
+SYLLABLES = "ка ра на та ла ма са ба да жа ко ро но то ло мо со бо до ки ри ни ти ли".split()
+THEMED_WORD_SHARE = 0.02
+BATCH_SIZE = 2000
+
+
+class Command(BaseCommand):
+    help = "Compare full-text search against the icontains scan on synthetic articles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            nargs="+",
+            type=int,
+            default=[10000, 100000],
+            help="Archive sizes to benchmark (default: 10000 100000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Runs per query, the median is reported (default: 5).",
+        )
+        parser.add_argument(
+            "--query",
+            action="append",
+            dest="queries",
+            help="Search phrase (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        queries = options["queries"] or ["чемпионат", "Астана финал", "жеңіс"]
+        repeat = max(options["repeat"], 1)
+        sizes = sorted(set(size for size in options["sizes"] if size > 0))
+        self.stdout.write(f"bench_search: backend={search_backend()}, repeat={repeat}")
+
+        # Everything is generated inside a transaction that is rolled back at the end.
+        with transaction.atomic():
+            author = get_user_model().objects.create_user(username="bench_search_author")
+            created = 0
+            for size in sizes:
+                created = self._generate(author, created, size)
+                for query in queries:
+                    scan_ms = self._measure(repeat, lambda: self._icontains(query))
+                    index_ms = self._measure(repeat, lambda: self._indexed(query))
+                    self.stdout.write(
+                        f"size={size:>7} query={query!r:<18} "
+                        f"icontains={scan_ms:8.2f}ms index={index_ms:8.2f}ms "
+                        f"speedup=x{scan_ms / index_ms if index_ms else 0:.1f}"
+                    )
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS("bench_search finished, synthetic rows rolled back."))
+
+    def _text(self, rng, filler, words):
+        return " ".join(
+            rng.choice(VOCABULARY) if rng.random() < THEMED_WORD_SHARE else rng.choice(filler)
+            for _ in range(words)
+        )
+
+    def _generate(self, author, start, size):
+        rng = random.Random(size)
+        filler = ["".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(5000)]
+        now = timezone.now()
+        for offset in range(start, size, BATCH_SIZE):
+            batch = []
+            for index in range(offset, min(offset + BATCH_SIZE, size)):
+                batch.append(
+                    Article(
+                        title=self._text(rng, filler, 8),
+                        slug=f"bench-search-{index}",
+                        excerpt=self._text(rng, filler, 25),
+                        content=self._text(rng, filler, 300),
+                        kind=Article.KIND_SPORT,
+                        status=Article.STATUS_PUBLISHED,
+                        published_at=now,
+                        author=author,
+                    )
+                )
+            created = Article.objects.bulk_create(batch)
+            update_search_index([article.pk for article in created])
+        return size
+
+    def _published(self):
+        return Article.objects.filter(status=Article.STATUS_PUBLISHED)
+
+    def _icontains(self, query):
+        return list(
+            self._published()
+            .filter(
+                Q(title__icontains=query)
+                | Q(excerpt__icontains=query)
+                | Q(content__icontains=query)
+            )
+            .order_by("-published_at", "-id")
+            .values_list("pk", flat=True)[:20]
+        )
+
+    def _indexed(self, query):
+        return list(
+            search_articles(self._published(), query, rank=True).values_list("pk", flat=True)[:20]
+        )
+
+    def _measure(self, repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        return statistics.median(timings)
@@ -0,0 +1,57 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from articles.models import Article
+
+
+class Command(BaseCommand):
+    help = "Publish scheduled articles whose publish_at is due."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Keep running and publish due articles every --interval seconds.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=30,
+            help="Seconds between checks in --loop mode (default: 30).",
+        )
+
+    def handle(self, *args, **options):
+        if not options["loop"]:
+            self._tick()
+            return
+
+        interval = max(options["interval"], 1)
+        self._stopping = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        self.stdout.write(f"publish_scheduled: loop started, interval={interval}s")
+
+        while not self._stopping:
+            close_old_connections()
+            self._tick()
+            deadline = time.monotonic() + interval
+            while not self._stopping and time.monotonic() < deadline:
+                time.sleep(min(1, interval))
+
+        self.stdout.write("publish_scheduled: stopped")
+
+    def _request_stop(self, signum, frame):
+        self._stopping = True
+
+    def _tick(self):
+        published_ids = Article.publish_due()
+        repaired = Article.sanitize_published_timestamps()
+        if published_ids or repaired:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"publish_scheduled: published={len(published_ids)}, repaired={repaired}"
+                )
+            )
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from articles.search import rebuild_search_index, search_backend
+
+
+class Command(BaseCommand):
+    help = "Backfill the article full-text search index (tsvector or FTS5)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Articles per UPDATE/INSERT batch (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        backend = search_backend()
+        if backend == "icontains":
+            self.stdout.write(
+                self.style.WARNING("Search index is not available for this database, skipping.")
+            )
+            return
+
+        indexed = rebuild_search_index(batch_size=max(options["batch_size"], 1))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"rebuild_search_index finished: backend={backend}, articles={indexed}"
+            )
+        )
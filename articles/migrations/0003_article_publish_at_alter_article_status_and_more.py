@@ -0,0 +1,27 @@
+# Generated by Django 4.2.28 on 2026-10-17 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0002_alter_article_discipline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='article',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Черновик'), ('scheduled', 'Запланировано'), ('published', 'Опубликовано')], default='draft', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', 'publish_at'], name='articles_ar_status_9815d6_idx'),
+        ),
+    ]
@@ -0,0 +1,58 @@
+from django.db import migrations
+
+ARTICLE_TABLE = "articles_article"
+FTS_TABLE = "articles_article_fts"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            f"ALTER TABLE {ARTICLE_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector"
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {ARTICLE_TABLE}_search_vector_gin "
+            f"ON {ARTICLE_TABLE} USING GIN (search_vector)"
+        )
+        schema_editor.execute(f"""
+            UPDATE {ARTICLE_TABLE} SET search_vector =
+                setweight(to_tsvector('russian', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+                || setweight(to_tsvector('russian', coalesce(excerpt, '')), 'B')
+                || setweight(to_tsvector('simple', coalesce(excerpt, '')), 'B')
+                || setweight(to_tsvector('russian', coalesce(content, '')), 'C')
+                || setweight(to_tsvector('simple', coalesce(content, '')), 'D')
+            """)
+    elif vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                "title, excerpt, content, tokenize = 'unicode61 remove_diacritics 2')"
+            )
+        except Exception:
+            # SQLite built without FTS5: search falls back to icontains.
+            return
+        schema_editor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) "
+            f"SELECT id, title, excerpt, content FROM {ARTICLE_TABLE}"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {ARTICLE_TABLE}_search_vector_gin")
+        schema_editor.execute(f"ALTER TABLE {ARTICLE_TABLE} DROP COLUMN IF EXISTS search_vector")
+    elif vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0003_article_publish_at_alter_article_status_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0004_article_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="image_url",
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+    ]
@@ -0,0 +1,103 @@
+# Generated by Django 4.2.28 on 2026-10-17 17:50
+
+import re
+
+from django.db import migrations, models
+
+# Frozen copy of articles.placeholders as of this migration, so later edits to the keyword map
+# do not change what it writes.
+PLACEHOLDER_DISCIPLINES = {
+    "football",
+    "basketball",
+    "athletics",
+    "volleyball",
+    "boxing",
+    "wrestling",
+    "hockey",
+    "futsal",
+    "tennis",
+    "cs2",
+    "dota2",
+    "pubg",
+}
+KEYWORD_MAP = {
+    "football": "football",
+    "футбол": "football",
+    "basketball": "basketball",
+    "баскетбол": "basketball",
+    "athletics": "athletics",
+    "легкая атлетика": "athletics",
+    "лёгкая атлетика": "athletics",
+    "марафон": "athletics",
+    "бег": "athletics",
+    "volleyball": "volleyball",
+    "волейбол": "volleyball",
+    "boxing": "boxing",
+    "бокс": "boxing",
+    "wrestling": "wrestling",
+    "борьба": "wrestling",
+    "греко-римская": "wrestling",
+    "вольная борьба": "wrestling",
+    "hockey": "hockey",
+    "хоккей": "hockey",
+    "futsal": "futsal",
+    "футзал": "futsal",
+    "tennis": "tennis",
+    "теннис": "tennis",
+    "cs2": "cs2",
+    "counter-strike": "cs2",
+    "dota2": "dota2",
+    "dota 2": "dota2",
+    "pubg": "pubg",
+}
+KEYWORD_PRIORITY = {keyword: index for index, keyword in enumerate(KEYWORD_MAP)}
+KEYWORD_PATTERN = re.compile(
+    "(?=("
+    + "|".join(re.escape(keyword) for keyword in sorted(KEYWORD_MAP, key=len, reverse=True))
+    + "))"
+)
+
+
+def resolve_placeholder_discipline(discipline, texts):
+    discipline = (discipline or "").strip().lower()
+    if discipline in PLACEHOLDER_DISCIPLINES:
+        return discipline
+
+    haystack = " ".join(str(text).lower() for text in texts if text)
+    found = {match.group(1) for match in KEYWORD_PATTERN.finditer(haystack)}
+    if not found:
+        return "default"
+    return KEYWORD_MAP[min(found, key=KEYWORD_PRIORITY.__getitem__)]
+
+
+def backfill_placeholder_discipline(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+    changed = []
+    for article in Article.objects.prefetch_related("categories", "tags").iterator(chunk_size=500):
+        article.placeholder_discipline = resolve_placeholder_discipline(
+            article.discipline,
+            [
+                article.title,
+                article.excerpt,
+                *(category.name for category in article.categories.all()),
+                *(tag.name for tag in article.tags.all()),
+            ],
+        )
+        changed.append(article)
+    Article.objects.bulk_update(changed, ["placeholder_discipline"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0005_article_image_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="article",
+            name="placeholder_discipline",
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_placeholder_discipline, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+import posixpath
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+# Frozen copy of articles.models.NEWS_IMAGE_BY_TITLE (demo news images) as of this migration.
+NEWS_IMAGE_BY_TITLE = {
+    "сборная казахстана объявила расширенный состав на мартовский сбор перед отбором чм-2026": "https://images.unsplash.com/photo-1431324155629-1a6deb1dec8d?auto=format&fit=crop&w=1600&q=80",
+    "кпл: «астана» и «шымкент юнайтед» открывают весенний тур центральным матчем недели": "https://images.unsplash.com/photo-1574629810360-7efbbe195018?auto=format&fit=crop&w=1600&q=80",
+    "суперлига казахстана: «алматы хуперс» удержали лидерство после сложного выезда в караганду": "https://images.unsplash.com/photo-1546519638-68e109498ffc?auto=format&fit=crop&w=1600&q=80",
+    "cs2: qazaq wolves вышли в плей-офф kz esports league с первого места группы": "https://images.unsplash.com/photo-1542751110-97427bbecf20?auto=format&fit=crop&w=1600&q=80",
+    "cs2: aktobe rush усилили штаб аналитиком перед решающей стадией сезона": "https://images.unsplash.com/photo-1511512578047-dfb367046420?auto=format&fit=crop&w=1600&q=80",
+    "dota 2: объявлены группы central asia dota cup, казахстанские команды в разных корзинах": "https://images.unsplash.com/photo-1511882150382-421056c89033?auto=format&fit=crop&w=1600&q=80",
+    "dota 2: steppe titans назначили нового капитана перед весенним циклом": "https://images.unsplash.com/photo-1552820728-8b83bb6b773f?auto=format&fit=crop&w=1600&q=80",
+    "pubg: nomad fire прошли в следующий этап pubg continental series": "https://images.unsplash.com/photo-1534423861386-85a16f5d13fd?auto=format&fit=crop&w=1600&q=80",
+    "pubg: казахстанские команды начали совместный lan-буткемп перед международным блоком": "https://images.unsplash.com/photo-1560253023-3ec5d502959f?auto=format&fit=crop&w=1600&q=80",
+    "кубок казахстана по баскетболу: определены пары final four": "https://images.unsplash.com/photo-1546519638-68e109498ffc?auto=format&fit=crop&w=1600&q=80",
+    "кпл: молодые игроки получают больше минут в стартовых турах весны": "https://images.unsplash.com/photo-1543326727-cf6c39e8f84c?auto=format&fit=crop&w=1600&q=80",
+    "весенний календарь kz arena: главные матчи и турниры казахстана в одном гиде": "https://images.unsplash.com/photo-1461896836934-ffe607ba8211?auto=format&fit=crop&w=1800&q=80",
+}
+
+
+def _existing_names(storage, names):
+    existing = set()
+    by_directory = {}
+    for name in names:
+        if name:
+            by_directory.setdefault(posixpath.dirname(name), set()).add(name)
+    for directory, wanted in by_directory.items():
+        try:
+            _, files = storage.listdir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        existing.update(wanted & {posixpath.join(directory, file_name) for file_name in files})
+    return existing
+
+
+def _backfill_urls(model, file_field, url_field, fallback=None):
+    storage = model._meta.get_field(file_field).storage
+    names = model.objects.exclude(**{f"{file_field}__isnull": True}).exclude(**{file_field: ""})
+    existing_names = _existing_names(storage, set(names.values_list(file_field, flat=True)))
+    changed = []
+    for instance in model.objects.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+        field_file = getattr(instance, file_field)
+        url = ""
+        if field_file and field_file.name in existing_names:
+            try:
+                url = field_file.url
+            except Exception:
+                url = ""
+        if not url and fallback is not None:
+            url = fallback(instance)
+        if url != getattr(instance, url_field):
+            setattr(instance, url_field, url)
+            changed.append(instance)
+    model.objects.bulk_update(changed, [url_field], batch_size=BATCH_SIZE)
+
+
+def _title_image(article):
+    return NEWS_IMAGE_BY_TITLE.get((article.title or "").strip().lower()) or ""
+
+
+def backfill_image_url(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+    _backfill_urls(Article, "cover", "image_url", fallback=_title_image)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("articles", "0006_article_placeholder_discipline"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_image_url, migrations.RunPython.noop),
+    ]
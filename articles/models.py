@@ -2,10 +2,21 @@ from datetime import timedelta
 
 from django.conf import settings
 from django.db import models
+from django.db.models import F
 from django.urls import reverse
 from django.utils import timezone
 
-from core.utils import generate_unique_slug
+from core.data.news import NEWS_ITEMS
+from core.utils import generate_unique_slug, resolve_file_url
+
+from .placeholders import resolve_placeholder_discipline
+from .signals import articles_published
+
+NEWS_IMAGE_BY_TITLE = {
+    str(item.get("title") or "").strip().lower(): item.get("image")
+    for item in NEWS_ITEMS
+    if item.get("title") and item.get("image")
+}
 
 
 class Article(models.Model):
@@ -44,9 +55,11 @@ class Article(models.Model):
     ]
 
     STATUS_DRAFT = "draft"
+    STATUS_SCHEDULED = "scheduled"
     STATUS_PUBLISHED = "published"
     STATUS_CHOICES = [
         (STATUS_DRAFT, "Черновик"),
+        (STATUS_SCHEDULED, "Запланировано"),
         (STATUS_PUBLISHED, "Опубликовано"),
     ]
 
@@ -56,8 +69,10 @@ class Article(models.Model):
     content = models.TextField()
     kind = models.CharField(max_length=20, choices=CONTENT_KIND_CHOICES)
     discipline = models.CharField(max_length=20, choices=DISCIPLINE_CHOICES, blank=True)
+    placeholder_discipline = models.CharField(max_length=20, blank=True, editable=False)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_DRAFT)
     cover = models.ImageField(upload_to="covers/", blank=True, null=True)
+    image_url = models.CharField(max_length=500, blank=True, editable=False)
     author = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.PROTECT,
@@ -66,6 +81,7 @@ class Article(models.Model):
     categories = models.ManyToManyField("taxonomy.Category", blank=True, related_name="articles")
     tags = models.ManyToManyField("taxonomy.Tag", blank=True, related_name="articles")
     published_at = models.DateTimeField(blank=True, null=True)
+    publish_at = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     views_count = models.PositiveIntegerField(default=0)
@@ -79,6 +95,7 @@ class Article(models.Model):
             models.Index(fields=["status", "-published_at"]),
             models.Index(fields=["kind", "discipline"]),
             models.Index(fields=["is_featured"]),
+            models.Index(fields=["status", "publish_at"]),
         ]
 
     @property
@@ -107,15 +124,95 @@ class Article(models.Model):
         ).update(published_at=current_now)
         return missing_count + future_count
 
+    @classmethod
+    def publish_due(cls, now=None):
+        current_now = now or timezone.now()
+        due_ids = list(
+            cls.objects.filter(
+                status=cls.STATUS_SCHEDULED,
+                publish_at__lte=current_now,
+            ).values_list("pk", flat=True)
+        )
+        if not due_ids:
+            return []
+
+        cls.objects.filter(pk__in=due_ids, status=cls.STATUS_SCHEDULED).update(
+            status=cls.STATUS_PUBLISHED,
+            published_at=F("publish_at"),
+            publish_at=None,
+            updated_at=current_now,
+        )
+        articles_published.send(sender=cls, article_ids=due_ids)
+        return due_ids
+
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = generate_unique_slug(self, self.title)
 
+        if self.status == self.STATUS_SCHEDULED:
+            if self.publish_at is None:
+                self.status = self.STATUS_DRAFT
+            elif self.publish_at <= timezone.now():
+                self.status = self.STATUS_PUBLISHED
+                self.published_at = self.publish_at
+
+        update_fields = kwargs.get("update_fields")
         if self.status == self.STATUS_PUBLISHED:
             self.published_at = self.normalize_publication_datetime(self.published_at)
+            # A published article has no schedule left; a stale one would reschedule it later.
+            self.publish_at = None
+            if update_fields is not None and "status" in update_fields:
+                kwargs["update_fields"] = update_fields = {*update_fields, "publish_at"}
+
+        if update_fields is None or {"cover", "title"} & set(update_fields):
+            self.image_url = self.resolve_image_url()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "image_url"}
+        if update_fields is None or {"discipline", "title", "excerpt"} & set(update_fields):
+            self.placeholder_discipline = self.resolve_placeholder_discipline()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], "placeholder_discipline"}
 
         super().save(*args, **kwargs)
 
+    def resolve_placeholder_discipline(self, category_names=None, tag_names=None):
+        if self.pk and category_names is None:
+            category_names = self.categories.values_list("name", flat=True)
+        if self.pk and tag_names is None:
+            tag_names = self.tags.values_list("name", flat=True)
+        return resolve_placeholder_discipline(
+            self.discipline,
+            [self.title, self.excerpt, *(category_names or ()), *(tag_names or ())],
+        )
+
+    @classmethod
+    def refresh_placeholder_disciplines(cls, article_ids=None, batch_size=500):
+        queryset = cls.objects.order_by("pk").prefetch_related("categories", "tags")
+        if article_ids is not None:
+            queryset = queryset.filter(pk__in=list(article_ids))
+
+        now = timezone.now()
+        changed = []
+        for article in queryset.iterator(chunk_size=batch_size):
+            value = article.resolve_placeholder_discipline(
+                [category.name for category in article.categories.all()],
+                [tag.name for tag in article.tags.all()],
+            )
+            if value != article.placeholder_discipline:
+                article.placeholder_discipline = value
+                article.updated_at = now
+                changed.append(article)
+
+        cls.objects.bulk_update(
+            changed, ["placeholder_discipline", "updated_at"], batch_size=batch_size
+        )
+        return len(changed)
+
+    def resolve_image_url(self, existing_names=None):
+        return resolve_file_url(self.cover, existing_names) or (
+            NEWS_IMAGE_BY_TITLE.get((self.title or "").strip().lower()) or ""
+        )
+
     def get_absolute_url(self):
         return reverse("articles:news_detail", kwargs={"slug": self.slug})
 
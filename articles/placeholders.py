@@ -0,0 +1,74 @@
+import re
+
+PLACEHOLDER_BY_DISCIPLINE = {
+    "football": "placeholders/news/football.svg",
+    "basketball": "placeholders/news/basketball.svg",
+    "athletics": "placeholders/news/default.svg",
+    "volleyball": "placeholders/news/default.svg",
+    "boxing": "placeholders/news/default.svg",
+    "wrestling": "placeholders/news/default.svg",
+    "hockey": "placeholders/news/default.svg",
+    "futsal": "placeholders/news/default.svg",
+    "tennis": "placeholders/news/default.svg",
+    "cs2": "placeholders/news/cs2.svg",
+    "dota2": "placeholders/news/dota2.svg",
+    "pubg": "placeholders/news/pubg.svg",
+}
+
+KEYWORD_MAP = {
+    "football": "football",
+    "футбол": "football",
+    "basketball": "basketball",
+    "баскетбол": "basketball",
+    "athletics": "athletics",
+    "легкая атлетика": "athletics",
+    "лёгкая атлетика": "athletics",
+    "марафон": "athletics",
+    "бег": "athletics",
+    "volleyball": "volleyball",
+    "волейбол": "volleyball",
+    "boxing": "boxing",
+    "бокс": "boxing",
+    "wrestling": "wrestling",
+    "борьба": "wrestling",
+    "греко-римская": "wrestling",
+    "вольная борьба": "wrestling",
+    "hockey": "hockey",
+    "хоккей": "hockey",
+    "futsal": "futsal",
+    "футзал": "futsal",
+    "tennis": "tennis",
+    "теннис": "tennis",
+    "cs2": "cs2",
+    "counter-strike": "cs2",
+    "dota2": "dota2",
+    "dota 2": "dota2",
+    "pubg": "pubg",
+}
+
+DEFAULT_PLACEHOLDER = "placeholders/news/default.svg"
+
+_KEYWORD_PRIORITY = {keyword: index for index, keyword in enumerate(KEYWORD_MAP)}
+# One pass over the text: the lookahead reports every, possibly overlapping, occurrence and the
+# earliest KEYWORD_MAP entry wins, exactly like checking the keywords one by one.
+KEYWORD_PATTERN = re.compile(
+    "(?=("
+    + "|".join(re.escape(keyword) for keyword in sorted(KEYWORD_MAP, key=len, reverse=True))
+    + "))"
+)
+
+
+def resolve_placeholder_discipline(discipline, texts):
+    discipline = (discipline or "").strip().lower()
+    if discipline in PLACEHOLDER_BY_DISCIPLINE:
+        return discipline
+
+    haystack = " ".join(str(text).lower() for text in texts if text)
+    found = {match.group(1) for match in KEYWORD_PATTERN.finditer(haystack)}
+    if not found:
+        return "default"
+    return KEYWORD_MAP[min(found, key=_KEYWORD_PRIORITY.__getitem__)]
+
+
+def placeholder_path(discipline):
+    return PLACEHOLDER_BY_DISCIPLINE.get(discipline, DEFAULT_PLACEHOLDER)
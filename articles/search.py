@@ -0,0 +1,185 @@
+import re
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.expressions import RawSQL
+
+from .models import Article
+
+ARTICLE_TABLE = Article._meta.db_table
+FTS_TABLE = f"{ARTICLE_TABLE}_fts"
+PG_VECTOR_COLUMN = "search_vector"
+
+# Weights: title > excerpt > content. PostgreSQL has no Kazakh snowball stemmer, so every
+# field is indexed twice: stemmed with the "russian" config and verbatim with "simple".
+PG_DOCUMENT_SQL = """
+    setweight(to_tsvector('russian', coalesce(title, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(title, '')), 'A')
+    || setweight(to_tsvector('russian', coalesce(excerpt, '')), 'B')
+    || setweight(to_tsvector('simple', coalesce(excerpt, '')), 'B')
+    || setweight(to_tsvector('russian', coalesce(content, '')), 'C')
+    || setweight(to_tsvector('simple', coalesce(content, '')), 'D')
+"""
+PG_QUERY_SQL = "(websearch_to_tsquery('russian', %s) || websearch_to_tsquery('simple', %s))"
+FTS_BM25_WEIGHTS = "10.0, 4.0, 1.0"
+FTS_RANK_CANDIDATES = 200
+
+# FTS5 has no Russian/Kazakh stemmer: query terms are reduced by suffix stripping and
+# matched as prefixes, which covers the common inflected forms of both languages.
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_RUSSIAN_SUFFIXES = (
+    "ами ями ого его ому ему ыми ими ой ей ий ый ая яя ое ее ов ев ах ях ам ям ом ем "
+    "ия ие ию ии а я ы и у ю е о"
+).split()
+_KAZAKH_SUFFIXES = (
+    "лар лер дар дер тар тер ның нің дың дің тың тің дан ден тан тен нан нен "
+    "ға ге қа ке да де та те ны ні ды ді ты ті"
+).split()
+_SUFFIXES = sorted(set(_RUSSIAN_SUFFIXES + _KAZAKH_SUFFIXES), key=len, reverse=True)
+_MIN_STEM_LENGTH = 4
+_FTS_TABLE_PRESENT = {}
+
+
+def _stem(token):
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= _MIN_STEM_LENGTH:
+            return token[: -len(suffix)]
+    return token
+
+
+def _fts_match_expression(query):
+    tokens = [_stem(token) for token in _WORD_RE.findall(query.lower())]
+    return " ".join(f'"{token}"*' for token in tokens if token)
+
+
+def _sqlite_rank_expression(match, queryset):
+    # A correlated bm25() subquery re-runs MATCH for every row, so FTS5 ranks the best
+    # candidates once and the ORDER BY maps them to positions; the rest sort by date. The
+    # candidates are taken among the rows of the already filtered queryset, so kind,
+    # discipline or category filters never push its matches out of the ranked set.
+    ids_sql, ids_params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"AND rowid IN ({ids_sql}) "
+            f"ORDER BY bm25({FTS_TABLE}, {FTS_BM25_WEIGHTS}) LIMIT %s",
+            [match, *ids_params, FTS_RANK_CANDIDATES],
+        )
+        ranked_ids = [row[0] for row in cursor.fetchall()]
+    if not ranked_ids:
+        return Value(0, output_field=IntegerField())
+    return Case(
+        *[
+            When(pk=pk, then=Value(len(ranked_ids) - position))
+            for position, pk in enumerate(ranked_ids)
+        ],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def search_backend():
+    if connection.vendor == "postgresql":
+        return "postgresql"
+    if connection.vendor == "sqlite":
+        db_name = str(connection.settings_dict["NAME"])
+        if db_name not in _FTS_TABLE_PRESENT:
+            _FTS_TABLE_PRESENT[db_name] = FTS_TABLE in connection.introspection.table_names()
+        if _FTS_TABLE_PRESENT[db_name]:
+            return "sqlite"
+    return "icontains"
+
+
+def search_articles(queryset, query, extra_q=None, rank=False):
+    query = (query or "").strip()
+    if not query:
+        return queryset
+
+    backend = search_backend()
+    if backend == "postgresql":
+        condition = Q(
+            pk__in=RawSQL(
+                f"SELECT id FROM {ARTICLE_TABLE} WHERE {PG_VECTOR_COLUMN} @@ {PG_QUERY_SQL}",
+                (query, query),
+            )
+        )
+        rank_sql = RawSQL(
+            f"ts_rank_cd({ARTICLE_TABLE}.{PG_VECTOR_COLUMN}, {PG_QUERY_SQL})",
+            (query, query),
+        )
+    elif backend == "sqlite":
+        match = _fts_match_expression(query)
+        if not match:
+            return queryset.none()
+        condition = Q(
+            pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,))
+        )
+        rank_sql = None
+    else:
+        condition = (
+            Q(title__icontains=query) | Q(excerpt__icontains=query) | Q(content__icontains=query)
+        )
+        rank_sql = None
+
+    if extra_q is not None:
+        condition |= extra_q
+    queryset = queryset.filter(condition)
+    if rank and backend == "sqlite":
+        rank_sql = _sqlite_rank_expression(match, queryset)
+
+    if rank:
+        if rank_sql is None:
+            return queryset.order_by("-published_at", "-id")
+        queryset = queryset.annotate(search_rank=rank_sql).order_by(
+            "-search_rank", "-published_at", "-id"
+        )
+    return queryset
+
+
+def update_search_index(article_ids):
+    article_ids = [int(pk) for pk in article_ids]
+    if not article_ids:
+        return 0
+
+    backend = search_backend()
+    with connection.cursor() as cursor:
+        if backend == "postgresql":
+            cursor.execute(
+                f"UPDATE {ARTICLE_TABLE} SET {PG_VECTOR_COLUMN} = {PG_DOCUMENT_SQL} "
+                "WHERE id = ANY(%s)",
+                [article_ids],
+            )
+        elif backend == "sqlite":
+            placeholders = ", ".join(["%s"] * len(article_ids))
+            cursor.execute(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})",
+                article_ids,
+            )
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, excerpt, content) "
+                f"SELECT id, title, excerpt, content FROM {ARTICLE_TABLE} "
+                f"WHERE id IN ({placeholders})",
+                article_ids,
+            )
+    return len(article_ids)
+
+
+def remove_from_search_index(article_ids):
+    if search_backend() != "sqlite" or not article_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(article_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})",
+            [int(pk) for pk in article_ids],
+        )
+
+
+def rebuild_search_index(batch_size=1000):
+    ids = list(Article.objects.order_by("pk").values_list("pk", flat=True))
+    if search_backend() == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {FTS_TABLE}")
+    for start in range(0, len(ids), batch_size):
+        update_search_index(ids[start : start + batch_size])
+    return len(ids)
@@ -0,0 +1,47 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import Signal, receiver
+
+# Sent after scheduled articles are switched to published with a bulk update,
+# which bypasses post_save. Receivers get ``article_ids``.
+articles_published = Signal()
+
+SEARCH_INDEXED_FIELDS = {"title", "excerpt", "content"}
+
+
+@receiver(post_save, sender="articles.Article")
+def update_article_search_index(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_INDEXED_FIELDS.intersection(update_fields):
+        return
+
+    from .search import update_search_index
+
+    update_search_index([instance.pk])
+
+
+@receiver(post_delete, sender="articles.Article")
+def remove_article_from_search_index(sender, instance, **kwargs):
+    from .search import remove_from_search_index
+
+    remove_from_search_index([instance.pk])
+
+
+@receiver(m2m_changed, sender="articles.Article_categories")
+@receiver(m2m_changed, sender="articles.Article_tags")
+def refresh_placeholder_discipline(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == "pre_clear":
+        # pk_set is empty for clear(), so remember the affected articles before they go.
+        instance._placeholder_article_ids = list(instance.articles.values_list("pk", flat=True))
+        return
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+
+    from .models import Article
+
+    if not reverse:
+        article_ids = [instance.pk]
+    elif action == "post_clear":
+        article_ids = getattr(instance, "_placeholder_article_ids", [])
+    else:
+        article_ids = pk_set or []
+    if article_ids:
+        Article.refresh_placeholder_disciplines(article_ids)
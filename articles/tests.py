@@ -1,3 +1,397 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import PageCacheGeneration, ViewLog
+from core.view_buffer import ViewBuffer, view_buffer
+from interactions.models import Reaction
+from interactions.stats import article_stats_namespace, bump_article_stats
+from taxonomy.models import Tag
+
+from .models import Article
+from .placeholders import resolve_placeholder_discipline
+from .search import search_articles
+
+
+class ScheduledPublishingTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", password="pass12345")
+
+    def _create(self, publish_at):
+        return Article.objects.create(
+            title=f"Запланированная {publish_at:%H%M%S%f}",
+            content="Текст.",
+            kind=Article.KIND_SPORT,
+            status=Article.STATUS_SCHEDULED,
+            publish_at=publish_at,
+            author=self.author,
+        )
+
+    def test_publish_due_moves_only_due_articles(self):
+        now = timezone.now()
+        due = self._create(now + timedelta(minutes=10))
+        later = self._create(now + timedelta(hours=2))
+
+        scheduled_for = due.publish_at
+
+        published_ids = Article.publish_due(now=now + timedelta(minutes=15))
+
+        self.assertEqual(published_ids, [due.pk])
+        due.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual(due.status, Article.STATUS_PUBLISHED)
+        self.assertEqual(due.published_at, scheduled_for)
+        self.assertIsNone(due.publish_at)
+        self.assertEqual(later.status, Article.STATUS_SCHEDULED)
+
+    def test_editing_an_unpublished_article_keeps_it_a_draft(self):
+        article = self._create(timezone.now() - timedelta(minutes=1))
+        Article.publish_due()
+        User.objects.create_user(username="chief", password="pass12345", is_staff=True)
+        self.client.login(username="chief", password="pass12345")
+        self.client.post(reverse("dashboard:article_toggle_status", args=[article.pk]))
+
+        response = self.client.post(
+            reverse("dashboard:article_edit", args=[article.pk]),
+            {
+                "title": "Снятая с публикации",
+                "content": "Текст.",
+                "kind": Article.KIND_SPORT,
+                "publish_at": (timezone.now() - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M"),
+            },
+        )
+
+        self.assertEqual(response.status_code, 302)
+        article.refresh_from_db()
+        self.assertEqual(article.status, Article.STATUS_DRAFT)
+        self.assertIsNone(article.publish_at)
+        self.assertFalse(Article.publish_due())
+
+    def test_public_list_does_not_write(self):
+        self._create(timezone.now() + timedelta(hours=1))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("articles:news_list"))
+
+        self.assertEqual(response.status_code, 200)
+        writes = [q["sql"] for q in queries if q["sql"].lstrip().upper().startswith("UPDATE")]
+        self.assertEqual(writes, [])
+        self.assertEqual(Article.objects.filter(status=Article.STATUS_PUBLISHED).count(), 0)
+
+
+class ArticleSearchTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="searcher", password="pass12345")
+
+    def test_index_follows_saves_and_matches_inflected_forms(self):
+        article = Article.objects.create(
+            title="Финал чемпионата Казахстана",
+            content="Команды сыграли в Астане.",
+            kind=Article.KIND_SPORT,
+            status=Article.STATUS_PUBLISHED,
+            author=self.author,
+        )
+
+        response = self.client.get(reverse("articles:news_search"), {"q": "чемпионат"})
+        self.assertEqual(
+            [item["title"] for item in response.json()["data"]["results"]], [article.title]
+        )
+
+        article.title = "Кубок по баскетболу"
+        article.save()
+        response = self.client.get(reverse("articles:news_search"), {"q": "чемпионат"})
+        self.assertEqual(response.json()["data"]["results"], [])
+
+        article.delete()
+        response = self.client.get(reverse("articles:news_search"), {"q": "Астане"})
+        self.assertEqual(response.json()["data"]["results"], [])
+
+    def test_ranking_is_taken_within_the_filtered_queryset(self):
+        Article.objects.create(
+            title="Чемпионат по киберспорту",
+            excerpt="Чемпионат сезона.",
+            content="Чемпионат.",
+            kind=Article.KIND_ESPORT,
+            status=Article.STATUS_PUBLISHED,
+            author=self.author,
+        )
+        sport = Article.objects.create(
+            title="Итоги тура",
+            content="Команды продолжают чемпионат.",
+            kind=Article.KIND_SPORT,
+            status=Article.STATUS_PUBLISHED,
+            author=self.author,
+        )
+
+        with patch("articles.search.FTS_RANK_CANDIDATES", 1):
+            results = search_articles(
+                Article.objects.filter(kind=Article.KIND_SPORT), "чемпионат", rank=True
+            )
+            ranked = [(article.pk, article.search_rank) for article in results]
+        self.assertEqual(ranked, [(sport.pk, 1)])
+
+
+@override_settings(VIEW_BUFFER_MAX_EVENTS=3, VIEW_BUFFER_FLUSH_SECONDS=3600)
+class BufferedViewCountTests(TestCase):
+    def setUp(self):
+        view_buffer.clear()
+        self.author = User.objects.create_user(username="viewer", password="pass12345")
+        self.first = Article.objects.create(
+            title="Первая", content="Текст.", status=Article.STATUS_PUBLISHED, author=self.author
+        )
+        self.second = Article.objects.create(
+            title="Вторая", content="Текст.", status=Article.STATUS_PUBLISHED, author=self.author
+        )
+
+    def tearDown(self):
+        view_buffer.clear()
+
+    def test_views_are_written_in_one_batch(self):
+        view_buffer.record(self.first.pk, ip="10.0.0.1")
+        view_buffer.record(self.second.pk, user_id=self.author.pk)
+        self.assertEqual(ViewLog.objects.count(), 0)
+
+        with self.assertNumQueries(7):
+            view_buffer.record(self.first.pk)
+
+        self.first.refresh_from_db()
+        self.second.refresh_from_db()
+        self.assertEqual(self.first.views_count, 2)
+        self.assertEqual(self.second.views_count, 1)
+        self.assertEqual(ViewLog.objects.count(), 3)
+        self.assertEqual(view_buffer.pending(), 0)
+
+    def test_views_of_deleted_articles_are_dropped(self):
+        view_buffer.record(self.second.pk)
+        self.second.delete()
+        self.assertEqual(view_buffer.flush(), 0)
+        self.assertFalse(ViewLog.objects.exists())
+
+    def test_idle_buffer_is_flushed_by_the_background_thread(self):
+        buffer = ViewBuffer()
+        self.addCleanup(buffer.stop_flusher, 5)
+        buffer.record(self.first.pk)
+        self.assertIsNone(buffer._flusher)
+        self.assertEqual(buffer.flush_if_due(), 0)
+
+        buffer._last_flush -= 3601
+        self.assertEqual(buffer.flush_if_due(), 1)
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.views_count, 1)
+
+        polled = threading.Event()
+        with (
+            patch("core.view_buffer.FLUSH_POLL_SECONDS", 0.01),
+            patch.object(buffer, "flush_if_due", side_effect=polled.set),
+        ):
+            buffer.start_flusher()
+            self.assertTrue(polled.wait(5))
+            buffer.stop_flusher(5)
+        self.assertIsNone(buffer._flusher)
+
+
+@override_settings(VIEW_BUFFER_MAX_EVENTS=1)
+class SessionFreeViewDedupTests(TestCase):
+    def setUp(self):
+        caches["view_dedup"].clear()
+        author = User.objects.create_user(username="dedup", password="pass12345")
+        self.article = Article.objects.create(
+            title="Без сессий", content="Текст.", status=Article.STATUS_PUBLISHED, author=author
+        )
+
+    def test_anonymous_reads_are_counted_once_without_sessions(self):
+        url = reverse("articles:news_detail", args=[self.article.slug])
+        for _ in range(2):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views_count, 1)
+        self.assertFalse(Session.objects.exists())
+
+        self.client.get(url, HTTP_USER_AGENT="another-browser")
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.views_count, 2)
+
+    def test_purge_view_sessions(self):
+        store = SessionStore()
+        store["viewed_article_1"] = True
+        store.create()
+        mixed = SessionStore()
+        mixed.update({"viewed_article_2": True, "_auth_user_id": "1"})
+        mixed.create()
+
+        call_command("purge_view_sessions", stdout=StringIO())
+
+        self.assertEqual(
+            list(Session.objects.values_list("session_key", flat=True)), [mixed.session_key]
+        )
+        self.assertEqual(SessionStore(mixed.session_key).load(), {"_auth_user_id": "1"})
+
+
+@override_settings(PAGE_CACHE_SECONDS=300)
+class AnonymousPageCacheTests(TestCase):
+    def setUp(self):
+        caches["pages"].clear()
+        self.author = User.objects.create_user(username="cached", password="pass12345")
+        self.url = reverse("articles:news_list")
+
+    def tearDown(self):
+        view_buffer.clear()
+
+    def _create(self, title):
+        return Article.objects.create(
+            title=title, content="Текст.", status=Article.STATUS_PUBLISHED, author=self.author
+        )
+
+    def test_saves_bump_generation_and_stale_page_survives_db_errors(self):
+        self._create("Первая кэшируемая")
+        first = self.client.get(self.url)
+        self.assertEqual(first["X-Page-Cache"], "miss")
+        self.assertEqual(self.client.get(self.url)["X-Page-Cache"], "hit")
+
+        self._create("Вторая кэшируемая")
+        refreshed = self.client.get(self.url)
+        self.assertEqual(refreshed["X-Page-Cache"], "miss")
+        self.assertContains(refreshed, "Вторая кэшируемая")
+
+        self._create("Третья кэшируемая")
+        with patch("articles.views._order_public_news", side_effect=OperationalError):
+            stale = self.client.get(self.url)
+        self.assertEqual(stale["X-Page-Cache"], "stale")
+        self.assertContains(stale, "Вторая кэшируемая")
+        self.assertNotContains(stale, "Третья кэшируемая")
+
+    def test_pagination_links_keep_only_the_cache_key_params(self):
+        for index in range(10):
+            self._create(f"Страница {index}")
+        first = self.client.get(self.url, {"ordering": "popular", "utm_source": "mail"})
+        self.assertContains(first, "?page=2&ordering=popular")
+        self.assertNotContains(first, "utm_source")
+
+        shared = self.client.get(self.url, {"ordering": "popular"})
+        self.assertEqual(shared["X-Page-Cache"], "hit")
+        self.assertNotContains(shared, "utm_source")
+
+    def test_authenticated_requests_bypass_cache(self):
+        self.client.force_login(self.author)
+        self.assertFalse(self.client.get(self.url).has_header("X-Page-Cache"))
+
+    def test_generations_are_shared_and_detail_follows_its_stats(self):
+        article = self._create("Кэшируемая новость")
+        url = reverse("articles:news_detail", kwargs={"slug": article.slug})
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "miss")
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "hit")
+
+        Reaction.objects.create(article=article, user=self.author, type=Reaction.TYPE_LIKE)
+        bump_article_stats(article.pk, likes_count=1)
+        refreshed = self.client.get(url)
+        self.assertEqual(refreshed["X-Page-Cache"], "miss")
+        self.assertContains(refreshed, '<span class="news-actions__count" data-like-count>1</span>')
+        self.assertTrue(
+            PageCacheGeneration.objects.filter(
+                namespace=article_stats_namespace(article.pk)
+            ).exists()
+        )
+
+    def test_detail_hits_count_views_from_the_cached_entry(self):
+        article = self._create("Просмотры из кэша")
+        url = reverse("articles:news_detail", kwargs={"slug": article.slug})
+        self.assertEqual(self.client.get(url)["X-Page-Cache"], "miss")
+
+        # Only the generations are read; the article id comes with the cached page.
+        with self.assertNumQueries(1):
+            hit = self.client.get(url, HTTP_USER_AGENT="second-reader")
+        self.assertEqual(hit["X-Page-Cache"], "hit")
+        self.assertFalse(hit.has_header("X-Article-Id"))
+
+        with patch("core.page_cache._current_generations", side_effect=OperationalError):
+            stale = self.client.get(url, HTTP_USER_AGENT="third-reader")
+        self.assertEqual(stale["X-Page-Cache"], "stale")
+        self.assertEqual(view_buffer.pending(), 3)
+
+
+@override_settings(PAGE_CACHE_SECONDS=0)
+class CardFragmentCacheTests(TestCase):
+    def setUp(self):
+        caches["fragments"].clear()
+        author = User.objects.create_user(username="cards", password="pass12345")
+        self.articles = [
+            Article.objects.create(
+                title=f"Карточка {index}",
+                content="Текст.",
+                status=Article.STATUS_PUBLISHED,
+                author=author,
+            )
+            for index in range(3)
+        ]
+        self.url = reverse("articles:news_list")
+
+    def test_cards_are_rendered_once_per_version(self):
+        first = self.client.get(self.url)
+        self.assertIn("includes/news_card.html", [t.name for t in first.templates])
+
+        second = self.client.get(self.url)
+        self.assertNotIn("includes/news_card.html", [t.name for t in second.templates])
+        self.assertContains(second, "Карточка 2")
+
+        article = self.articles[2]
+        article.title = "Карточка обновлена"
+        article.save()
+        self.assertContains(self.client.get(self.url), "Карточка обновлена")
+
+    def test_bulk_updates_without_updated_at_refresh_the_card(self):
+        article = self.articles[0]
+        Article.objects.filter(pk=article.pk).update(is_featured=True)
+        self.assertContains(self.client.get(self.url), "news-pill--urgent")
+
+        Article.objects.filter(pk=article.pk).update(is_featured=False)
+        self.assertNotContains(self.client.get(self.url), "news-pill--urgent")
+
+        moved = timezone.now() - timedelta(days=3)
+        Article.objects.filter(pk=article.pk).update(published_at=moved)
+        self.assertContains(
+            self.client.get(self.url), timezone.localtime(moved).strftime("%d.%m.%Y %H:%M")
+        )
+
+
+class PlaceholderDisciplineTests(TestCase):
+    def setUp(self):
+        self.author = User.objects.create_user(username="placeholder", password="pass12345")
+
+    def test_matcher_keeps_keyword_map_priority(self):
+        self.assertEqual(
+            resolve_placeholder_discipline("", ["Итоги: баскетбол и футбол"]), "football"
+        )
+        self.assertEqual(resolve_placeholder_discipline("", ["Турнир по Dota 2"]), "dota2")
+        self.assertEqual(resolve_placeholder_discipline("cs2", ["футбол"]), "cs2")
+        self.assertEqual(resolve_placeholder_discipline("", ["Без ключевых слов"]), "default")
+
+    def test_stored_on_save_and_taxonomy_changes(self):
+        article = Article.objects.create(
+            title="Обзор недели",
+            content="Текст.",
+            status=Article.STATUS_PUBLISHED,
+            author=self.author,
+        )
+        self.assertEqual(article.placeholder_discipline, "default")
+
+        tag = Tag.objects.create(name="Хоккей")
+        article.tags.add(tag)
+        article.refresh_from_db()
+        self.assertEqual(article.placeholder_discipline, "hockey")
+
+        tag.articles.clear()
+        article.refresh_from_db()
+        self.assertEqual(article.placeholder_discipline, "default")
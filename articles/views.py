@@ -1,18 +1,33 @@
 ﻿from django.core.paginator import Paginator
-from django.db.models import Avg, Count, F, Q
+from django.db.models import F, Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404, render
 
 from comments.models import Comment
+from core.page_cache import cache_public_page, public_query_string
 from core.utils import get_public_name
+from core.view_buffer import record_article_view
 from interactions.models import ArticleRating, Favorite, Reaction, Subscription
+from interactions.stats import (
+    article_stats_namespace,
+    get_article_stats,
+    rating_summary,
+    reaction_counts,
+)
 from taxonomy.models import Category, Tag
 
 from .models import Article
+from .search import search_articles
 
+ARTICLE_ID_HEADER = "X-Article-Id"
 PUBLIC_NEWS_ORDERING = ("-published_at", "-created_at", "-id")
 PUBLIC_POPULAR_ORDERING = ("-views_count", "-published_at", "-created_at", "-id")
-TOP_NEWS_ORDERING = ("-likes_count", "-published_at", "-created_at", "-id")
+TOP_NEWS_ORDERING = (
+    F("stats__likes_count").desc(nulls_last=True),
+    "-published_at",
+    "-created_at",
+    "-id",
+)
 
 
 def _base_published_queryset():
@@ -23,16 +38,15 @@ def _base_published_queryset():
     )
 
 
-def _normalize_published_timestamps():
-    Article.sanitize_published_timestamps()
-
-
 def _order_public_news(queryset):
     return queryset.order_by(*PUBLIC_NEWS_ORDERING)
 
 
+NEWS_LIST_PARAMS = ("q", "kind", "discipline", "category", "tag", "ordering", "page")
+
+
+@cache_public_page(namespaces=("articles",), query_params=NEWS_LIST_PARAMS)
 def news_list(request):
-    _normalize_published_timestamps()
     queryset = _base_published_queryset()
 
     q = request.GET.get("q", "").strip()
@@ -43,12 +57,7 @@ def news_list(request):
     ordering = request.GET.get("ordering", "new").strip() or "new"
 
     if q:
-        queryset = queryset.filter(
-            Q(title__icontains=q)
-            | Q(excerpt__icontains=q)
-            | Q(content__icontains=q)
-            | Q(author__username__icontains=q)
-        )
+        queryset = search_articles(queryset, q, extra_q=Q(author__username__icontains=q))
 
     if kind in {Article.KIND_SPORT, Article.KIND_ESPORT}:
         queryset = queryset.filter(kind=kind)
@@ -76,23 +85,12 @@ def news_list(request):
         or _order_public_news(_base_published_queryset()).first()
     )
 
-    top_items = list(
-        _base_published_queryset()
-        .annotate(
-            likes_count=Count(
-                "reactions",
-                filter=Q(reactions__type=Reaction.TYPE_LIKE),
-            )
-        )
-        .order_by(*TOP_NEWS_ORDERING)[:6]
-    )
+    top_items = list(_base_published_queryset().order_by(*TOP_NEWS_ORDERING)[:6])
 
     paginator = Paginator(queryset, 9)
     page_obj = paginator.get_page(request.GET.get("page"))
 
-    query_params = request.GET.copy()
-    query_params.pop("page", None)
-    pagination_query = query_params.urlencode()
+    pagination_query = public_query_string(request, NEWS_LIST_PARAMS)
 
     current_filters = {
         "q": q,
@@ -125,18 +123,23 @@ def news_list(request):
 
 
 def news_detail(request, slug):
-    _normalize_published_timestamps()
+    # Views are counted from the article id kept with the cached page, so cache hits are
+    # counted too without a query of their own.
+    response = _news_detail_page(request, slug)
+    article_id = response.get(ARTICLE_ID_HEADER)
+    if article_id is not None:
+        del response[ARTICLE_ID_HEADER]
+        record_article_view(request, int(article_id))
+    return response
+
+
+@cache_public_page(namespaces=("articles",), keep_headers=(ARTICLE_ID_HEADER,))
+def _news_detail_page(request, slug):
     article = get_object_or_404(
         _base_published_queryset(),
         slug=slug,
     )
 
-    view_key = f"viewed_article_{article.pk}"
-    if not request.session.get(view_key):
-        Article.objects.filter(pk=article.pk).update(views_count=F("views_count") + 1)
-        request.session[view_key] = True
-        article.refresh_from_db(fields=["views_count"])
-
     related = _base_published_queryset().exclude(pk=article.pk)
     if article.discipline:
         related = related.filter(discipline=article.discipline)
@@ -145,10 +148,7 @@ def news_detail(request, slug):
 
     related_items = _order_public_news(related.distinct())[:4]
 
-    reaction_counts = Reaction.objects.filter(article=article).aggregate(
-        likes=Count("id", filter=Q(type=Reaction.TYPE_LIKE)),
-        dislikes=Count("id", filter=Q(type=Reaction.TYPE_DISLIKE)),
-    )
+    stats = get_article_stats(article.pk)
 
     user_reaction = None
     user_favorited = False
@@ -174,42 +174,27 @@ def news_detail(request, slug):
                 category=primary_category,
             ).exists()
 
-    comments = (
-        Comment.objects.filter(article=article, is_approved=True)
-        .select_related("user", "user__profile")
-    )
-    rating_stats = ArticleRating.objects.filter(article=article).aggregate(
-        average=Avg("value"),
-        count=Count("id"),
+    comments = Comment.objects.filter(article=article, is_approved=True).select_related(
+        "user", "user__profile"
     )
 
-    return render(
+    response = render(
         request,
         "articles/news_detail.html",
         {
             "article": article,
             "related_items": related_items,
-            "reaction_counts": {
-                "likes": reaction_counts["likes"] or 0,
-                "dislikes": reaction_counts["dislikes"] or 0,
-            },
-            "favorites_count": Favorite.objects.filter(article=article).count(),
+            "reaction_counts": reaction_counts(stats),
+            "favorites_count": stats.favorites_count,
             "user_reaction": user_reaction,
             "user_favorited": user_favorited,
             "user_rating": user_rating,
             "primary_category": primary_category,
             "user_category_subscribed": user_category_subscribed,
-            "rating_summary": {
-                "average": (
-                    round(float(rating_stats["average"]), 2)
-                    if rating_stats["average"] is not None
-                    else None
-                ),
-                "count": rating_stats["count"] or 0,
-            },
+            "rating_summary": rating_summary(stats),
             "rating_choices": [1, 2, 3, 4, 5],
             "comments": comments,
-            "comments_count": comments.count(),
+            "comments_count": stats.comments_count,
             "article_author_name": get_public_name(article.author),
             "page_title": article.title,
             "page_description": article.excerpt or article.title,
@@ -220,24 +205,24 @@ def news_detail(request, slug):
             ],
         },
     )
+    response[ARTICLE_ID_HEADER] = article.pk
+    # Reactions, favorites and ratings update ArticleStats with .update(), so the page also
+    # follows the article's own stats namespace.
+    response.page_cache_namespaces = (article_stats_namespace(article.pk),)
+    return response
 
 
 def news_search(request):
-    _normalize_published_timestamps()
     q = request.GET.get("q", "").strip()
     if not q:
         return JsonResponse({"ok": True, "data": {"results": []}})
 
-    results = (
-        _base_published_queryset()
-        .filter(
-            Q(title__icontains=q)
-            | Q(excerpt__icontains=q)
-            | Q(content__icontains=q)
-            | Q(author__username__icontains=q)
-        )
-        .order_by(*PUBLIC_NEWS_ORDERING)[:5]
-    )
+    results = search_articles(
+        _base_published_queryset(),
+        q,
+        extra_q=Q(author__username__icontains=q),
+        rank=True,
+    )[:5]
 
     return JsonResponse(
         {
@@ -1,10 +1,12 @@
 ﻿from django.contrib import admin
 
+from interactions.admin import ArticleStatsSyncMixin
+
 from .models import Comment, CommentReport
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(ArticleStatsSyncMixin, admin.ModelAdmin):
     list_display = ("article", "user", "is_approved", "created_at")
     list_filter = ("is_approved",)
     search_fields = ("text", "user__username")
@@ -8,6 +8,7 @@ from django.views.decorators.http import require_GET, require_POST
 
 from articles.models import Article
 from core.utils import get_public_name
+from interactions.stats import bump_article_stats
 
 from .models import Comment
 
@@ -59,6 +60,7 @@ def comment_add_view(request):
         text=text,
         is_approved=True,
     )
+    bump_article_stats(article.pk, comments_count=1)
 
     html = render_to_string(
         "comments/comment_item.html",
@@ -97,6 +99,8 @@ def comment_delete_view(request):
         return _json_error("Недостаточно прав", status=403)
 
     comment.delete()
+    if comment.is_approved:
+        bump_article_stats(comment.article_id, comments_count=-1)
     return _json_ok({"comment_id": comment_id})
 
 
@@ -0,0 +1,197 @@
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from lib.data_providers import BaseProvider, FootballProvider, get_providers
+from lib.data_providers.fixtures import FixtureStore, StandInClient, StandInServer
+from lib.data_providers.http_utils import (
+    HostRateLimiter,
+    ProviderHttpClient,
+    fetch_json,
+    use_transport,
+)
+from lib.data_providers.types import MatchEntity, ProviderResult, TournamentEntity
+from lib.data_sync import fetch_snapshot
+from lib.sync_writer import write_snapshot
+
+TEAMS_URL = "https://www.thesportsdb.com/api/v1/json/3/search_all_teams.php"
+EVENTS_URL = "https://www.thesportsdb.com/api/v1/json/3/eventsseason.php"
+EVENTS_PARAMS = {"id": "4799", "s": "2026"}
+SEASON_START = datetime(2026, 3, 1, 12, 0, tzinfo=dt_timezone.utc)
+
+
+# Season schedule in TheSportsDB's eventsseason format; only the benchmark uses it, as the
+# football provider leaves the schedule to the fallback data.
+class _SeasonEventsProvider(BaseProvider):
+    name = "bench_events"
+    entity_types = ("tournaments", "matches")
+    use_cache = False
+
+    def _fetch_live(self) -> ProviderResult:
+        events = fetch_json(EVENTS_URL, params=EVENTS_PARAMS).get("events") or []
+        matches = []
+        for event in events:
+            finished = event.get("intHomeScore") is not None
+            matches.append(
+                MatchEntity(
+                    id=f"football-event-{event['idEvent']}",
+                    discipline="football",
+                    tournament_id="football-kpl",
+                    team_a=event["strHomeTeam"],
+                    team_b=event["strAwayTeam"],
+                    start_time=datetime.fromisoformat(event["strTimestamp"]),
+                    status="finished" if finished else "upcoming",
+                    score=f"{event['intHomeScore']}:{event['intAwayScore']}" if finished else "",
+                )
+            )
+        tournament = TournamentEntity(
+            id="football-kpl",
+            name=FootballProvider.league_name,
+            discipline="football",
+            start_date=SEASON_START,
+            end_date=SEASON_START + timedelta(days=365),
+        )
+        return ProviderResult(
+            teams=[],
+            tournaments=[tournament],
+            matches=matches,
+            is_fallback=False,
+            fetched_at=datetime.now(dt_timezone.utc),
+        )
+
+
+def _synthetic_fixtures(store, team_count, match_count):
+    teams = [
+        {
+            "idTeam": str(index),
+            "strTeam": f"Bench Team {index:05d}",
+            "strCountry": "Kazakhstan",
+            "strStadiumLocation": "Almaty" if index % 2 else "Astana",
+            "strBadge": "",
+            "strWebsite": "",
+        }
+        for index in range(team_count)
+    ]
+    events = []
+    for index in range(match_count):
+        home = index % team_count
+        away = (home + 1 + index // team_count) % team_count
+        if away == home:
+            away = (home + 1) % team_count
+        finished = index % 2 == 0
+        events.append(
+            {
+                "idEvent": str(index),
+                "strHomeTeam": teams[home]["strTeam"],
+                "strAwayTeam": teams[away]["strTeam"],
+                "strTimestamp": (SEASON_START + timedelta(hours=index)).isoformat(),
+                "intHomeScore": index % 4 if finished else None,
+                "intAwayScore": index % 3 if finished else None,
+            }
+        )
+    store.save(TEAMS_URL, {"l": FootballProvider.league_name}, {"teams": teams})
+    store.save(EVENTS_URL, EVENTS_PARAMS, {"events": events})
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the sports data sync offline: providers fetch from a local stand-in server "
+        "(synthetic payloads or recorded fixtures) and every phase reports wall time, queries, "
+        "rows written and peak memory. Writes are rolled back unless --keep is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--teams", type=int, default=1000, help="Synthetic teams.")
+        parser.add_argument("--matches", type=int, default=10000, help="Synthetic matches.")
+        parser.add_argument(
+            "--fixtures",
+            help="Replay recorded fixtures from this directory with the configured providers.",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=2,
+            help="Write the snapshot this many times (later runs measure unchanged rows).",
+        )
+        parser.add_argument("--keep", action="store_true", help="Commit the written rows.")
+
+    def handle(self, *args, **options):
+        if options["teams"] < 2 or options["matches"] < 1 or options["repeat"] < 1:
+            raise CommandError("Need at least 2 teams, 1 match and 1 repeat.")
+
+        with tempfile.TemporaryDirectory() as scratch:
+            if options["fixtures"]:
+                store = FixtureStore(options["fixtures"])
+                providers = get_providers()
+                for provider in providers:
+                    provider.use_cache = False
+            else:
+                store = FixtureStore(scratch)
+                _synthetic_fixtures(store, options["teams"], options["matches"])
+                providers = [FootballProvider(use_cache=False), _SeasonEventsProvider()]
+            self._run(store, providers, options)
+
+    def _run(self, store, providers, options):
+        client = ProviderHttpClient(HostRateLimiter({}), max_bytes=64 * 1024 * 1024)
+        tracemalloc.start()
+        started = time.perf_counter()
+        try:
+            with StandInServer(store) as server:
+                with use_transport(StandInClient(client, server.base_url)):
+                    with self._phase("fetch"):
+                        snapshot = fetch_snapshot(providers, deadline_seconds=600)
+                self.stdout.write(
+                    f"  snapshot: {len(snapshot.teams)} teams, "
+                    f"{len(snapshot.tournaments)} tournaments, {len(snapshot.matches)} matches"
+                )
+
+            with transaction.atomic():
+                for run in range(1, options["repeat"] + 1):
+                    with self._phase(f"write #{run}") as phase:
+                        stats = write_snapshot(
+                            snapshot.teams, snapshot.tournaments, snapshot.matches
+                        )
+                        phase["rows"] = sum(
+                            counts["created"] + counts["updated"] for counts in stats.values()
+                        )
+                    self.stdout.write(
+                        "  "
+                        + "; ".join(
+                            f"{model} " + " ".join(f"{k}={v}" for k, v in counts.items())
+                            for model, counts in stats.items()
+                        )
+                    )
+                if not options["keep"]:
+                    transaction.set_rollback(True)
+        finally:
+            tracemalloc.stop()
+            client.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"bench_sync finished: matches={len(snapshot.matches)} "
+                f"total_seconds={time.perf_counter() - started:.3f}"
+            )
+        )
+
+    @contextmanager
+    def _phase(self, name):
+        phase = {"rows": 0}
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            yield phase
+        elapsed = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        self.stdout.write(
+            f"{name}: {elapsed:.3f}s, {len(queries)} queries, {phase['rows']} rows written, "
+            f"peak memory {peak / 1024 / 1024:.1f} MiB"
+        )
@@ -0,0 +1,66 @@
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+VIEW_KEY_PREFIX = "viewed_article_"
+
+
+class Command(BaseCommand):
+    help = (
+        "Purge sessions left behind by the old session-based view tracking: delete expired "
+        "and view-only sessions, strip view markers from the rest."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        dry_run = options["dry_run"]
+
+        expired_qs = Session.objects.filter(expire_date__lt=timezone.now())
+        expired = expired_qs.count()
+        if not dry_run:
+            expired_qs.delete()
+
+        deleted = stripped = scanned = 0
+        last_key = ""
+        while True:
+            batch = list(
+                Session.objects.filter(session_key__gt=last_key).order_by("session_key")[
+                    :batch_size
+                ]
+            )
+            if not batch:
+                break
+            last_key = batch[-1].session_key
+            scanned += len(batch)
+
+            to_delete = []
+            to_update = []
+            for session in batch:
+                data = session.get_decoded()
+                kept = {k: v for k, v in data.items() if not k.startswith(VIEW_KEY_PREFIX)}
+                if not kept:
+                    to_delete.append(session.session_key)
+                elif len(kept) != len(data):
+                    session.session_data = Session.objects.encode(kept)
+                    to_update.append(session)
+
+            deleted += len(to_delete)
+            stripped += len(to_update)
+            if dry_run:
+                continue
+            if to_delete:
+                Session.objects.filter(session_key__in=to_delete).delete()
+            if to_update:
+                Session.objects.bulk_update(to_update, ["session_data"])
+
+        prefix = "purge_view_sessions (dry run)" if dry_run else "purge_view_sessions"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix} finished: scanned={scanned} expired={expired} "
+                f"deleted={deleted} stripped={stripped}"
+            )
+        )
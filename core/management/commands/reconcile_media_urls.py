@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from articles.models import Article
+from core.page_cache import bump_page_generation
+from core.utils import list_existing_files, resolve_file_url
+from teams.models import Player, Team
+
+BATCH_SIZE = 500
+
+MEDIA_MODELS = {
+    "article": (Article, "cover", "image_url", ("articles",)),
+    "team": (Team, "logo", "logo_url", ("teams", "matches")),
+    "player": (Player, "photo", "photo_url", ("teams",)),
+}
+
+
+def _resolve(instance, file_field, existing_names):
+    if isinstance(instance, Article):
+        return instance.resolve_image_url(existing_names)
+    return resolve_file_url(getattr(instance, file_field), existing_names)
+
+
+class Command(BaseCommand):
+    help = "Re-verify media files in bulk and refresh the stored display URLs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=sorted(MEDIA_MODELS),
+            dest="models",
+            help="Reconcile only the given model (can be repeated).",
+        )
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        dry_run = options["dry_run"]
+        namespaces = set()
+        summary = []
+
+        for label in options.get("models") or sorted(MEDIA_MODELS):
+            model, file_field, url_field, page_namespaces = MEDIA_MODELS[label]
+            checked, changed = self._reconcile(model, file_field, url_field, dry_run)
+            summary.append(f"{label}={changed}/{checked}")
+            if changed:
+                namespaces.update(page_namespaces)
+
+        if namespaces and not dry_run:
+            bump_page_generation(*sorted(namespaces))
+
+        prefix = "reconcile_media_urls (dry run)" if dry_run else "reconcile_media_urls"
+        self.stdout.write(self.style.SUCCESS(f"{prefix} finished: changed {' '.join(summary)}"))
+
+    def _reconcile(self, model, file_field, url_field, dry_run):
+        storage = model._meta.get_field(file_field).storage
+        names = model.objects.exclude(**{f"{file_field}__isnull": True}).exclude(**{file_field: ""})
+        existing_names = list_existing_files(storage, set(names.values_list(file_field, flat=True)))
+        has_updated_at = any(field.name == "updated_at" for field in model._meta.fields)
+        update_fields = [url_field, "updated_at"] if has_updated_at else [url_field]
+        now = timezone.now()
+
+        checked = 0
+        pending = []
+        for instance in model.objects.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+            checked += 1
+            url = _resolve(instance, file_field, existing_names)
+            if url == getattr(instance, url_field):
+                continue
+            setattr(instance, url_field, url)
+            if has_updated_at:
+                instance.updated_at = now
+            pending.append(instance)
+
+        if pending and not dry_run:
+            model.objects.bulk_update(pending, update_fields, batch_size=BATCH_SIZE)
+        return checked, len(pending)
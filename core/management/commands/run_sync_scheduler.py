@@ -0,0 +1,84 @@
+import random
+import signal
+import threading
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import ProviderSyncState
+from lib.data_providers import get_providers
+from lib.data_sync import due_providers, sync_providers
+
+LOCKED_RETRY_SECONDS = 30
+MAX_SLEEP_SECONDS = 60
+
+
+class Command(BaseCommand):
+    help = "Run the sports data sync per provider on its own interval until SIGTERM/SIGINT."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=0.1,
+            help="Random spread of each interval as a fraction (default 0.1 = +/-10%%).",
+        )
+        parser.add_argument(
+            "--once", action="store_true", help="Run the providers that are due, then exit."
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Run every provider now as a full (not incremental) sync.",
+        )
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        jitter = max(0.0, min(options["jitter"], 0.5))
+        providers = get_providers()
+        intervals = {provider.name: provider.ttl_minutes * 60 for provider in providers}
+        now = timezone.now()
+        stored = dict(
+            ProviderSyncState.objects.filter(provider__in=intervals).values_list(
+                "provider", "next_run_at"
+            )
+        )
+        next_runs = {name: stored.get(name) or now for name in intervals}
+        full_pending = set(intervals) if options["full"] else set()
+        if full_pending:
+            next_runs = dict.fromkeys(intervals, now)
+        runs = 0
+
+        while not self.stopping.is_set():
+            now = timezone.now()
+            due = [provider.name for provider in due_providers(providers, next_runs, now)]
+            if due:
+                full = bool(full_pending.intersection(due))
+                if sync_providers(due, refresh=True, full=full) is None:
+                    self.stdout.write(f"sync already running, retrying {', '.join(due)} later")
+                    retry_at = now + timedelta(seconds=LOCKED_RETRY_SECONDS)
+                    next_runs.update({name: retry_at for name in due})
+                else:
+                    runs += 1
+                    full_pending.difference_update(due)
+                    self.stdout.write(f"synced {', '.join(due)}" + (" (full)" if full else ""))
+                    for name in due:
+                        seconds = intervals[name] * random.uniform(1 - jitter, 1 + jitter)
+                        next_runs[name] = timezone.now() + timedelta(seconds=seconds)
+                for name in due:
+                    ProviderSyncState.objects.update_or_create(
+                        provider=name, defaults={"next_run_at": next_runs[name]}
+                    )
+            if options["once"]:
+                break
+            sleep_seconds = (min(next_runs.values()) - timezone.now()).total_seconds()
+            self.stopping.wait(max(1.0, min(sleep_seconds, MAX_SLEEP_SECONDS)))
+
+        self.stdout.write(self.style.SUCCESS(f"run_sync_scheduler finished: runs={runs}"))
+
+    def _stop(self, signum, frame):
+        self.stopping.set()
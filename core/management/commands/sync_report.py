@@ -0,0 +1,75 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from lib.sync_report import DEFAULT_LIMIT, MAX_LIMIT, PERCENTILES, RUN_METRICS, sync_report
+
+
+def _seconds(value):
+    return "-" if value is None else f"{value:.3f}s"
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the last sports data sync runs: phase timings, rows written, per-provider fetch "
+        "time, HTTP calls, bytes and errors, and p50/p90/p99 over those runs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--last", type=int, default=DEFAULT_LIMIT, help=f"Runs to show (max {MAX_LIMIT})."
+        )
+        parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        if options["last"] < 1:
+            raise CommandError("--last must be at least 1.")
+        report = sync_report(options["last"])
+        if options["json"]:
+            self.stdout.write(json.dumps(report, cls=DjangoJSONEncoder, indent=2))
+            return
+
+        for run in report["runs"]:
+            rows = " ".join(f"{key}={value}" for key, value in run["rows"].items())
+            self.stdout.write(
+                f"#{run['id']} {run['started_at']:%Y-%m-%d %H:%M:%S}"
+                f"{' full' if run['full'] else ''}{' fallback' if run['is_fallback'] else ''}: "
+                f"total {_seconds(run['duration_seconds'])}, "
+                f"fetch {_seconds(run['fetch_seconds'])}, write {_seconds(run['write_seconds'])}, "
+                f"logos {_seconds(run['logo_seconds'])}; {rows}"
+            )
+            for name, provider in run["providers"].items():
+                self.stdout.write(
+                    f"  {name}: {provider['status']}"
+                    f"{' ' + provider['mode'] if provider['mode'] else ''}, "
+                    f"fetch {_seconds(provider['fetch_seconds'])}, "
+                    f"http {provider['http_requests']} calls / {provider['http_bytes']} bytes / "
+                    f"{provider['http_errors']} errors, entities "
+                    f"{provider['entities_received']} received / "
+                    f"{provider['entities_written']} written"
+                    + (f", error: {provider['error']}" if provider["error"] else "")
+                )
+
+        percentiles = report["percentiles"]
+        if report["runs"]:
+            self.stdout.write(f"percentiles over {len(report['runs'])} runs:")
+            for metric in RUN_METRICS:
+                self.stdout.write(f"  {metric}: {self._ranks(percentiles[metric], _seconds)}")
+        else:
+            self.stdout.write("no sync runs recorded yet")
+        for name, metrics in percentiles["providers"].items():
+            self.stdout.write(
+                f"  {name}: fetch {self._ranks(metrics['fetch_seconds'], _seconds)}; "
+                f"http calls {self._ranks(metrics['http_requests'], str)}; "
+                f"bytes {self._ranks(metrics['http_bytes'], str)}; "
+                f"errors {self._ranks(metrics['http_errors'], str)}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(f"sync_report finished: runs={len(report['runs'])}"))
+
+    def _ranks(self, values, formatter):
+        return " ".join(
+            f"p{rank}={'-' if values[f'p{rank}'] is None else formatter(values[f'p{rank}'])}"
+            for rank in PERCENTILES
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.28 on 2026-10-17 18:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProviderSyncState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("provider", models.CharField(max_length=40, unique=True)),
+                ("last_started_at", models.DateTimeField(blank=True, null=True)),
+                ("last_finished_at", models.DateTimeField(blank=True, null=True)),
+                ("last_success_at", models.DateTimeField(blank=True, null=True)),
+                ("last_duration_seconds", models.FloatField(blank=True, null=True)),
+                (
+                    "last_status",
+                    models.CharField(
+                        blank=True,
+                        choices=[
+                            ("ok", "Успешно"),
+                            ("fallback", "Без данных"),
+                            ("timeout", "Превышено время"),
+                            ("error", "Ошибка"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("last_error", models.TextField(blank=True)),
+                ("next_run_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ("provider",),
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-17 18:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_providersyncstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="providersyncstate",
+            name="last_full_sync_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="providersyncstate",
+            name="watermark",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.28 on 2026-10-17 18:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_providersyncstate_last_full_sync_at_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SyncRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("started_at", models.DateTimeField(db_index=True)),
+                ("finished_at", models.DateTimeField()),
+                ("duration_seconds", models.FloatField()),
+                ("fetch_seconds", models.FloatField()),
+                ("write_seconds", models.FloatField()),
+                ("logo_seconds", models.FloatField(default=0)),
+                ("full", models.BooleanField(default=False)),
+                ("is_fallback", models.BooleanField(default=False)),
+                ("rows_created", models.PositiveIntegerField(default=0)),
+                ("rows_updated", models.PositiveIntegerField(default=0)),
+                ("rows_unchanged", models.PositiveIntegerField(default=0)),
+                ("rows_skipped", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "ordering": ("-started_at",),
+            },
+        ),
+        migrations.CreateModel(
+            name="SyncProviderRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("provider", models.CharField(max_length=40)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("ok", "Успешно"),
+                            ("fallback", "Без данных"),
+                            ("timeout", "Превышено время"),
+                            ("error", "Ошибка"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("mode", models.CharField(blank=True, max_length=10)),
+                ("fetch_seconds", models.FloatField(blank=True, null=True)),
+                ("http_requests", models.PositiveIntegerField(default=0)),
+                ("http_bytes", models.PositiveBigIntegerField(default=0)),
+                ("http_errors", models.PositiveIntegerField(default=0)),
+                ("entities_received", models.PositiveIntegerField(default=0)),
+                ("entities_written", models.PositiveIntegerField(default=0)),
+                ("error", models.TextField(blank=True)),
+                (
+                    "run",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="providers",
+                        to="core.syncrun",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("run", "provider"),
+                "indexes": [
+                    models.Index(fields=["provider", "run"], name="core_syncpr_provide_09c9e8_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.28 on 2026-10-17 18:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_syncrun_syncproviderrun"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageCacheGeneration",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("namespace", models.CharField(max_length=100, unique=True)),
+                ("generation", models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -27,3 +27,105 @@ class ViewLog(models.Model):
 
     def __str__(self):
         return f"View {self.article_id} at {self.created_at}"
+
+
+class ProviderSyncState(models.Model):
+    STATUS_OK = "ok"
+    STATUS_FALLBACK = "fallback"
+    STATUS_TIMEOUT = "timeout"
+    STATUS_ERROR = "error"
+    STATUS_CHOICES = [
+        (STATUS_OK, "Успешно"),
+        (STATUS_FALLBACK, "Без данных"),
+        (STATUS_TIMEOUT, "Превышено время"),
+        (STATUS_ERROR, "Ошибка"),
+    ]
+
+    provider = models.CharField(max_length=40, unique=True)
+    last_started_at = models.DateTimeField(null=True, blank=True)
+    last_finished_at = models.DateTimeField(null=True, blank=True)
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    last_duration_seconds = models.FloatField(null=True, blank=True)
+    last_status = models.CharField(max_length=20, choices=STATUS_CHOICES, blank=True)
+    last_error = models.TextField(blank=True)
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    # Newest upstream change already written; incremental runs only take entities after it.
+    watermark = models.DateTimeField(null=True, blank=True)
+    last_full_sync_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("provider",)
+
+    def __str__(self):
+        return f"Sync state {self.provider}"
+
+    def as_meta(self):
+        return {
+            "last_started_at": self.last_started_at,
+            "last_finished_at": self.last_finished_at,
+            "last_success_at": self.last_success_at,
+            "last_duration_seconds": self.last_duration_seconds,
+            "last_status": self.last_status,
+            "last_error": self.last_error,
+            "next_run_at": self.next_run_at,
+            "watermark": self.watermark,
+            "last_full_sync_at": self.last_full_sync_at,
+        }
+
+
+# One row per sync run, kept for SYNC_RUNS_KEEP runs: phase timings and written row totals
+# (created / updated / unchanged / skipped across teams, tournaments, matches and results).
+class SyncRun(models.Model):
+    started_at = models.DateTimeField(db_index=True)
+    finished_at = models.DateTimeField()
+    duration_seconds = models.FloatField()
+    fetch_seconds = models.FloatField()
+    write_seconds = models.FloatField()
+    logo_seconds = models.FloatField(default=0)
+    full = models.BooleanField(default=False)
+    is_fallback = models.BooleanField(default=False)
+    rows_created = models.PositiveIntegerField(default=0)
+    rows_updated = models.PositiveIntegerField(default=0)
+    rows_unchanged = models.PositiveIntegerField(default=0)
+    rows_skipped = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ("-started_at",)
+
+    def __str__(self):
+        return f"Sync run {self.started_at:%Y-%m-%d %H:%M:%S}"
+
+
+# What one provider contributed to a run: its fetch time, the HTTP calls made while fetching
+# and the entities it returned (received) and passed on to the writer (after delta filtering).
+class SyncProviderRun(models.Model):
+    run = models.ForeignKey(SyncRun, on_delete=models.CASCADE, related_name="providers")
+    provider = models.CharField(max_length=40)
+    status = models.CharField(max_length=20, choices=ProviderSyncState.STATUS_CHOICES)
+    mode = models.CharField(max_length=10, blank=True)
+    fetch_seconds = models.FloatField(null=True, blank=True)
+    http_requests = models.PositiveIntegerField(default=0)
+    http_bytes = models.PositiveBigIntegerField(default=0)
+    http_errors = models.PositiveIntegerField(default=0)
+    entities_received = models.PositiveIntegerField(default=0)
+    entities_written = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ("run", "provider")
+        indexes = [models.Index(fields=["provider", "run"])]
+
+    def __str__(self):
+        return f"{self.provider} in run {self.run_id}"
+
+
+# Page cache generations (see core.page_cache). Kept in the database rather than in the
+# per-process "pages" cache so that bumps from cron commands and other gunicorn workers reach
+# every process.
+class PageCacheGeneration(models.Model):
+    namespace = models.CharField(max_length=100, unique=True)
+    generation = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.namespace}: {self.generation}"
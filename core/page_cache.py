@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import time
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError
+from django.http import HttpResponse
+
+from .models import PageCacheGeneration
+
+logger = logging.getLogger(__name__)
+
+PAGE_CACHE_ALIAS = "pages"
+DEFAULT_FRESH_SECONDS = 120
+DEFAULT_STALE_SECONDS = 60 * 60
+REGENERATE_LOCK_SECONDS = 30
+KEY_PREFIX = "page_cache"
+
+
+def _cache():
+    alias = PAGE_CACHE_ALIAS if PAGE_CACHE_ALIAS in settings.CACHES else "default"
+    return caches[alias]
+
+
+def bump_page_generation(*namespaces):
+    # A timestamp rather than a counter: a lost row then never matches old entries.
+    generation = time.time_ns()
+    PageCacheGeneration.objects.bulk_create(
+        [PageCacheGeneration(namespace=ns, generation=generation) for ns in set(namespaces)],
+        update_conflicts=True,
+        unique_fields=["namespace"],
+        update_fields=["generation"],
+    )
+
+
+# Read from the database on every cacheable request (one indexed query), so the pages cache
+# itself can stay per process.
+def _current_generations(namespaces):
+    if not namespaces:
+        return []
+    values = dict(
+        PageCacheGeneration.objects.filter(namespace__in=namespaces).values_list(
+            "namespace", "generation"
+        )
+    )
+    return [values.get(ns, 0) for ns in namespaces]
+
+
+# The query string of the parameters a cached page is keyed on, for links rendered into it
+# (pagination); anything else in the URL must not leak into the page other visitors get.
+def public_query_string(request, query_params, exclude=("page",)):
+    return urlencode(
+        [
+            (name, value.strip())
+            for name in query_params
+            if name not in exclude
+            for value in request.GET.getlist(name)
+            if value.strip()
+        ]
+    )
+
+
+def _page_key(request, query_params):
+    params = sorted(
+        (name, value.strip())
+        for name in query_params
+        for value in request.GET.getlist(name)
+        if value.strip()
+    )
+    raw = f"{request.get_host()}{request.path}?{urlencode(params)}"
+    return f"{KEY_PREFIX}:page:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def _is_cacheable_request(request):
+    if request.method not in {"GET", "HEAD"} or "messages" in request.COOKIES:
+        return False
+    if request.user.is_authenticated:
+        return False
+    return "_messages" not in getattr(request, "session", {})
+
+
+def _is_cacheable_response(request, response):
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+    )
+
+
+def _response_from_entry(entry, state):
+    response = HttpResponse(entry["content"], content_type=entry["content_type"])
+    for header, value in entry.get("headers", {}).items():
+        response[header] = value
+    response["X-Page-Cache"] = state
+    return response
+
+
+# Anonymous GETs only. A view may add namespaces of its own for one object by setting
+# `response.page_cache_namespaces`; they are stored with the entry, as are the `keep_headers`
+# of the response. An entry is fresh for PAGE_CACHE_SECONDS while the generations of its
+# namespaces are unchanged; after that it is served stale (up to PAGE_CACHE_STALE_SECONDS)
+# while one request regenerates it, or when regeneration hits a database error.
+def cache_public_page(namespaces, query_params=(), keep_headers=()):
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            fresh_seconds = getattr(settings, "PAGE_CACHE_SECONDS", DEFAULT_FRESH_SECONDS)
+            if fresh_seconds <= 0 or not _is_cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            cache = _cache()
+            key = _page_key(request, query_params)
+            lock_key = f"{key}:lock"
+            entry = cache.get(key)
+            entry_namespaces = [*namespaces, *(entry or {}).get("namespaces", ())]
+            try:
+                generations = _current_generations(entry_namespaces)
+            except DatabaseError:
+                if entry is None:
+                    raise
+                logger.warning(
+                    "Serving stale %s after a database error", request.path, exc_info=True
+                )
+                return _response_from_entry(entry, "stale")
+            locked = False
+
+            if entry is not None:
+                is_fresh = (
+                    entry["generations"] == generations
+                    and time.time() - entry["created"] < fresh_seconds
+                )
+                if is_fresh:
+                    return _response_from_entry(entry, "hit")
+                locked = cache.add(lock_key, 1, REGENERATE_LOCK_SECONDS)
+                if not locked:
+                    return _response_from_entry(entry, "stale")
+
+            try:
+                response = view(request, *args, **kwargs)
+            except DatabaseError:
+                if entry is None:
+                    raise
+                logger.warning(
+                    "Serving stale %s after a database error", request.path, exc_info=True
+                )
+                return _response_from_entry(entry, "stale")
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+
+            if _is_cacheable_response(request, response):
+                stale_seconds = getattr(settings, "PAGE_CACHE_STALE_SECONDS", DEFAULT_STALE_SECONDS)
+                own_namespaces = list(getattr(response, "page_cache_namespaces", ()))
+                # Read after rendering, as the view names them: a bump during the render can
+                # leave this entry stale for at most PAGE_CACHE_SECONDS.
+                try:
+                    own_generations = _current_generations(own_namespaces)
+                except DatabaseError:
+                    logger.warning("Not caching %s after a database error", request.path)
+                    return response
+                cache.set(
+                    key,
+                    {
+                        "created": time.time(),
+                        "generations": generations[: len(namespaces)] + own_generations,
+                        "namespaces": own_namespaces,
+                        "headers": {
+                            header: response[header]
+                            for header in keep_headers
+                            if response.has_header(header)
+                        },
+                        "content": response.content,
+                        "content_type": response.get("Content-Type"),
+                    },
+                    fresh_seconds + stale_seconds,
+                )
+                response["X-Page-Cache"] = "miss"
+            return response
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,41 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from articles.models import Article
+from articles.signals import articles_published
+
+from .page_cache import bump_page_generation
+
+PAGE_CACHE_SENDERS = {
+    "articles.Article": ("articles",),
+    "comments.Comment": ("articles",),
+    "teams.Team": ("teams", "matches"),
+    "teams.Player": ("teams",),
+    "tournaments.Tournament": ("tournaments", "matches"),
+    "tournaments.Match": ("matches", "tournaments"),
+    "tournaments.MatchResult": ("matches",),
+}
+
+
+def _connect(sender, namespaces):
+    def bump(**kwargs):
+        bump_page_generation(*namespaces)
+
+    post_save.connect(bump, sender=sender, weak=False, dispatch_uid=f"page_cache_save_{sender}")
+    post_delete.connect(bump, sender=sender, weak=False, dispatch_uid=f"page_cache_delete_{sender}")
+
+
+for _sender, _namespaces in PAGE_CACHE_SENDERS.items():
+    _connect(_sender, _namespaces)
+
+
+@receiver(m2m_changed, sender=Article.categories.through, dispatch_uid="page_cache_categories")
+@receiver(m2m_changed, sender=Article.tags.through, dispatch_uid="page_cache_tags")
+def bump_articles_on_taxonomy_change(sender, action, **kwargs):
+    if action in {"post_add", "post_remove", "post_clear"}:
+        bump_page_generation("articles")
+
+
+@receiver(articles_published, dispatch_uid="page_cache_articles_published")
+def bump_articles_on_publish(sender, article_ids, **kwargs):
+    bump_page_generation("articles")
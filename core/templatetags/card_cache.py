@@ -0,0 +1,77 @@
+import hashlib
+
+from django import template
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Model
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+CARD_CACHE_ALIAS = "fragments"
+DEFAULT_CARD_SECONDS = 24 * 60 * 60
+
+
+def _related_versions(*names):
+    def version(obj):
+        return [getattr(getattr(obj, name, None), "updated_at", None) for name in names]
+
+    return version
+
+
+# What a card shows besides its own row; the object's updated_at is always part of the key.
+# Article cards also key on the fields that bulk .update() calls change without touching
+# updated_at (un-featuring from the dashboard, status actions in the admin).
+CARD_VERSIONS = {
+    "articles.article": lambda article: [article.is_featured, article.publication_date_for_display],
+    "tournaments.match": _related_versions("home_team", "away_team", "tournament"),
+    "teams.team": lambda team: [len(team.players.all())],
+}
+
+
+def _cache():
+    alias = CARD_CACHE_ALIAS if CARD_CACHE_ALIAS in settings.CACHES else "default"
+    return caches[alias]
+
+
+class CardBatch:
+    def __init__(self, items, template_name, item_name, extra_context):
+        self.template_name = template_name
+        self.item_name = item_name
+        self.extra_context = extra_context
+        self.keys = {}
+        for item in items:
+            self.keys[(item._meta.label_lower, item.pk)] = self._key(item)
+        self.hits = _cache().get_many(list(self.keys.values())) if self.keys else {}
+
+    def _key(self, item):
+        label = item._meta.label_lower
+        version = [item.pk, getattr(item, "updated_at", None)]
+        if label in CARD_VERSIONS:
+            version.extend(CARD_VERSIONS[label](item))
+        raw = repr((self.template_name, sorted(self.extra_context.items()), label, version))
+        return f"card:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+    def key_for(self, item):
+        return self.keys.get((item._meta.label_lower, item.pk)) or self._key(item)
+
+
+@register.simple_tag
+def card_batch(items, template_name, item_name="item", **extra_context):
+    if isinstance(items, Model):
+        items = [items]
+    return CardBatch(items or [], template_name, item_name, extra_context)
+
+
+@register.simple_tag(takes_context=True)
+def cached_card(context, batch, item):
+    key = batch.key_for(item)
+    html = batch.hits.get(key)
+    if html is None:
+        card_template = context.template.engine.get_template(batch.template_name)
+        with context.push(**{batch.item_name: item}, **batch.extra_context):
+            html = card_template.render(context)
+        timeout = getattr(settings, "CARD_CACHE_SECONDS", DEFAULT_CARD_SECONDS)
+        _cache().set(key, html, timeout)
+        batch.hits[key] = html
+    return mark_safe(html)
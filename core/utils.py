@@ -1,4 +1,6 @@
-﻿from django.core.exceptions import ObjectDoesNotExist
+﻿import posixpath
+
+from django.core.exceptions import ObjectDoesNotExist
 from django.utils.text import slugify
 
 
@@ -53,3 +55,58 @@ def generate_unique_slug(instance, source_value, slug_field="slug", max_length=2
         counter += 1
 
     return unique_slug
+
+
+def generate_unique_slugs(model_class, source_values, slug_field="slug", max_length=255):
+    # Same scheme as generate_unique_slug, for rows about to be bulk created: one query in total.
+    if not source_values:
+        return []
+    taken = set(model_class.objects.values_list(slug_field, flat=True))
+    slugs = []
+    for source_value in source_values:
+        base_slug = slugify(source_value, allow_unicode=True)[:max_length] or "item"
+        unique_slug = base_slug
+        counter = 2
+        while unique_slug in taken:
+            suffix = f"-{counter}"
+            unique_slug = f"{base_slug[: max_length - len(suffix)]}{suffix}"
+            counter += 1
+        taken.add(unique_slug)
+        slugs.append(unique_slug)
+    return slugs
+
+
+def resolve_file_url(field_file, existing_names=None):
+    name = getattr(field_file, "name", "") if field_file else ""
+    if not name:
+        return ""
+    try:
+        if not field_file._committed:
+            # Commit a fresh upload now so its final name is known before the row is written.
+            field_file.save(name, field_file.file, save=False)
+        elif existing_names is not None:
+            if name not in existing_names:
+                return ""
+        elif not field_file.storage.exists(name):
+            return ""
+        return field_file.url
+    except Exception:
+        return ""
+
+
+def list_existing_files(storage, names):
+    # One listdir() per directory instead of one exists() per file.
+    existing = set()
+    by_directory = {}
+    for name in names:
+        if name:
+            by_directory.setdefault(posixpath.dirname(name), set()).add(name)
+    for directory, wanted in by_directory.items():
+        try:
+            _, files = storage.listdir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        present = {posixpath.join(directory, file_name) for file_name in files}
+        existing.update(wanted & present)
+    return existing
+
@@ -0,0 +1,197 @@
+import atexit
+import hashlib
+import hmac
+import ipaddress
+import logging
+import threading
+import time
+from collections import Counter, namedtuple
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import close_old_connections, transaction
+from django.db.models import F
+
+from articles.models import Article
+
+from .models import ViewLog
+
+logger = logging.getLogger(__name__)
+
+ViewEvent = namedtuple("ViewEvent", ["article_id", "user_id", "ip"])
+
+DEFAULT_MAX_EVENTS = 200
+DEFAULT_FLUSH_SECONDS = 10
+DEFAULT_DEDUP_SECONDS = 24 * 60 * 60
+DEDUP_CACHE_ALIAS = "view_dedup"
+MAX_REQUEUED_EVENTS = 10000
+FLUSH_POLL_SECONDS = 1
+
+
+# Every worker process keeps its own buffer. Flushes only add deltas through F()
+# expressions, so several workers flushing at the same time never lose increments.
+# A full buffer is written by the request that filled it; otherwise a daemon thread writes
+# events older than VIEW_BUFFER_FLUSH_SECONDS, so an idle worker does not hold views until its
+# next request. The thread is opt-in (start_flusher(), called from kz_arena/wsgi.py when
+# VIEW_BUFFER_BACKGROUND_FLUSH is on); without it, e.g. in tests, flush() is called explicitly.
+class ViewBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._events = []
+        self._last_flush = time.monotonic()
+        self._flusher = None
+        self._stop = threading.Event()
+
+    @property
+    def max_events(self):
+        return getattr(settings, "VIEW_BUFFER_MAX_EVENTS", DEFAULT_MAX_EVENTS)
+
+    @property
+    def flush_seconds(self):
+        return getattr(settings, "VIEW_BUFFER_FLUSH_SECONDS", DEFAULT_FLUSH_SECONDS)
+
+    def record(self, article_id, user_id=None, ip=None):
+        with self._lock:
+            self._events.append(ViewEvent(article_id, user_id, ip))
+            full = len(self._events) >= self.max_events
+            # A worker forked after start_flusher() has no thread of its own yet.
+            if self._flusher is not None and not self._flusher.is_alive():
+                self._start_flusher_locked()
+        if full:
+            self.flush()
+
+    def start_flusher(self):
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                self._start_flusher_locked()
+
+    def stop_flusher(self, timeout=None):
+        with self._lock:
+            flusher, self._flusher = self._flusher, None
+            self._stop.set()
+        if flusher is not None:
+            flusher.join(timeout)
+
+    def _start_flusher_locked(self):
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            args=(self._stop,),
+            name="view-buffer-flush",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def pending(self):
+        with self._lock:
+            return len(self._events)
+
+    def clear(self):
+        with self._lock:
+            self._events = []
+
+    def flush_if_due(self):
+        with self._lock:
+            due = self._events and time.monotonic() - self._last_flush >= self.flush_seconds
+        return self.flush() if due else 0
+
+    # Returns the number of views actually written; views of deleted articles are dropped.
+    def flush(self):
+        with self._lock:
+            events, self._events = self._events, []
+            self._last_flush = time.monotonic()
+        if not events:
+            return 0
+
+        try:
+            return _write_events(events)
+        except Exception:
+            logger.exception("View buffer flush failed, %s events requeued", len(events))
+            with self._lock:
+                self._events = (events + self._events)[-MAX_REQUEUED_EVENTS:]
+            return 0
+
+    def _flush_periodically(self, stop):
+        while not stop.wait(FLUSH_POLL_SECONDS):
+            try:
+                self.flush_if_due()
+            finally:
+                close_old_connections()
+
+
+def _write_events(events):
+    article_ids = {event.article_id for event in events}
+    existing_articles = set(Article.objects.filter(pk__in=article_ids).values_list("pk", flat=True))
+    user_ids = {event.user_id for event in events if event.user_id}
+    existing_users = set(
+        get_user_model().objects.filter(pk__in=user_ids).values_list("pk", flat=True)
+    )
+    events = [event for event in events if event.article_id in existing_articles]
+
+    with transaction.atomic():
+        ViewLog.objects.bulk_create(
+            [
+                ViewLog(
+                    article_id=event.article_id,
+                    user_id=event.user_id if event.user_id in existing_users else None,
+                    ip=event.ip,
+                )
+                for event in events
+            ],
+            batch_size=500,
+        )
+        for article_id, count in Counter(event.article_id for event in events).items():
+            Article.objects.filter(pk=article_id).update(views_count=F("views_count") + count)
+    return len(events)
+
+
+view_buffer = ViewBuffer()
+
+
+def _client_ip(request):
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    candidate = forwarded.split(",")[0].strip() if forwarded else request.META.get("REMOTE_ADDR")
+    try:
+        return str(ipaddress.ip_address(candidate or ""))
+    except ValueError:
+        return None
+
+
+def _visitor_key(request, article_id, ip):
+    if request.user.is_authenticated:
+        identity = f"user:{request.user.pk}"
+    else:
+        identity = f"anon:{ip or ''}:{request.META.get('HTTP_USER_AGENT', '')[:256]}"
+    digest = hmac.new(settings.SECRET_KEY.encode(), identity.encode(), hashlib.sha256).hexdigest()[
+        :32
+    ]
+    return f"article_view:{article_id}:{digest}"
+
+
+def _dedup_cache():
+    alias = DEDUP_CACHE_ALIAS if DEDUP_CACHE_ALIAS in settings.CACHES else "default"
+    return caches[alias]
+
+
+def record_article_view(request, article_id):
+    # Dedup lives in the cache under a keyed hash of the visitor, so anonymous reads
+    # never create or rewrite a session row. The view_dedup alias is a LocMemCache, whose
+    # add() is atomic only between the threads of one process: this relies on the single
+    # gunicorn worker from render.yaml. More workers need a shared backend for that alias.
+    ip = _client_ip(request)
+    timeout = getattr(settings, "VIEW_DEDUP_SECONDS", DEFAULT_DEDUP_SECONDS)
+    if not _dedup_cache().add(_visitor_key(request, article_id, ip), 1, timeout):
+        return False
+
+    user_id = request.user.pk if request.user.is_authenticated else None
+    view_buffer.record(article_id, user_id=user_id, ip=ip)
+    return True
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        view_buffer.flush()
+    finally:
+        close_old_connections()
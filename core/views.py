@@ -1,15 +1,21 @@
-﻿from django.db.models import Count, Q
+﻿from django.db.models import F
 from django.shortcuts import render
 
 from articles.models import Article
-from interactions.models import Reaction
+
+from .page_cache import cache_public_page
 
 PUBLIC_NEWS_ORDERING = ("-published_at", "-created_at", "-id")
-TOP_NEWS_ORDERING = ("-likes_count", "-published_at", "-created_at", "-id")
+TOP_NEWS_ORDERING = (
+    F("stats__likes_count").desc(nulls_last=True),
+    "-published_at",
+    "-created_at",
+    "-id",
+)
 
 
+@cache_public_page(namespaces=("articles",))
 def home(request):
-    Article.sanitize_published_timestamps()
     published = (
         Article.objects.filter(status=Article.STATUS_PUBLISHED)
         .select_related("author")
@@ -21,15 +27,7 @@ def home(request):
         or published.order_by(*PUBLIC_NEWS_ORDERING).first()
     )
 
-    top_items = (
-        published.annotate(
-            likes_count=Count(
-                "reactions",
-                filter=Q(reactions__type=Reaction.TYPE_LIKE),
-            )
-        )
-        .order_by(*TOP_NEWS_ORDERING)[:6]
-    )
+    top_items = published.order_by(*TOP_NEWS_ORDERING)[:6]
 
     latest_qs = published.order_by(*PUBLIC_NEWS_ORDERING)
     if main_featured:
@@ -35,6 +35,10 @@ def _validate_image_upload(upload, field_label):
 
 
 class DashboardArticleForm(forms.ModelForm):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["publish_at"].input_formats = ["%Y-%m-%dT%H:%M"]
+
     def clean_cover(self):
         return _validate_image_upload(self.cleaned_data.get("cover"), "Обложка")
 
@@ -50,6 +54,7 @@ class DashboardArticleForm(forms.ModelForm):
             "tags",
             "cover",
             "is_featured",
+            "publish_at",
         ]
         widgets = {
             "categories": CheckboxSelectMultiple(),
@@ -57,6 +62,10 @@ class DashboardArticleForm(forms.ModelForm):
             "excerpt": forms.Textarea(attrs={"rows": 3}),
             "content": forms.Textarea(attrs={"rows": 10}),
             "cover": forms.ClearableFileInput(attrs={"accept": ".jpg,.jpeg,.png,.webp"}),
+            "publish_at": forms.DateTimeInput(
+                attrs={"type": "datetime-local"},
+                format="%Y-%m-%dT%H:%M",
+            ),
         }
         labels = {
             "title": "Заголовок",
@@ -68,9 +77,11 @@ class DashboardArticleForm(forms.ModelForm):
             "tags": "Теги",
             "cover": "Обложка",
             "is_featured": "Показывать как главное",
+            "publish_at": "Опубликовать в",
         }
         help_texts = {
             "cover": "JPG, JPEG, PNG, WEBP. Максимальный размер 5 MB.",
+            "publish_at": "Оставьте пустым, чтобы не планировать публикацию.",
             "categories": "Выберите одну или несколько категорий.",
             "tags": "Выберите подходящие теги для статьи.",
         }
@@ -20,8 +20,10 @@ from accounts.roles import (
     set_user_role,
 )
 from articles.models import Article
+from articles.search import search_articles
 from comments.models import Comment, CommentReport
 from interactions.models import ArticleRating, Favorite, Reaction, Subscription
+from interactions.stats import rebuild_article_stats
 from teams.models import Team
 from tournaments.models import Match, Tournament
 
@@ -55,6 +57,17 @@ def _check_article_permissions(user, article):
     return can_edit_articles(user) or article.author_id == user.id
 
 
+# Only a future publish_at schedules a draft. A past one (left over in the form) is dropped,
+# otherwise save() would publish an article an editor took down.
+def _apply_publish_at(article):
+    if article.status != Article.STATUS_DRAFT or not article.publish_at:
+        return
+    if article.publish_at > timezone.now():
+        article.status = Article.STATUS_SCHEDULED
+    else:
+        article.publish_at = None
+
+
 def _get_dashboard_teams_queryset():
     return Team.objects.prefetch_related("players")
 
@@ -126,11 +139,15 @@ def _delete_user_safely(target_user):
         Comment.objects.filter(user=target_user).update(user=deleted_user)
         CommentReport.objects.filter(user=target_user).update(user=deleted_user)
 
-        # These models have unique constraints by (entity, user), so we remove them.
-        Reaction.objects.filter(user=target_user).delete()
-        Favorite.objects.filter(user=target_user).delete()
+        # These models have unique constraints by (entity, user), so we remove them and
+        # recount the articles they were on.
+        touched_article_ids = set()
+        for model in (Reaction, Favorite, ArticleRating):
+            rows = model.objects.filter(user=target_user)
+            touched_article_ids.update(rows.values_list("article_id", flat=True))
+            rows.delete()
         Subscription.objects.filter(user=target_user).delete()
-        ArticleRating.objects.filter(user=target_user).delete()
+        rebuild_article_stats(touched_article_ids)
 
         target_user.groups.clear()
         target_user.delete()
@@ -200,11 +217,12 @@ def article_search(request):
     if len(q) < 2:
         return JsonResponse({"ok": True, "data": {"results": []}})
 
-    items = (
-        _get_dashboard_articles_queryset(request.user)
-        .filter(Q(title__icontains=q) | Q(slug__icontains=q))
-        .order_by("-created_at", "-id")[:5]
-    )
+    items = search_articles(
+        _get_dashboard_articles_queryset(request.user),
+        q,
+        extra_q=Q(slug__icontains=q),
+        rank=True,
+    )[:5]
 
     return JsonResponse(
         {
@@ -231,13 +249,17 @@ def article_create(request):
             article = form.save(commit=False)
             article.author = request.user
             article.status = Article.STATUS_DRAFT
+            _apply_publish_at(article)
             article.save()
             form.save_m2m()
             if article.is_featured:
                 Article.objects.filter(is_featured=True).exclude(pk=article.pk).update(
                     is_featured=False
                 )
-            messages.success(request, "Статья создана в статусе черновика.")
+            if article.status == Article.STATUS_DRAFT:
+                messages.success(request, "Статья создана в статусе черновика.")
+            else:
+                messages.success(request, f"Статья создана: {article.get_status_display()}.")
             return redirect("dashboard:article_edit", pk=article.pk)
         messages.error(request, "Исправьте ошибки в форме.")
     else:
@@ -285,7 +307,10 @@ def article_edit(request, pk):
         form = DashboardArticleForm(request.POST, request.FILES, instance=article)
         asset_form = MediaAssetForm()
         if form.is_valid():
-            updated_article = form.save()
+            updated_article = form.save(commit=False)
+            _apply_publish_at(updated_article)
+            updated_article.save()
+            form.save_m2m()
             if updated_article.is_featured:
                 Article.objects.filter(is_featured=True).exclude(pk=updated_article.pk).update(
                     is_featured=False
@@ -394,15 +419,17 @@ def article_toggle_status(request, pk):
 
         raise PermissionDenied("У вас нет доступа к этой статье.")
 
-    if article.status == Article.STATUS_DRAFT:
+    if article.status != Article.STATUS_PUBLISHED:
         article.status = Article.STATUS_PUBLISHED
         article.published_at = timezone.now()
+        article.publish_at = None
         message_text = "Статья опубликована."
     else:
         article.status = Article.STATUS_DRAFT
+        article.publish_at = None
         message_text = "Статья снята с публикации."
 
-    article.save(update_fields=["status", "published_at", "updated_at"])
+    article.save(update_fields=["status", "published_at", "publish_at", "updated_at"])
     messages.success(request, message_text)
     return redirect("dashboard:article_list")
 
@@ -1,16 +1,39 @@
 ﻿from django.contrib import admin
 
-from .models import ArticleRating, Favorite, Reaction, Subscription
+from .models import ArticleRating, ArticleStats, Favorite, Reaction, Subscription
+from .stats import rebuild_article_stats
+
+
+# Admin edits bypass the views that keep ArticleStats current, so the counters of every
+# article an edit or delete touched are recounted from the source tables.
+class ArticleStatsSyncMixin:
+    def save_model(self, request, obj, form, change):
+        previous_article_id = None
+        if change and obj.pk:
+            previous_article_id = (
+                type(obj).objects.filter(pk=obj.pk).values_list("article_id", flat=True).first()
+            )
+        super().save_model(request, obj, form, change)
+        rebuild_article_stats({obj.article_id, previous_article_id} - {None})
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        rebuild_article_stats([obj.article_id])
+
+    def delete_queryset(self, request, queryset):
+        article_ids = set(queryset.values_list("article_id", flat=True))
+        super().delete_queryset(request, queryset)
+        rebuild_article_stats(article_ids)
 
 
 @admin.register(Reaction)
-class ReactionAdmin(admin.ModelAdmin):
+class ReactionAdmin(ArticleStatsSyncMixin, admin.ModelAdmin):
     list_display = ("article", "user", "type", "created_at")
     list_filter = ("type",)
 
 
 @admin.register(Favorite)
-class FavoriteAdmin(admin.ModelAdmin):
+class FavoriteAdmin(ArticleStatsSyncMixin, admin.ModelAdmin):
     list_display = ("article", "user", "created_at")
 
 
@@ -20,7 +43,22 @@ class SubscriptionAdmin(admin.ModelAdmin):
 
 
 @admin.register(ArticleRating)
-class ArticleRatingAdmin(admin.ModelAdmin):
+class ArticleRatingAdmin(ArticleStatsSyncMixin, admin.ModelAdmin):
     list_display = ("article", "user", "value", "updated_at")
     list_filter = ("value", "updated_at")
     search_fields = ("article__title", "user__username")
+
+
+@admin.register(ArticleStats)
+class ArticleStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "article",
+        "likes_count",
+        "dislikes_count",
+        "favorites_count",
+        "rating_count",
+        "comments_count",
+        "updated_at",
+    )
+    search_fields = ("article__title",)
+    readonly_fields = ("updated_at",)
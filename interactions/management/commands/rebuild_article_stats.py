@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from interactions.stats import rebuild_article_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild denormalized article engagement counters from source tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--article",
+            action="append",
+            type=int,
+            dest="article_ids",
+            help="Rebuild only the given article id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_article_stats(options.get("article_ids"))
+        self.stdout.write(self.style.SUCCESS(f"rebuild_article_stats finished: articles={rebuilt}"))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.28 on 2026-10-17 17:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('articles', '0002_alter_article_discipline'),
+        ('interactions', '0002_articlerating_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleStats',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='articles.article')),
+                ('likes_count', models.PositiveIntegerField(default=0)),
+                ('dislikes_count', models.PositiveIntegerField(default=0)),
+                ('favorites_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('comments_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-likes_count'], name='interaction_likes_c_ad65e3_idx')],
+            },
+        ),
+    ]
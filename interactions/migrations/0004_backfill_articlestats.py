@@ -0,0 +1,77 @@
+# Generated by Django 4.2.28 on 2026-10-17 18:38
+
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+BATCH_SIZE = 500
+STATS_FIELDS = (
+    "likes_count",
+    "dislikes_count",
+    "favorites_count",
+    "rating_sum",
+    "rating_count",
+    "comments_count",
+)
+
+
+def _grouped(queryset, **aggregates):
+    rows = queryset.values("article_id").annotate(**aggregates).order_by()
+    return {row.pop("article_id"): row for row in rows}
+
+
+def backfill_article_stats(apps, schema_editor):
+    Article = apps.get_model("articles", "Article")
+    ArticleStats = apps.get_model("interactions", "ArticleStats")
+    Reaction = apps.get_model("interactions", "Reaction")
+    Favorite = apps.get_model("interactions", "Favorite")
+    ArticleRating = apps.get_model("interactions", "ArticleRating")
+    Comment = apps.get_model("comments", "Comment")
+
+    article_ids = list(Article.objects.order_by("pk").values_list("pk", flat=True))
+    now = timezone.now()
+    for start in range(0, len(article_ids), BATCH_SIZE):
+        batch = article_ids[start : start + BATCH_SIZE]
+        sources = (
+            _grouped(
+                Reaction.objects.filter(article_id__in=batch),
+                likes_count=Count("id", filter=Q(type="like")),
+                dislikes_count=Count("id", filter=Q(type="dislike")),
+            ),
+            _grouped(Favorite.objects.filter(article_id__in=batch), favorites_count=Count("id")),
+            _grouped(
+                ArticleRating.objects.filter(article_id__in=batch),
+                rating_sum=Sum("value"),
+                rating_count=Count("id"),
+            ),
+            _grouped(
+                Comment.objects.filter(article_id__in=batch, is_approved=True),
+                comments_count=Count("id"),
+            ),
+        )
+        items = []
+        for article_id in batch:
+            values = dict.fromkeys(STATS_FIELDS, 0)
+            for source in sources:
+                values.update(
+                    {key: value or 0 for key, value in source.get(article_id, {}).items()}
+                )
+            items.append(ArticleStats(article_id=article_id, updated_at=now, **values))
+        ArticleStats.objects.bulk_create(
+            items,
+            update_conflicts=True,
+            unique_fields=["article"],
+            update_fields=[*STATS_FIELDS, "updated_at"],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("comments", "0001_initial"),
+        ("interactions", "0003_articlestats"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_article_stats, migrations.RunPython.noop),
+    ]
@@ -144,3 +144,31 @@ class ArticleRating(models.Model):
 
     def __str__(self):
         return f"Рейтинг {self.value}/5 от {self.user} для {self.article}"
+
+
+class ArticleStats(models.Model):
+    article = models.OneToOneField(
+        "articles.Article",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="stats",
+    )
+    likes_count = models.PositiveIntegerField(default=0)
+    dislikes_count = models.PositiveIntegerField(default=0)
+    favorites_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    comments_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["-likes_count"])]
+
+    @property
+    def rating_average(self):
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    def __str__(self):
+        return f"Статистика {self.article_id}"
@@ -0,0 +1,115 @@
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from articles.models import Article
+from comments.models import Comment
+from core.page_cache import bump_page_generation
+
+from .models import ArticleRating, ArticleStats, Favorite, Reaction
+
+STATS_FIELDS = (
+    "likes_count",
+    "dislikes_count",
+    "favorites_count",
+    "rating_sum",
+    "rating_count",
+    "comments_count",
+)
+REBUILD_BATCH_SIZE = 500
+
+
+# Page cache namespace of an article's detail page, bumped whenever its counters change.
+def article_stats_namespace(article_id):
+    return f"article-stats:{article_id}"
+
+
+def _grouped_counts(queryset, **aggregates):
+    rows = queryset.values("article_id").annotate(**aggregates).order_by()
+    return {row.pop("article_id"): row for row in rows}
+
+
+def _collect_source_counts(article_ids):
+    reactions = _grouped_counts(
+        Reaction.objects.filter(article_id__in=article_ids),
+        likes_count=Count("id", filter=Q(type=Reaction.TYPE_LIKE)),
+        dislikes_count=Count("id", filter=Q(type=Reaction.TYPE_DISLIKE)),
+    )
+    favorites = _grouped_counts(
+        Favorite.objects.filter(article_id__in=article_ids),
+        favorites_count=Count("id"),
+    )
+    ratings = _grouped_counts(
+        ArticleRating.objects.filter(article_id__in=article_ids),
+        rating_sum=Sum("value"),
+        rating_count=Count("id"),
+    )
+    comments = _grouped_counts(
+        Comment.objects.filter(article_id__in=article_ids, is_approved=True),
+        comments_count=Count("id"),
+    )
+
+    now = timezone.now()
+    items = []
+    for article_id in article_ids:
+        values = dict.fromkeys(STATS_FIELDS, 0)
+        for source in (reactions, favorites, ratings, comments):
+            values.update({key: value or 0 for key, value in source.get(article_id, {}).items()})
+        items.append(ArticleStats(article_id=article_id, updated_at=now, **values))
+    return items
+
+
+def rebuild_article_stats(article_ids=None):
+    if article_ids is None:
+        article_ids = Article.objects.order_by("pk").values_list("pk", flat=True)
+    article_ids = list(article_ids)
+
+    rebuilt = 0
+    for start in range(0, len(article_ids), REBUILD_BATCH_SIZE):
+        batch = _collect_source_counts(article_ids[start : start + REBUILD_BATCH_SIZE])
+        ArticleStats.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["article"],
+            update_fields=[*STATS_FIELDS, "updated_at"],
+        )
+        bump_page_generation(*(article_stats_namespace(item.article_id) for item in batch))
+        rebuilt += len(batch)
+    return rebuilt
+
+
+# Read-only: an article without a stats row (nothing written yet since the backfill) gets
+# unsaved counters computed from the source tables; the write paths create the row.
+def get_article_stats(article_id):
+    stats = ArticleStats.objects.filter(article_id=article_id).first()
+    if stats is None:
+        stats = _collect_source_counts([article_id])[0]
+    return stats
+
+
+def bump_article_stats(article_id, **deltas):
+    unknown = set(deltas) - set(STATS_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown stats fields: {', '.join(sorted(unknown))}")
+
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes:
+        return get_article_stats(article_id)
+
+    updated = ArticleStats.objects.filter(article_id=article_id).update(
+        updated_at=timezone.now(),
+        **changes,
+    )
+    if updated:
+        bump_page_generation(article_stats_namespace(article_id))
+    else:
+        # The source row is already written, so a rebuild picks the change up.
+        rebuild_article_stats([article_id])
+    return ArticleStats.objects.get(article_id=article_id)
+
+
+def reaction_counts(stats):
+    return {"likes": stats.likes_count, "dislikes": stats.dislikes_count}
+
+
+def rating_summary(stats):
+    return {"average": stats.rating_average, "count": stats.rating_count}
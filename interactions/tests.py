@@ -1,3 +1,86 @@
+import json
+from importlib import import_module
+
+from django.apps import apps
+from django.contrib import admin
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+
+from articles.models import Article
+from comments.models import Comment
+from dashboard.views import _delete_user_safely
+
+from .models import ArticleStats, Reaction
+from .stats import get_article_stats, rebuild_article_stats
+
+
+class ArticleStatsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="reader", password="pass12345")
+        self.article = Article.objects.create(
+            title="Статья для счетчиков",
+            content="Текст.",
+            kind=Article.KIND_SPORT,
+            status=Article.STATUS_PUBLISHED,
+            author=self.user,
+        )
+        self.client.login(username="reader", password="pass12345")
+
+    def _post(self, name, payload):
+        return self.client.post(
+            reverse(name),
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+    def test_write_paths_keep_counters_in_sync_with_source_tables(self):
+        self._post("interactions:react", {"article_id": self.article.pk, "type": "like"})
+        self._post("interactions:react", {"article_id": self.article.pk, "type": "dislike"})
+        self._post("interactions:favorite", {"article_id": self.article.pk})
+        response = self._post("interactions:rate", {"article_id": self.article.pk, "value": 4})
+
+        self.assertEqual(response.json()["data"]["rating"], {"average": 4.0, "count": 1})
+        stats = ArticleStats.objects.get(article=self.article)
+        self.assertEqual(
+            (stats.likes_count, stats.dislikes_count, stats.favorites_count),
+            (0, 1, 1),
+        )
+
+        ArticleStats.objects.filter(article=self.article).update(dislikes_count=7)
+        rebuild_article_stats()
+        stats.refresh_from_db()
+        self.assertEqual(stats.dislikes_count, 1)
+        self.assertEqual(Reaction.objects.filter(article=self.article).count(), 1)
+
+    def test_user_deletion_and_admin_moderation_recount_the_article(self):
+        self._post("interactions:react", {"article_id": self.article.pk, "type": "like"})
+        self._post("interactions:favorite", {"article_id": self.article.pk})
+        self._post("interactions:rate", {"article_id": self.article.pk, "value": 5})
+        comment = Comment.objects.create(article=self.article, user=self.user, text="Хорошо")
+        rebuild_article_stats([self.article.pk])
+
+        comment.is_approved = False
+        admin.site._registry[Comment].save_model(None, comment, None, True)
+        stats = ArticleStats.objects.get(article=self.article)
+        self.assertEqual(stats.comments_count, 0)
+
+        _delete_user_safely(self.user)
+        stats.refresh_from_db()
+        self.assertEqual(
+            (stats.likes_count, stats.favorites_count, stats.rating_count, stats.rating_sum),
+            (0, 0, 0, 0),
+        )
+
+    def test_reads_do_not_write_and_the_migration_backfills_missing_rows(self):
+        Reaction.objects.create(article=self.article, user=self.user, type=Reaction.TYPE_LIKE)
+        ArticleStats.objects.all().delete()
+
+        with self.assertNumQueries(5):
+            stats = get_article_stats(self.article.pk)
+        self.assertEqual(stats.likes_count, 1)
+        self.assertFalse(ArticleStats.objects.exists())
 
-# Create your tests here.
+        migration = import_module("interactions.migrations.0004_backfill_articlestats")
+        migration.backfill_article_stats(apps, None)
+        self.assertEqual(ArticleStats.objects.get(article=self.article).likes_count, 1)
@@ -1,7 +1,6 @@
 ﻿import json
 from functools import wraps
 
-from django.db.models import Avg, Count, Q
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_GET, require_POST
@@ -11,6 +10,7 @@ from taxonomy.models import Category
 from teams.models import Team
 
 from .models import ArticleRating, Favorite, Reaction, Subscription
+from .stats import bump_article_stats, get_article_stats, rating_summary, reaction_counts
 
 
 def _json_error(message, status=400):
@@ -38,27 +38,10 @@ def _auth_required_json(view_func):
     return wrapped
 
 
-def _reaction_counts(article_id):
-    counts = Reaction.objects.filter(article_id=article_id).aggregate(
-        likes=Count("id", filter=Q(type=Reaction.TYPE_LIKE)),
-        dislikes=Count("id", filter=Q(type=Reaction.TYPE_DISLIKE)),
-    )
-    return {
-        "likes": counts["likes"] or 0,
-        "dislikes": counts["dislikes"] or 0,
-    }
-
-
-def _rating_stats(article_id):
-    stats = ArticleRating.objects.filter(article_id=article_id).aggregate(
-        average=Avg("value"),
-        count=Count("id"),
-    )
-    average = stats["average"]
-    return {
-        "average": round(float(average), 2) if average is not None else None,
-        "count": stats["count"] or 0,
-    }
+_REACTION_STATS_FIELDS = {
+    Reaction.TYPE_LIKE: "likes_count",
+    Reaction.TYPE_DISLIKE: "dislikes_count",
+}
 
 
 @require_POST
@@ -78,26 +61,31 @@ def react_view(request):
     reaction = Reaction.objects.filter(article=article, user=request.user).first()
     action = "set"
     reaction_value = reaction_type
+    deltas = {}
 
     if reaction and reaction.type == reaction_type:
         reaction.delete()
         reaction_value = None
         action = "removed"
+        deltas[_REACTION_STATS_FIELDS[reaction_type]] = -1
     elif reaction and reaction.type != reaction_type:
+        deltas[_REACTION_STATS_FIELDS[reaction.type]] = -1
+        deltas[_REACTION_STATS_FIELDS[reaction_type]] = 1
         reaction.type = reaction_type
         reaction.save(update_fields=["type"])
         action = "switched"
     else:
         Reaction.objects.create(article=article, user=request.user, type=reaction_type)
         action = "set"
+        deltas[_REACTION_STATS_FIELDS[reaction_type]] = 1
 
-    counts = _reaction_counts(article.pk)
+    stats = bump_article_stats(article.pk, **deltas)
     return _json_ok(
         {
             "article_id": article.pk,
             "reaction": reaction_value,
             "action": action,
-            "counts": counts,
+            "counts": reaction_counts(stats),
         }
     )
 
@@ -120,12 +108,12 @@ def favorite_toggle_view(request):
         Favorite.objects.create(article=article, user=request.user)
         favorited = True
 
-    total_favorites = Favorite.objects.filter(article=article).count()
+    stats = bump_article_stats(article.pk, favorites_count=1 if favorited else -1)
     return _json_ok(
         {
             "article_id": article.pk,
             "favorited": favorited,
-            "favorites_count": total_favorites,
+            "favorites_count": stats.favorites_count,
         }
     )
 
@@ -188,7 +176,9 @@ def rate_view(request):
         rating.delete()
         user_rating = None
         action = "removed"
+        deltas = {"rating_sum": -rating_value, "rating_count": -1}
     elif rating and rating.value != rating_value:
+        deltas = {"rating_sum": rating_value - rating.value}
         rating.value = rating_value
         rating.save(update_fields=["value", "updated_at"])
         action = "updated"
@@ -199,13 +189,15 @@ def rate_view(request):
             value=rating_value,
         )
         action = "set"
+        deltas = {"rating_sum": rating_value, "rating_count": 1}
 
+    stats = bump_article_stats(article.pk, **deltas)
     return _json_ok(
         {
             "article_id": article.pk,
             "user_rating": user_rating,
             "action": action,
-            "rating": _rating_stats(article.pk),
+            "rating": rating_summary(stats),
         }
     )
 
@@ -224,8 +216,7 @@ def interactions_status_view(request):
         .first()
     )
 
-    counts = _reaction_counts(article.pk)
-    rating = _rating_stats(article.pk)
+    stats = get_article_stats(article.pk)
 
     return _json_ok(
         {
@@ -233,8 +224,8 @@ def interactions_status_view(request):
             "liked": reaction.type == Reaction.TYPE_LIKE if reaction else False,
             "disliked": reaction.type == Reaction.TYPE_DISLIKE if reaction else False,
             "favorited": favorited,
-            "counts": counts,
+            "counts": reaction_counts(stats),
             "user_rating": user_rating,
-            "rating": rating,
+            "rating": rating_summary(stats),
         }
     )
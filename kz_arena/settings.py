@@ -253,9 +253,86 @@ LOGGING = {
     },
 }
 
+# On Render only the media disk survives deploys, so the cache lives there by default; the
+# media route never serves PRIVATE_MEDIA_DIR (see kz_arena/urls.py).
+PRIVATE_MEDIA_DIR = ".cache"
+PROVIDER_CACHE_DIR = os.getenv("PROVIDER_CACHE_DIR", "").strip() or str(
+    MEDIA_ROOT / PRIVATE_MEDIA_DIR / "providers"
+)
+
 CACHES = {
     "default": {
         "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
         "LOCATION": "kz-arena-cache",
-    }
+    },
+    # Rendered public pages for anonymous visitors; see core.page_cache.
+    "pages": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "kz-arena-pages",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 2000},
+    },
+    # Rendered news/match/team cards keyed by object version; see core.templatetags.card_cache.
+    "fragments": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "kz-arena-fragments",
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+    # One small key per (article, visitor) pair; kept apart so it never evicts page data.
+    # Per process, so views are deduplicated per gunicorn worker (render.yaml runs one).
+    "view_dedup": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "kz-arena-view-dedup",
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 100000},
+    },
+    # Last known provider results, shared by all workers and kept across restarts; see
+    # lib.data_providers.cache.
+    "providers": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": PROVIDER_CACHE_DIR,
+        "TIMEOUT": None,
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+}
+
+# Article views are buffered per process and written in batches (ViewLog rows plus one
+# views_count update per article). A value of 1 writes every view immediately.
+VIEW_BUFFER_MAX_EVENTS = _env_int("VIEW_BUFFER_MAX_EVENTS", 200)
+VIEW_BUFFER_FLUSH_SECONDS = _env_int("VIEW_BUFFER_FLUSH_SECONDS", 10)
+# Background writer thread for the view buffer, started by kz_arena/wsgi.py only.
+VIEW_BUFFER_BACKGROUND_FLUSH = _env_bool("VIEW_BUFFER_BACKGROUND_FLUSH", True)
+VIEW_DEDUP_SECONDS = _env_int("VIEW_DEDUP_SECONDS", 24 * 60 * 60)
+
+# Anonymous page cache: fresh window, then how long a stale copy may still be served.
+PAGE_CACHE_SECONDS = _env_int("PAGE_CACHE_SECONDS", 120)
+PAGE_CACHE_STALE_SECONDS = _env_int("PAGE_CACHE_STALE_SECONDS", 60 * 60)
+CARD_CACHE_SECONDS = _env_int("CARD_CACHE_SECONDS", 24 * 60 * 60)
+
+# Sports data sources, see lib.data_providers.registry. OPTIONS override what a provider
+# class declares (ttl_minutes, cost, priority, entity_types); None switches a source off.
+SPORTS_PROVIDERS = {
+    "football": {"BACKEND": "lib.data_providers.FootballProvider"},
+    "basketball": {"BACKEND": "lib.data_providers.BasketballProvider"},
+    "esports": {"BACKEND": "lib.data_providers.EsportsProvider"},
 }
+# Sum of provider costs one sync may spend (0 = no limit); due providers beyond it wait.
+SPORTS_SYNC_COST_BUDGET = _env_int("SPORTS_SYNC_COST_BUDGET", 0)
+# Overall budget for the concurrent provider fetch; late providers are skipped for that run.
+SPORTS_SYNC_DEADLINE_SECONDS = _env_int("SPORTS_SYNC_DEADLINE_SECONDS", 30)
+# Incremental syncs fall back to a full one at least this often, to heal drift.
+SPORTS_FULL_RESYNC_HOURS = _env_int("SPORTS_FULL_RESYNC_HOURS", 24)
+# "record" saves every provider answer to SPORTS_HTTP_FIXTURES_DIR, "replay" serves only from it.
+SPORTS_HTTP_MODE = os.getenv("SPORTS_HTTP_MODE", "live").strip().lower()
+SPORTS_HTTP_FIXTURES_DIR = os.getenv("SPORTS_HTTP_FIXTURES_DIR", "").strip() or str(
+    BASE_DIR / "cache" / "http_fixtures"
+)
+# Provider team badges are copied into MEDIA (logos/sync/) by this many parallel downloads.
+SPORTS_LOGO_MIRROR = _env_bool("SPORTS_LOGO_MIRROR", True)
+SPORTS_LOGO_WORKERS = _env_int("SPORTS_LOGO_WORKERS", 4)
+# Sync run records (core.SyncRun) kept for `manage.py sync_report` and /api/sync/runs/.
+SYNC_RUNS_KEEP = _env_int("SYNC_RUNS_KEEP", 1000)
+# Lock files for single-flight jobs on databases without advisory locks (SQLite).
+SYNC_LOCK_DIR = BASE_DIR / "cache" / "locks"
+# How long a provider result may still be served stale while refreshes fail.
+PROVIDER_CACHE_STALE_SECONDS = _env_int("PROVIDER_CACHE_STALE_SECONDS", 7 * 24 * 60 * 60)
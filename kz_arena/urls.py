@@ -1,4 +1,6 @@
-﻿from django.conf import settings
+﻿import re
+
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path, re_path
 from django.views.static import serve
@@ -36,7 +38,7 @@ if settings.SERVE_MEDIA:
     media_prefix = settings.MEDIA_URL.lstrip("/")
     urlpatterns += [
         re_path(
-            rf"^{media_prefix}(?P<path>.*)$",
+            rf"^{media_prefix}(?!{re.escape(settings.PRIVATE_MEDIA_DIR)}/)(?P<path>.*)$",
             serve,
             {"document_root": settings.MEDIA_ROOT},
         )
@@ -9,8 +9,14 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/wsgi/
 
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "kz_arena.settings")
 
 application = get_wsgi_application()
+
+if settings.VIEW_BUFFER_BACKGROUND_FLUSH:
+    from core.view_buffer import view_buffer
+
+    view_buffer.start_flusher()
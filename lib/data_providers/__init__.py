@@ -1,14 +1,19 @@
+from .base import BaseProvider
 from .basketball_provider import BasketballProvider
 from .esports_provider import EsportsProvider
 from .football_provider import FootballProvider
-from .types import MatchEntity, ProviderResult, TeamEntity, TournamentEntity
+from .registry import get_providers
+from .types import MatchEntity, ProviderResult, SyncSnapshot, TeamEntity, TournamentEntity
 
 __all__ = [
+    "BaseProvider",
     "BasketballProvider",
     "EsportsProvider",
     "FootballProvider",
+    "get_providers",
     "TeamEntity",
     "TournamentEntity",
     "MatchEntity",
     "ProviderResult",
+    "SyncSnapshot",
 ]
@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from typing import List, Tuple
+
+from .cache import cached_fetch
+from .types import ProviderResult
+
+ENTITY_TYPES = ("teams", "tournaments", "matches")
+
+
+# What every sports data source declares: the entity types it may change, how often it is due
+# (ttl_minutes, also the freshness of its cached result), its relative cost per run and its
+# priority (higher runs first and wins when two sources return the same entity id).
+# Any of these can be overridden per deployment through settings.SPORTS_PROVIDERS OPTIONS.
+class BaseProvider:
+    name = ""
+    entity_types: Tuple[str, ...] = ENTITY_TYPES
+    ttl_minutes = 20
+    cost = 1
+    priority = 0
+    supports_delta = False
+    # Off for benchmarks and replays that must hit the transport on every run.
+    use_cache = True
+    sources: List[str] = []
+
+    def __init__(self, **options):
+        for option, value in options.items():
+            if option.startswith("_") or not hasattr(type(self), option):
+                raise TypeError(f"{type(self).__name__} has no option {option!r}")
+            setattr(self, option, value)
+        unknown = set(self.entity_types) - set(ENTITY_TYPES)
+        if unknown:
+            raise TypeError(f"{type(self).__name__}: unknown entity types {sorted(unknown)}")
+
+    @property
+    def cache_key(self):
+        return f"provider:{self.name}"
+
+    def fetch(self, refresh: bool = False) -> ProviderResult:
+        if not self.use_cache:
+            return self._fetch_live()
+        return cached_fetch(
+            self.cache_key,
+            self.ttl_minutes,
+            self._fetch_live,
+            self._failed_result,
+            refresh=refresh,
+        )
+
+    def _fetch_live(self) -> ProviderResult:
+        raise NotImplementedError
+
+    def _failed_result(self) -> ProviderResult:
+        return ProviderResult(
+            teams=[],
+            tournaments=[],
+            matches=[],
+            is_fallback=True,
+            fetched_at=datetime.now(timezone.utc),
+            sources=list(self.sources),
+        )
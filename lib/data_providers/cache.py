@@ -1,18 +1,136 @@
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Tuple
+import hashlib
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
 
-_CACHE: Dict[str, Tuple[datetime, Any]] = {}
+from django.conf import settings
+from django.core.cache import caches
 
+from ..sync_lock import single_flight
+from .http_utils import CircuitOpen
 
-def get_cached(key: str, ttl_minutes: int):
-    item = _CACHE.get(key)
-    if not item:
-        return None
-    cached_at, value = item
-    if datetime.now(timezone.utc) - cached_at > timedelta(minutes=ttl_minutes):
-        return None
+logger = logging.getLogger(__name__)
+
+PROVIDER_CACHE_ALIAS = "providers"
+DEFAULT_STALE_SECONDS = 7 * 24 * 60 * 60
+ERROR_RETRY_SECONDS = 60
+
+_key_locks: Dict[str, threading.Lock] = {}
+_key_locks_guard = threading.Lock()
+
+
+def provider_cache():
+    alias = PROVIDER_CACHE_ALIAS if PROVIDER_CACHE_ALIAS in settings.CACHES else "default"
+    return caches[alias]
+
+
+def _key_lock(key: str) -> threading.Lock:
+    with _key_locks_guard:
+        return _key_locks.setdefault(key, threading.Lock())
+
+
+def _store(key: str, value: Any, fresh_seconds: float, good_until: Optional[float] = None):
+    now = time.time()
+    if good_until is None:
+        good_until = (
+            now
+            + fresh_seconds
+            + getattr(settings, "PROVIDER_CACHE_STALE_SECONDS", DEFAULT_STALE_SECONDS)
+        )
+    entry = {"value": value, "fresh_until": now + fresh_seconds, "good_until": good_until}
+    provider_cache().set(key, entry, max(1, int(good_until - now)))
+
+
+def _retry_seconds(error: Exception) -> float:
+    # While a host's circuit is open there is no point in retrying before its probe is due.
+    if isinstance(error, CircuitOpen):
+        return max(ERROR_RETRY_SECONDS, error.retry_in)
+    return ERROR_RETRY_SECONDS
+
+
+def _refresh(key: str, fresh_seconds: float, fetch: Callable[[], Any], previous=None):
+    try:
+        value = fetch()
+    except Exception as error:
+        if previous is None:
+            raise
+        # Serve stale on error: keep the last good value and try again shortly.
+        logger.warning(
+            "Refreshing %s failed, keeping the cached value: %s",
+            key,
+            error,
+            exc_info=not isinstance(error, CircuitOpen),
+        )
+        _store(key, previous["value"], _retry_seconds(error), previous["good_until"])
+        return previous["value"]
+    _store(key, value, fresh_seconds)
     return value
 
 
-def set_cached(key: str, value: Any):
-    _CACHE[key] = (datetime.now(timezone.utc), value)
+def _refresh_lock_name(key: str) -> str:
+    return f"provider-refresh-{hashlib.sha256(key.encode()).hexdigest()[:24]}"
+
+
+# FileBasedCache.add() is not atomic across processes, so the cross-worker guard is the
+# single_flight lock; the key lock only keeps one thread per key in this process.
+def _refresh_in_background(key, fresh_seconds, fetch, previous, key_lock):
+    try:
+        with single_flight(_refresh_lock_name(key)) as flight:
+            if not flight.acquired:
+                return
+            # Another worker may have refreshed the key while this one was waiting to start.
+            current = provider_cache().get(key)
+            if current is not None and time.time() < current["fresh_until"]:
+                return
+            _refresh(key, fresh_seconds, fetch, current or previous)
+    except Exception:
+        logger.warning("Background refresh of %s failed", key, exc_info=True)
+    finally:
+        key_lock.release()
+
+
+# Provider results live in the shared "providers" cache (files on disk by default), so every
+# worker and every restart starts from the last known good result. Fresh entries are returned
+# as is; stale ones are returned immediately while one background thread per key (across
+# workers, see _refresh_in_background) refetches; a failed fetch keeps the stale value. A cold miss, or refresh=True (used
+# off the request path by the scheduler), fetches inline once per key and process and falls
+# back to the stale value or on_error() if that fetch fails.
+def cached_fetch(
+    key: str,
+    ttl_minutes: int,
+    fetch: Callable[[], Any],
+    on_error: Callable[[], Any],
+    refresh: bool = False,
+):
+    fresh_seconds = ttl_minutes * 60
+    cache = provider_cache()
+    entry = cache.get(key)
+    if entry is not None and not refresh:
+        if time.time() < entry["fresh_until"]:
+            return entry["value"]
+        key_lock = _key_lock(key)
+        if key_lock.acquire(blocking=False):
+            threading.Thread(
+                target=_refresh_in_background,
+                args=(key, fresh_seconds, fetch, entry, key_lock),
+                name=f"refresh-{key}",
+                daemon=True,
+            ).start()
+        return entry["value"]
+
+    with _key_lock(key):
+        if not refresh:
+            entry = cache.get(key)
+            if entry is not None:
+                return entry["value"]
+        try:
+            return _refresh(key, fresh_seconds, fetch, entry)
+        except Exception as error:
+            logger.warning(
+                "Fetching %s failed: %s", key, error, exc_info=not isinstance(error, CircuitOpen)
+            )
+            value = on_error()
+            retry_seconds = _retry_seconds(error)
+            _store(key, value, retry_seconds, time.time() + retry_seconds)
+            return value
@@ -1,18 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import List
 from urllib.parse import quote
 
-from .cache import get_cached, set_cached
-from .http_utils import fetch_json
+from .base import BaseProvider
+from .http_utils import fetch_json, with_http_usage
 from .types import ProviderResult, TeamEntity, TournamentEntity
 
 
-class EsportsProvider:
-    cache_key = "provider:esports"
-    ttl_minutes = 20
+def _parse_touched(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except (TypeError, ValueError):
+        return None
+
+
+class EsportsProvider(BaseProvider):
+    name = "esports"
+    entity_types = ("teams", "tournaments")
+    ttl_minutes = 60
+    # Three wikis behind Liquipedia's two-second rate limit.
+    cost = 3
+    priority = 10
+    # Entities carry the page's last-touched time, so a sync can keep only what changed.
+    supports_delta = True
+    max_workers = 3
+    titles_per_request = 50
     liq_cs_api = "https://liquipedia.net/counterstrike/api.php"
     liq_dota_api = "https://liquipedia.net/dota2/api.php"
     liq_pubg_api = "https://liquipedia.net/pubg/api.php"
+    sources = [
+        "https://liquipedia.net/counterstrike/Main_Page",
+        "https://liquipedia.net/dota2/Main_Page",
+        "https://liquipedia.net/pubg/Main_Page",
+    ]
 
     tracked_pages = [
         ("cs2", "AVANGAR", "https://liquipedia.net/counterstrike/AVANGAR"),
@@ -27,86 +48,109 @@ class EsportsProvider:
         ("pubg", "PUBG Continental Series", "https://liquipedia.net/pubg/PUBG_Continental_Series"),
     ]
 
-    def _page_exists(self, api_url: str, query: str):
-        payload = fetch_json(
-            api_url,
-            params={"action": "opensearch", "search": query, "format": "json", "limit": "1"},
-            user_agent="KZArenaData/1.0 (liquipedia consumer)",
-        )
-        items = payload[1] if isinstance(payload, list) and len(payload) > 1 else []
-        return bool(items)
+    def _touched_titles(self, api_url: str, titles: List[str]):
+        found = {}
+        for start in range(0, len(titles), self.titles_per_request):
+            chunk = titles[start : start + self.titles_per_request]
+            payload = fetch_json(
+                api_url,
+                params={
+                    "action": "query",
+                    "titles": "|".join(chunk),
+                    "prop": "info",
+                    "redirects": "1",
+                    "format": "json",
+                    "formatversion": "2",
+                },
+                user_agent="KZArenaData/1.0 (liquipedia consumer)",
+            )
+            query = payload.get("query") or {}
+            aliases = {
+                item["from"]: item["to"]
+                for item in query.get("normalized", []) + query.get("redirects", [])
+            }
+            pages = {
+                page["title"]: _parse_touched(page.get("touched"))
+                for page in query.get("pages", [])
+                if not page.get("missing") and not page.get("invalid")
+            }
+            for title in chunk:
+                resolved, seen = title, {title}
+                while resolved in aliases and aliases[resolved] not in seen:
+                    resolved = aliases[resolved]
+                    seen.add(resolved)
+                if resolved in pages:
+                    found[title] = pages[resolved]
+        return found
 
-    def fetch(self) -> ProviderResult:
-        cached = get_cached(self.cache_key, self.ttl_minutes)
-        if cached:
-            return cached
+    def _api_for(self, discipline: str):
+        if discipline == "cs2":
+            return self.liq_cs_api
+        return self.liq_dota_api if discipline == "dota2" else self.liq_pubg_api
 
+    # Maps every (discipline, title) whose page exists to its last-touched time (or None).
+    def _pages_touched(self, checks):
+        # One titles query per wiki (normalization and redirects resolved by MediaWiki); the
+        # wikis are queried concurrently and fetch_json's per-host limiter keeps the pace.
+        titles_by_api = {}
+        for discipline, title in checks:
+            titles_by_api.setdefault(self._api_for(discipline), []).append(title)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            found = dict(
+                zip(
+                    titles_by_api,
+                    pool.map(
+                        with_http_usage(lambda item: self._touched_titles(*item)),
+                        titles_by_api.items(),
+                    ),
+                )
+            )
+        return {
+            (discipline, title): found[self._api_for(discipline)][title]
+            for discipline, title in checks
+            if title in found[self._api_for(discipline)]
+        }
+
+    def _fetch_live(self) -> ProviderResult:
         fetched_at = datetime.now(timezone.utc)
         teams: List[TeamEntity] = []
         tournaments: List[TournamentEntity] = []
 
-        try:
-            for discipline, query, url in self.tracked_pages:
-                api = (
-                    self.liq_cs_api
-                    if discipline == "cs2"
-                    else self.liq_dota_api if discipline == "dota2" else self.liq_pubg_api
-                )
-                if self._page_exists(api, query):
-                    teams.append(
-                        TeamEntity(
-                            id=f"{discipline}-{quote(query.lower())}",
-                            name=query if discipline != "dota2" else "Team Kazakhstan (Dota 2)",
-                            discipline=discipline,
-                            country="Kazakhstan",
-                            source_url=url,
-                            updated_at=fetched_at,
-                        )
-                    )
+        checks = [(discipline, query) for discipline, query, _ in self.tracked_pages]
+        checks += [(discipline, title) for discipline, title, _ in self.tracked_tournaments]
+        found = self._pages_touched(checks)
 
-            for discipline, title, url in self.tracked_tournaments:
-                api = (
-                    self.liq_cs_api
-                    if discipline == "cs2"
-                    else self.liq_dota_api if discipline == "dota2" else self.liq_pubg_api
-                )
-                if self._page_exists(api, title):
-                    tournaments.append(
-                        TournamentEntity(
-                            id=f"{discipline}-{quote(title.lower())}",
-                            name=title,
-                            discipline=discipline,
-                            status="upcoming",
-                            source_url=url,
-                            updated_at=fetched_at,
-                        )
+        for discipline, query, url in self.tracked_pages:
+            if (discipline, query) in found:
+                teams.append(
+                    TeamEntity(
+                        id=f"{discipline}-{quote(query.lower())}",
+                        name=query if discipline != "dota2" else "Team Kazakhstan (Dota 2)",
+                        discipline=discipline,
+                        country="Kazakhstan",
+                        source_url=url,
+                        updated_at=found[(discipline, query)],
                     )
+                )
 
-            result = ProviderResult(
-                teams=teams,
-                tournaments=tournaments,
-                matches=[],
-                is_fallback=False if teams else True,
-                fetched_at=fetched_at,
-                sources=[
-                    "https://liquipedia.net/counterstrike/Main_Page",
-                    "https://liquipedia.net/dota2/Main_Page",
-                    "https://liquipedia.net/pubg/Main_Page",
-                ],
-            )
-        except Exception:
-            result = ProviderResult(
-                teams=[],
-                tournaments=[],
-                matches=[],
-                is_fallback=True,
-                fetched_at=fetched_at,
-                sources=[
-                    "https://liquipedia.net/counterstrike/Main_Page",
-                    "https://liquipedia.net/dota2/Main_Page",
-                    "https://liquipedia.net/pubg/Main_Page",
-                ],
-            )
+        for discipline, title, url in self.tracked_tournaments:
+            if (discipline, title) in found:
+                tournaments.append(
+                    TournamentEntity(
+                        id=f"{discipline}-{quote(title.lower())}",
+                        name=title,
+                        discipline=discipline,
+                        status="upcoming",
+                        source_url=url,
+                        updated_at=found[(discipline, title)],
+                    )
+                )
 
-        set_cached(self.cache_key, result)
-        return result
+        return ProviderResult(
+            teams=teams,
+            tournaments=tournaments,
+            matches=[],
+            is_fallback=False if teams else True,
+            fetched_at=fetched_at,
+            sources=list(self.sources),
+        )
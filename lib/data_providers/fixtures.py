@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+MODE_LIVE = "live"
+MODE_RECORD = "record"
+MODE_REPLAY = "replay"
+MODES = {MODE_LIVE, MODE_RECORD, MODE_REPLAY}
+
+
+class FixtureMissing(Exception):
+    pass
+
+
+def _target(url: str, params: Optional[Dict[str, Any]]) -> str:
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted((key, str(value)) for key, value in params.items()))}"
+
+
+# Upstream JSON answers on disk, one file per request: <dir>/<host>/<sha256 of url+params>.json
+# with the url and params kept next to the response so a fixture can be read and edited.
+class FixtureStore:
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def path_for(self, url: str, params: Optional[Dict[str, Any]] = None) -> Path:
+        digest = hashlib.sha256(_target(url, params).encode("utf-8")).hexdigest()[:24]
+        return self.directory / (urlsplit(url).hostname or "unknown") / f"{digest}.json"
+
+    def load(self, url: str, params: Optional[Dict[str, Any]] = None):
+        path = self.path_for(url, params)
+        try:
+            with open(path, encoding="utf-8") as handle:
+                return json.load(handle)["response"]
+        except FileNotFoundError:
+            raise FixtureMissing(f"No fixture for {_target(url, params)} ({path})") from None
+
+    def save(self, url: str, params: Optional[Dict[str, Any]], response):
+        path = self.path_for(url, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {"url": url, "params": params or {}, "response": response}
+        # Written to a temp file and renamed, so concurrent providers never see half a fixture.
+        handle, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as output:
+            json.dump(record, output, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(temp_path, path)
+
+
+# Drop-in for ProviderHttpClient.get_json: "record" passes calls to the live client and saves
+# every answer, "replay" answers from the store only and never touches the network.
+class FixtureClient:
+    def __init__(self, store: FixtureStore, mode: str, live=None):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"Unsupported fixture mode {mode!r}")
+        self.store = store
+        self.mode = mode
+        self.live = live
+
+    def get_json(self, url, params=None, headers=None, timeout: float = 20):
+        if self.mode == MODE_REPLAY:
+            return self.store.load(url, params)
+        response = self.live.get_json(url, params=params, headers=headers, timeout=timeout)
+        self.store.save(url, params, response)
+        return response
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store: FixtureStore = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        host, _, path = parts.path.lstrip("/").partition("/")
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+        try:
+            response = self.store.load(f"https://{host}/{path}", params or None)
+        except FixtureMissing:
+            self._send(404, b"{}")
+            return
+        body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", etag)
+        else:
+            self._send(200, body, etag)
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        if etag:
+            self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+# Local HTTP stand-in for the upstream APIs, serving a FixtureStore over real sockets (with
+# ETags), so the pooled client, revalidation and parsing run exactly as in production.
+class StandInServer:
+    def __init__(self, store: FixtureStore):
+        handler = type("StandInHandler", (_StandInHandler,), {"store": store})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+# Sends every request to the stand-in instead: https://host/path?q -> <base_url>/host/path?q.
+class StandInClient:
+    def __init__(self, live, base_url: str):
+        self.live = live
+        self.base_url = base_url
+
+    def get_json(self, url, params=None, headers=None, timeout: float = 20):
+        parts = urlsplit(url)
+        local_url = f"{self.base_url}/{parts.hostname}{parts.path}"
+        return self.live.get_json(local_url, params=params, headers=headers, timeout=timeout)
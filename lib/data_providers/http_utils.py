@@ -1,27 +1,495 @@
-import gzip
+import http.client
 import json
-from typing import Any, Dict, Optional
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
+import random
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+from .fixtures import MODE_LIVE, MODES, FixtureClient, FixtureStore
+
+# Minimum seconds between two requests to a host (subdomains included). Liquipedia asks API
+# consumers for at most one request every two seconds.
+HOST_MIN_INTERVALS = {
+    "liquipedia.net": 2.0,
+}
+
+# Consecutive failed calls (after retries) that open a host's circuit, and how long it stays
+# open before one probe call is let through.
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN_SECONDS = 120.0
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+
+class HttpError(Exception):
+    def __init__(self, url: str, status: int):
+        super().__init__(f"{url} answered {status}")
+        self.url = url
+        self.status = status
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+class CircuitOpen(Exception):
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"circuit for {host} is open, next probe in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+# Per-host circuit breaker: closed until failure_threshold attempts in a row fail (each retry
+# counts, so a dead host costs failure_threshold timeouts rather than that many calls), then
+# open (calls fail fast with CircuitOpen) for cooldown_seconds, then half-open: a single probe
+# call goes through and either closes the circuit or opens it for another cool-down.
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown_seconds: float = BREAKER_COOLDOWN_SECONDS,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def before_call(self, host: str):
+        with self._lock:
+            entry = self._hosts.get(host)
+            if entry is None or entry["state"] == self.CLOSED:
+                return
+            retry_in = entry["opened_at"] + self.cooldown_seconds - time.time()
+            if entry["state"] == self.OPEN and retry_in <= 0:
+                entry["state"] = self.HALF_OPEN
+                return
+            raise CircuitOpen(host, max(retry_in, 0.0))
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            entry = self._hosts.get(host)
+            return entry is not None and entry["state"] == self.OPEN
+
+    def record_success(self, host: str):
+        with self._lock:
+            if host in self._hosts:
+                self._hosts[host].update(state=self.CLOSED, failures=0)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            entry = self._hosts.setdefault(
+                host, {"state": self.CLOSED, "failures": 0, "opened_at": None}
+            )
+            entry["failures"] += 1
+            if entry["state"] == self.HALF_OPEN or entry["failures"] >= self.failure_threshold:
+                entry.update(state=self.OPEN, opened_at=time.time())
+
+    def states(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                host: {
+                    "state": entry["state"],
+                    "failures": entry["failures"],
+                    "retry_at": (
+                        datetime.fromtimestamp(
+                            entry["opened_at"] + self.cooldown_seconds, timezone.utc
+                        )
+                        if entry["state"] != self.CLOSED
+                        else None
+                    ),
+                }
+                for host, entry in self._hosts.items()
+            }
+
+
+class HostRateLimiter:
+    def __init__(self, min_intervals: Dict[str, float]):
+        self.min_intervals = min_intervals
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def interval_for(self, host: str) -> float:
+        for domain, interval in self.min_intervals.items():
+            if host == domain or host.endswith(f".{domain}"):
+                return interval
+        return 0.0
+
+    def wait(self, host: str):
+        interval = self.interval_for(host)
+        if interval <= 0:
+            return
+        # Slots are reserved under the lock and slept off outside it, so threads queue fairly.
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+rate_limiter = HostRateLimiter(HOST_MIN_INTERVALS)
+
+
+# Shared by all providers: keep-alive connections pooled per host, ETag/Last-Modified
+# revalidation (a 304 reuses the body from the last 200), bounded retries with jittered
+# backoff, a circuit breaker per host, body size limits, and per-host counters of requests,
+# bytes and latency.
+class ProviderHttpClient:
+    def __init__(
+        self,
+        limiter: HostRateLimiter,
+        breaker: Optional[CircuitBreaker] = None,
+        max_retries: int = 2,
+        backoff_seconds: float = 0.5,
+        max_bytes: int = 2 * 1024 * 1024,
+        max_decoded_bytes: int = 10 * 1024 * 1024,
+        max_idle_per_host: int = 4,
+        max_validators: int = 256,
+        max_redirects: int = 5,
+    ):
+        self.limiter = limiter
+        self.breaker = breaker or CircuitBreaker()
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_bytes = max_bytes
+        self.max_decoded_bytes = max_decoded_bytes
+        self.max_idle_per_host = max_idle_per_host
+        self.max_validators = max_validators
+        self.max_redirects = max_redirects
+        self._idle: Dict[tuple, list] = {}
+        self._validators: "OrderedDict[str, dict]" = OrderedDict()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get_json(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 20,
+    ):
+        target = f"{url}?{urlencode(params)}" if params else url
+        request_headers = {"Accept": "application/json", "Accept-Encoding": "gzip"}
+        request_headers.update(headers or {})
+        with self._lock:
+            cached = self._validators.get(target)
+        if cached:
+            if cached.get("etag"):
+                request_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                request_headers["If-Modified-Since"] = cached["last_modified"]
+
+        status, response_headers, body = self._get(target, request_headers, timeout)
+        if status == 304 and cached:
+            return json.loads(cached["body"].decode("utf-8"))
+        if status != 200:
+            raise HttpError(target, status)
+
+        etag = response_headers.get("ETag")
+        last_modified = response_headers.get("Last-Modified")
+        if etag or last_modified:
+            with self._lock:
+                self._validators[target] = {
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "body": body,
+                }
+                self._validators.move_to_end(target)
+                while len(self._validators) > self.max_validators:
+                    self._validators.popitem(last=False)
+        return json.loads(body.decode("utf-8"))
+
+    # Binary assets such as team badges: no body is kept here, the caller stores its own
+    # validators and passes them in headers, and gets a 304 back as (304, headers, b"").
+    def get_bytes(
+        self, url: str, headers: Optional[Dict[str, str]] = None, timeout: float = 20
+    ) -> Tuple[int, Any, bytes]:
+        request_headers = {"Accept": "image/*"}
+        request_headers.update(headers or {})
+        status, response_headers, body = self._get(url, request_headers, timeout)
+        if status not in (200, 304):
+            raise HttpError(url, status)
+        return status, response_headers, body
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {host: dict(values) for host, values in self._metrics.items()}
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connections in idle.values():
+            for connection in connections:
+                connection.close()
+
+    def _get(self, target: str, headers: Dict[str, str], timeout: float):
+        for _ in range(self.max_redirects + 1):
+            status, response_headers, body = self._get_with_retries(target, headers, timeout)
+            location = response_headers.get("Location")
+            if status not in REDIRECT_STATUSES or not location:
+                return status, response_headers, body
+            target = urljoin(target, location)
+        raise HttpError(target, status)
+
+    def _get_with_retries(self, target: str, headers: Dict[str, str], timeout: float):
+        host = urlsplit(target).hostname or ""
+        try:
+            self.breaker.before_call(host)
+        except CircuitOpen:
+            self._count(host, rejected=1)
+            raise
+        try:
+            status, response_headers, body = self._attempts(target, headers, timeout)
+        except (OSError, http.client.HTTPException):
+            # Every failed attempt is already counted by _attempts.
+            raise
+        except Exception:
+            # Not the host's fault (e.g. an oversized body); a half-open probe still ends.
+            self.breaker.record_success(host)
+            raise
+        if status not in RETRY_STATUSES:
+            self.breaker.record_success(host)
+        return status, response_headers, body
+
+    def _attempts(self, target: str, headers: Dict[str, str], timeout: float):
+        parts = urlsplit(target)
+        host = parts.hostname or ""
+        attempt = 0
+        while True:
+            self.limiter.wait(host)
+            started = time.monotonic()
+            try:
+                status, response_headers, raw = self._request(parts, headers, timeout)
+            except (OSError, http.client.HTTPException):
+                self._record(host, started, 0, error=True)
+                self.breaker.record_failure(host)
+                # No retries once the failures so far have opened the circuit.
+                if attempt >= self.max_retries or self.breaker.is_open(host):
+                    raise
+                retry_after = None
+            else:
+                self._record(host, started, len(raw), not_modified=status == 304)
+                if status in RETRY_STATUSES:
+                    self.breaker.record_failure(host)
+                give_up = attempt >= self.max_retries or self.breaker.is_open(host)
+                if status not in RETRY_STATUSES or give_up:
+                    return status, response_headers, self._decode(response_headers, raw)
+                retry_after = response_headers.get("Retry-After")
+
+            attempt += 1
+            self._record_retry(host)
+            time.sleep(self._backoff(attempt, retry_after))
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        delay = self.backoff_seconds * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+        if retry_after and retry_after.strip().isdigit():
+            delay = max(delay, min(float(retry_after), 30.0))
+        return delay
+
+    def _request(self, parts, headers: Dict[str, str], timeout: float, reuse: bool = True):
+        key = (parts.scheme, parts.hostname, parts.port)
+        connection, reused = self._acquire(key, timeout, reuse)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            raw = self._read(response)
+        except Exception as error:
+            connection.close()
+            # A pooled connection the server already dropped is replaced once, silently.
+            if reused and isinstance(error, STALE_CONNECTION_ERRORS):
+                return self._request(parts, headers, timeout, reuse=False)
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            self._release(key, connection)
+        return response.status, response.headers, raw
+
+    def _read(self, response) -> bytes:
+        length = response.getheader("Content-Length") or ""
+        if length.isdigit() and int(length) > self.max_bytes:
+            raise ResponseTooLarge(f"{length} bytes announced, limit is {self.max_bytes}")
+        raw = response.read(self.max_bytes + 1)
+        if len(raw) > self.max_bytes:
+            raise ResponseTooLarge(f"body exceeds the {self.max_bytes} byte limit")
+        return raw
+
+    def _decode(self, response_headers, raw: bytes) -> bytes:
+        if response_headers.get("Content-Encoding") != "gzip":
+            return raw
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        body = decompressor.decompress(raw, self.max_decoded_bytes + 1)
+        if len(body) > self.max_decoded_bytes or decompressor.unconsumed_tail:
+            raise ResponseTooLarge(f"body exceeds {self.max_decoded_bytes} bytes decompressed")
+        return body
+
+    def _acquire(self, key: tuple, timeout: float, reuse: bool):
+        if reuse:
+            with self._lock:
+                idle = self._idle.get(key)
+                connection = idle.pop() if idle else None
+            if connection is not None:
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+                return connection, True
+
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _release(self, key: tuple, connection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _host_metrics(self, host: str) -> Dict[str, float]:
+        return self._metrics.setdefault(
+            host,
+            {
+                "requests": 0,
+                "not_modified": 0,
+                "retries": 0,
+                "errors": 0,
+                "rejected": 0,
+                "bytes": 0,
+                "seconds": 0.0,
+            },
+        )
+
+    def _record(self, host: str, started: float, size: int, not_modified=False, error=False):
+        self._count(
+            host,
+            requests=1,
+            bytes=size,
+            seconds=time.monotonic() - started,
+            not_modified=int(not_modified),
+            errors=int(error),
+        )
+
+    def _record_retry(self, host: str):
+        self._count(host, retries=1)
+
+    def _count(self, host: str, **changes):
+        with self._lock:
+            values = self._host_metrics(host)
+            for name, change in changes.items():
+                values[name] += change
+        usage = _usage.get()
+        if usage is not None:
+            usage.add(changes)
+
+
+# Counters of the HTTP calls made inside a track_http_usage() block, by whichever client;
+# the sync uses one per provider fetch to attribute calls, bytes and errors to providers.
+class HttpUsage:
+    def __init__(self):
+        self.values = {
+            "requests": 0,
+            "not_modified": 0,
+            "retries": 0,
+            "errors": 0,
+            "rejected": 0,
+            "bytes": 0,
+            "seconds": 0.0,
+        }
+        self._lock = threading.Lock()
+
+    def add(self, changes: Dict[str, float]):
+        with self._lock:
+            for name, change in changes.items():
+                self.values[name] += change
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            return {**self.values, "seconds": round(self.values["seconds"], 3)}
+
+
+_usage: ContextVar[Optional[HttpUsage]] = ContextVar("http_usage", default=None)
+
+
+@contextmanager
+def track_http_usage(usage: Optional[HttpUsage] = None):
+    usage = usage or HttpUsage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+# Threads start with an empty context: wrap work handed to a pool so its calls still count
+# towards the caller's usage.
+def with_http_usage(func):
+    usage = _usage.get()
+
+    def run(*args, **kwargs):
+        token = _usage.set(usage)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _usage.reset(token)
+
+    return run
+
+
+http_client = ProviderHttpClient(rate_limiter)
+
+_transport_override = None
+
+
+@contextmanager
+def use_transport(client):
+    global _transport_override
+    previous, _transport_override = _transport_override, client
+    try:
+        yield client
+    finally:
+        _transport_override = previous
+
+
+# settings.SPORTS_HTTP_MODE: "live" (default), "record" (live, every answer saved to
+# SPORTS_HTTP_FIXTURES_DIR) or "replay" (answers from that directory only, no network).
+def _transport():
+    if _transport_override is not None:
+        return _transport_override
+    mode = getattr(settings, "SPORTS_HTTP_MODE", MODE_LIVE)
+    if mode == MODE_LIVE:
+        return http_client
+    if mode not in MODES:
+        raise ImproperlyConfigured(f"SPORTS_HTTP_MODE must be one of {sorted(MODES)}")
+    return FixtureClient(FixtureStore(settings.SPORTS_HTTP_FIXTURES_DIR), mode, http_client)
 
 
 def fetch_json(
-    url: str, params: Optional[Dict[str, Any]] = None, user_agent: str = "KZArenaData/1.0"
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    user_agent: str = "KZArenaData/1.0",
+    timeout: float = 20,
 ):
-    target = url
-    if params:
-        target = f"{url}?{urlencode(params)}"
-
-    request = Request(
-        target,
-        headers={
-            "User-Agent": user_agent,
-            "Accept": "application/json",
-            "Accept-Encoding": "gzip",
-        },
+    return _transport().get_json(
+        url, params=params, headers={"User-Agent": user_agent}, timeout=timeout
     )
-    with urlopen(request, timeout=20) as response:
-        raw = response.read()
-        if response.headers.get("Content-Encoding") == "gzip":
-            raw = gzip.decompress(raw)
-    return json.loads(raw.decode("utf-8"))
@@ -0,0 +1,56 @@
+from importlib.metadata import entry_points
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+# Installed packages can add a source without touching settings:
+#   [project.entry-points."kz_arena.sports_providers"]
+#   hockey = "kz_hockey.provider:HockeyProvider"
+ENTRY_POINT_GROUP = "kz_arena.sports_providers"
+
+DEFAULT_PROVIDERS = {
+    "football": {"BACKEND": "lib.data_providers.FootballProvider"},
+    "basketball": {"BACKEND": "lib.data_providers.BasketballProvider"},
+    "esports": {"BACKEND": "lib.data_providers.EsportsProvider"},
+}
+
+
+def _entry_point_providers():
+    found = entry_points()
+    if hasattr(found, "select"):
+        found = found.select(group=ENTRY_POINT_GROUP)
+    else:  # Python 3.9
+        found = found.get(ENTRY_POINT_GROUP, [])
+    return {entry_point.name: {"BACKEND": entry_point} for entry_point in found}
+
+
+def _provider_class(name, backend):
+    try:
+        if isinstance(backend, str):
+            return import_string(backend)
+        return backend.load()
+    except (AttributeError, ImportError) as error:
+        raise ImproperlyConfigured(f"Sports provider {name!r}: {error}") from error
+
+
+# settings.SPORTS_PROVIDERS maps a provider name to {"BACKEND": dotted path, "OPTIONS": {...}}
+# (options override class attributes such as ttl_minutes, cost or priority); None disables
+# a provider, including one registered through an entry point. Highest priority comes first.
+def get_providers(names=None):
+    configured = {
+        **_entry_point_providers(),
+        **getattr(settings, "SPORTS_PROVIDERS", DEFAULT_PROVIDERS),
+    }
+    providers = []
+    for name, entry in configured.items():
+        if entry is None or (names is not None and name not in names):
+            continue
+        provider_class = _provider_class(name, entry["BACKEND"])
+        try:
+            provider = provider_class(**entry.get("OPTIONS", {}))
+        except TypeError as error:
+            raise ImproperlyConfigured(f"Sports provider {name!r}: {error}") from error
+        provider.name = name
+        providers.append(provider)
+    return sorted(providers, key=lambda provider: (-provider.priority, provider.name))
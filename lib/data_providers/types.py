@@ -1,6 +1,60 @@
-from dataclasses import dataclass, field
+import hashlib
+import json
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+DISCIPLINES = {
+    "football",
+    "basketball",
+    "volleyball",
+    "boxing",
+    "wrestling",
+    "hockey",
+    "futsal",
+    "tennis",
+    "cs2",
+    "dota2",
+    "pubg",
+}
+MATCH_STATUSES = {"upcoming", "live", "finished"}
+URL_MAX_LENGTH = 200
+
+
+class EntityValidationError(ValueError):
+    pass
+
+
+def _text(value, max_length):
+    return (value or "").strip()[:max_length]
+
+
+def _required_text(value, max_length, label):
+    value = (value or "").strip()
+    if not value:
+        raise EntityValidationError(f"{label} is empty")
+    if len(value) > max_length:
+        raise EntityValidationError(f"{label} is longer than {max_length} characters")
+    return value
+
+
+def _url(value):
+    value = (value or "").strip()
+    if not value.startswith(("http://", "https://")) or len(value) > URL_MAX_LENGTH:
+        return ""
+    return value
+
+
+def _discipline(value):
+    value = (value or "").strip().lower()
+    return value if value in DISCIPLINES else ""
+
+
+# Content hash of the fields a sync writes, stored on the row: an equal fingerprint means the
+# upstream entity has not changed since the last write and the row can be left alone.
+def _fingerprint(*values):
+    payload = json.dumps(values, default=str, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 @dataclass
@@ -16,6 +70,18 @@ class TeamEntity:
     source_url: str = ""
     updated_at: Optional[datetime] = None
 
+    # Field limits mirror teams.Team, so rows can be bulk written without full_clean().
+    def validate(self):
+        self.name = _required_text(self.name, 120, "team name")
+        self.discipline = _discipline(self.discipline)
+        self.country = _text(self.country, 80) or "Kazakhstan"
+        self.city = _text(self.city, 120)
+        self.source_url = _url(self.source_url)
+        return self
+
+    def fingerprint(self):
+        return _fingerprint(self.name, self.discipline, self.country, self.city, self.source_url)
+
 
 @dataclass
 class TournamentEntity:
@@ -30,6 +96,25 @@ class TournamentEntity:
     source_url: str = ""
     updated_at: Optional[datetime] = None
 
+    def validate(self):
+        self.name = _required_text(self.name, 180, "tournament name")
+        self.discipline = _discipline(self.discipline)
+        self.location = _text(self.location, 180)
+        self.source_url = _url(self.source_url)
+        if self.start_date and self.end_date and self.end_date < self.start_date:
+            raise EntityValidationError(f"tournament {self.id} ends before it starts")
+        return self
+
+    def fingerprint(self):
+        return _fingerprint(
+            self.name,
+            self.discipline,
+            self.location,
+            self.start_date,
+            self.end_date,
+            self.source_url,
+        )
+
 
 @dataclass
 class MatchEntity:
@@ -45,6 +130,41 @@ class MatchEntity:
     source_url: str = ""
     updated_at: Optional[datetime] = None
 
+    # Same rules as tournaments.Match.clean(): distinct teams, a score only once play started.
+    def validate(self):
+        self.team_a = _required_text(self.team_a, 120, "home team")
+        self.team_b = _required_text(self.team_b, 120, "away team")
+        if self.team_a == self.team_b:
+            raise EntityValidationError(f"match {self.id} has the same team on both sides")
+        if self.start_time is None:
+            raise EntityValidationError(f"match {self.id} has no start time")
+        self.discipline = _discipline(self.discipline)
+        self.status = self.status if self.status in MATCH_STATUSES else "upcoming"
+        score = self.parsed_score()
+        if self.status == "finished" and score is None:
+            raise EntityValidationError(f"finished match {self.id} has no score")
+        if self.status == "upcoming" and score is not None:
+            raise EntityValidationError(f"upcoming match {self.id} already has a score")
+        return self
+
+    def fingerprint(self):
+        return _fingerprint(
+            self.discipline,
+            self.tournament_id,
+            self.team_a,
+            self.team_b,
+            self.start_time,
+            self.status,
+            self.score if self.status != "upcoming" else "",
+        )
+
+    def parsed_score(self) -> Optional[Tuple[int, int]]:
+        left, separator, right = (self.score or "").partition(":")
+        left, right = left.strip(), right.strip()
+        if not separator or not left.isdigit() or not right.isdigit():
+            return None
+        return int(left), int(right)
+
 
 @dataclass
 class ProviderResult:
@@ -54,3 +174,37 @@ class ProviderResult:
     is_fallback: bool
     fetched_at: datetime
     sources: List[str] = field(default_factory=list)
+
+    def _entities(self):
+        return [*self.teams, *self.tournaments, *self.matches]
+
+    def latest_update(self) -> Optional[datetime]:
+        stamps = [entity.updated_at for entity in self._entities() if entity.updated_at]
+        return max(stamps) if stamps else None
+
+    # Delta view for incremental syncs: entities without a timestamp are always kept.
+    def changed_since(self, since: datetime) -> "ProviderResult":
+        def changed(items):
+            return [item for item in items if item.updated_at is None or item.updated_at > since]
+
+        return replace(
+            self,
+            teams=changed(self.teams),
+            tournaments=changed(self.tournaments),
+            matches=changed(self.matches),
+        )
+
+    def entity_count(self) -> int:
+        return len(self._entities())
+
+
+@dataclass
+class SyncSnapshot:
+    teams: List[TeamEntity]
+    tournaments: List[TournamentEntity]
+    matches: List[MatchEntity]
+    sources: List[str]
+    is_fallback: bool
+    fetched_at: datetime
+    timed_out: List[str] = field(default_factory=list)
+    provider_runs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
@@ -1,60 +1,177 @@
-from dataclasses import asdict
-from datetime import datetime, timezone
-from typing import Dict, List, Optional
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from typing import List
 
+from django.conf import settings
 from django.core.cache import cache
-from django.db import transaction
+from django.db import connection
 from django.utils import timezone as dj_timezone
 
-from teams.models import Team
-from tournaments.models import Match, MatchResult, Tournament
+from core.models import ProviderSyncState, SyncProviderRun, SyncRun
 
-from .data_providers import BasketballProvider, EsportsProvider, FootballProvider
+from .data_providers import get_providers
+from .data_providers.base import ENTITY_TYPES
+from .data_providers.cache import provider_cache
 from .data_providers.fallback_data import (
     FALLBACK_MATCHES,
     FALLBACK_SOURCES,
     FALLBACK_TEAMS,
     FALLBACK_TOURNAMENTS,
 )
-from .data_providers.types import MatchEntity, TeamEntity, TournamentEntity
+from .data_providers.http_utils import HttpUsage, http_client, track_http_usage
+from .data_providers.types import MatchEntity, SyncSnapshot, TeamEntity, TournamentEntity
+from .logo_mirror import mirror_team_logos
+from .sync_lock import single_flight
+from .sync_writer import write_snapshot
+
+logger = logging.getLogger(__name__)
 
 CACHE_KEY = "sports_data_sync_meta_v1"
+LAST_META_KEY = "sports_data_sync_meta_last_v1"
 CACHE_TTL_SECONDS = 60 * 20
+LOCK_NAME = "sports_data_sync"
+BREAKERS_KEY = "provider:breakers"
+DEFAULT_DEADLINE_SECONDS = 30
+DEFAULT_FULL_RESYNC_HOURS = 24
+DEFAULT_SYNC_RUNS_KEEP = 1000
 
 
-def _kind_by_discipline(discipline: str):
-    if discipline in {"football", "basketball"}:
-        return "sport"
-    return "esport"
+def _timed_fetch(provider, refresh, usage):
+    started = time.monotonic()
+    with track_http_usage(usage):
+        result = provider.fetch(refresh=refresh)
+    return result, time.monotonic() - started
 
 
-def _to_aware(dt: Optional[datetime]):
-    if dt is None:
-        return None
-    if dj_timezone.is_naive(dt):
-        return dj_timezone.make_aware(dt)
-    return dt
+def _fetch_providers(providers, deadline_seconds, refresh=False):
+    # Providers run side by side; whatever has not finished by the deadline is left to finish
+    # in the background (its own cache still gets the result) and is reported as timed out.
+    # HTTP calls are counted per provider, including those of a provider that timed out.
+    if not providers:
+        return [], {}
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="sports-sync")
+    usages = [HttpUsage() for _ in providers]
+    futures = [
+        executor.submit(_timed_fetch, provider, refresh, usage)
+        for provider, usage in zip(providers, usages)
+    ]
+    done, _ = wait(futures, timeout=deadline_seconds)
+    executor.shutdown(wait=False, cancel_futures=True)
 
+    results, runs = [], {}
+    for provider, future, usage in zip(providers, futures, usages):
+        if future not in done:
+            logger.warning(
+                "Provider %s exceeded the %ss sync deadline", provider.name, deadline_seconds
+            )
+            runs[provider.name] = {
+                "status": ProviderSyncState.STATUS_TIMEOUT,
+                "duration_seconds": deadline_seconds,
+                "error": f"No result within {deadline_seconds}s",
+                "http": usage.as_dict(),
+            }
+            continue
+        try:
+            result, duration = future.result()
+        except Exception as error:
+            logger.exception("Provider %s failed", provider.name)
+            runs[provider.name] = {
+                "status": ProviderSyncState.STATUS_ERROR,
+                "duration_seconds": None,
+                "error": repr(error),
+                "http": usage.as_dict(),
+            }
+            continue
+        results.append((provider, result))
+        runs[provider.name] = {
+            "status": (
+                ProviderSyncState.STATUS_FALLBACK
+                if result.is_fallback
+                else ProviderSyncState.STATUS_OK
+            ),
+            "duration_seconds": round(duration, 3),
+            "error": "",
+            "http": usage.as_dict(),
+        }
+    return results, runs
 
-def _status_to_model(status: str):
-    if status == "live":
-        return Match.STATUS_LIVE
-    if status == "finished":
-        return Match.STATUS_FINISHED
-    return Match.STATUS_SCHEDULED
 
+# Providers whose next run (stored per provider, or given by the caller) has come, highest
+# priority first. With SPORTS_SYNC_COST_BUDGET set, one run takes only as many of them as the
+# budget allows (always at least one); the rest stay due for the next run.
+def due_providers(providers=None, next_runs=None, now=None):
+    if providers is None:
+        providers = get_providers()
+    if next_runs is None:
+        next_runs = dict(
+            ProviderSyncState.objects.filter(
+                provider__in=[provider.name for provider in providers]
+            ).values_list("provider", "next_run_at")
+        )
+    now = now or dj_timezone.now()
+    due = [
+        provider
+        for provider in providers
+        if next_runs.get(provider.name) is None or next_runs[provider.name] <= now
+    ]
+    budget = getattr(settings, "SPORTS_SYNC_COST_BUDGET", 0)
+    if not budget:
+        return due
+    selected, spent = [], 0
+    for provider in due:
+        if selected and spent + provider.cost > budget:
+            continue
+        selected.append(provider)
+        spent += provider.cost
+    return selected
 
-def _merge_results():
-    providers = [FootballProvider(), BasketballProvider(), EsportsProvider()]
-    provider_results = [provider.fetch() for provider in providers]
+
+def _declared(provider, result):
+    entity_types = getattr(provider, "entity_types", ENTITY_TYPES)
+    return replace(
+        result,
+        **{entity_type: [] for entity_type in ENTITY_TYPES if entity_type not in entity_types},
+    )
+
+
+# With watermarks ({provider name: datetime}) providers that support deltas contribute only
+# the entities changed after their watermark; everything else is a full snapshot.
+def fetch_snapshot(
+    providers=None, deadline_seconds=None, refresh=False, watermarks=None
+) -> SyncSnapshot:
+    if providers is None:
+        providers = get_providers()
+    if deadline_seconds is None:
+        deadline_seconds = getattr(
+            settings, "SPORTS_SYNC_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS
+        )
+    provider_results, runs = _fetch_providers(providers, deadline_seconds, refresh)
+    timed_out = [
+        name for name, run in runs.items() if run["status"] == ProviderSyncState.STATUS_TIMEOUT
+    ]
 
     teams: List[TeamEntity] = []
     tournaments: List[TournamentEntity] = []
     matches: List[MatchEntity] = []
     sources: List[str] = []
     fallback = False
+    has_matches = False
 
-    for result in provider_results:
+    for provider, result in provider_results:
+        result = _declared(provider, result)
+        run = runs[provider.name]
+        run.update(mode="full", received=result.entity_count())
+        has_matches = has_matches or bool(result.matches)
+        since = (watermarks or {}).get(provider.name)
+        if getattr(provider, "supports_delta", False):
+            run["watermark"] = result.latest_update()
+            if since is not None:
+                run["mode"] = "delta"
+                result = result.changed_since(since)
+        run["entities"] = result.entity_count()
         teams.extend(result.teams)
         tournaments.extend(result.tournaments)
         matches.extend(result.matches)
@@ -62,142 +179,243 @@ def _merge_results():
         fallback = fallback or result.is_fallback
 
     # If schedule data is incomplete, fallback ensures UI still has consistent cards.
-    if not matches:
+    if not has_matches:
         fallback = True
         teams.extend(FALLBACK_TEAMS)
         tournaments.extend(FALLBACK_TOURNAMENTS)
         matches.extend(FALLBACK_MATCHES)
         sources.extend(FALLBACK_SOURCES)
 
-    # Deduplicate by id preserving first occurrence.
-    teams_map = {item.id: item for item in teams}
-    tournaments_map = {item.id: item for item in tournaments}
-    matches_map = {item.id: item for item in matches}
-
-    fetched_at = datetime.now(timezone.utc)
-    return (
-        list(teams_map.values()),
-        list(tournaments_map.values()),
-        list(matches_map.values()),
-        sorted(set(sources)),
-        fallback,
-        fetched_at,
+    # Deduplicate by id preserving first occurrence: providers come highest priority first,
+    # the fallback data last, so it only fills gaps.
+    teams_map, tournaments_map, matches_map = {}, {}, {}
+    for items, by_id in (
+        (teams, teams_map),
+        (tournaments, tournaments_map),
+        (matches, matches_map),
+    ):
+        for item in items:
+            by_id.setdefault(item.id, item)
+
+    return SyncSnapshot(
+        teams=list(teams_map.values()),
+        tournaments=list(tournaments_map.values()),
+        matches=list(matches_map.values()),
+        sources=sorted(set(sources)),
+        is_fallback=fallback,
+        fetched_at=datetime.now(timezone.utc),
+        timed_out=timed_out,
+        provider_runs=runs,
     )
 
 
-@transaction.atomic
-def refresh_sports_data(force: bool = False):
-    if not force:
-        cached = cache.get(CACHE_KEY)
-        if cached:
-            return cached
+def _http_delta(before, after):
+    delta = {}
+    for host, values in after.items():
+        previous = before.get(host, {})
+        changes = {name: value - previous.get(name, 0) for name, value in values.items()}
+        if changes["requests"] or changes["rejected"]:
+            changes["seconds"] = round(changes["seconds"], 3)
+            delta[host] = changes
+    return delta
 
-    teams, tournaments, matches, sources, is_fallback, fetched_at = _merge_results()
-
-    teams_by_name: Dict[str, Team] = {}
-    for item in teams:
-        team, _ = Team.objects.get_or_create(
-            name=item.name,
-            defaults={
-                "kind": _kind_by_discipline(item.discipline),
-                "discipline": (
-                    item.discipline if item.discipline in dict(Team.DISCIPLINE_CHOICES) else ""
-                ),
-                "country": item.country or "Kazakhstan",
-                "is_manual": False,
-                "is_active": True,
-            },
-        )
-        if not team.is_manual:
-            team.kind = _kind_by_discipline(item.discipline)
-            team.discipline = (
-                item.discipline if item.discipline in dict(Team.DISCIPLINE_CHOICES) else ""
+
+def _record_provider_runs(started_at, finished_at, runs, providers):
+    ttl_minutes = {provider.name: provider.ttl_minutes for provider in providers}
+    for name, run in runs.items():
+        defaults = {
+            "last_started_at": started_at,
+            "last_finished_at": finished_at,
+            "next_run_at": finished_at + timedelta(minutes=ttl_minutes[name]),
+            "last_duration_seconds": run["duration_seconds"],
+            "last_status": run["status"],
+            "last_error": run["error"],
+        }
+        if run["status"] == ProviderSyncState.STATUS_OK:
+            defaults["last_success_at"] = finished_at
+            if run.get("watermark"):
+                defaults["watermark"] = run["watermark"]
+            if run.get("mode") == "full":
+                defaults["last_full_sync_at"] = finished_at
+        ProviderSyncState.objects.update_or_create(provider=name, defaults=defaults)
+
+
+def _record_sync_run(started_at, finished_at, meta, full):
+    totals = {
+        key: sum(counts[key] for counts in meta["written"].values())
+        for key in ("created", "updated", "unchanged", "skipped")
+    }
+    timings = meta["timings"]
+    run = SyncRun.objects.create(
+        started_at=started_at,
+        finished_at=finished_at,
+        duration_seconds=round((finished_at - started_at).total_seconds(), 3),
+        fetch_seconds=timings["fetch_seconds"],
+        write_seconds=timings["write_seconds"],
+        logo_seconds=timings["logo_seconds"],
+        full=full,
+        is_fallback=meta["is_fallback"],
+        **{f"rows_{key}": value for key, value in totals.items()},
+    )
+    provider_runs = []
+    for name, provider_run in meta["provider_runs"].items():
+        http = provider_run.get("http", {})
+        provider_runs.append(
+            SyncProviderRun(
+                run=run,
+                provider=name,
+                status=provider_run["status"],
+                mode=provider_run.get("mode", ""),
+                fetch_seconds=provider_run["duration_seconds"],
+                http_requests=http.get("requests", 0),
+                http_bytes=http.get("bytes", 0),
+                # Calls refused by an open circuit breaker count as failed calls too.
+                http_errors=http.get("errors", 0) + http.get("rejected", 0),
+                entities_received=provider_run.get("received", 0),
+                entities_written=provider_run.get("entities", 0),
+                error=provider_run["error"],
             )
-            team.country = item.country or "Kazakhstan"
-            team.city = item.city or ""
-            team.source_url = item.source_url or ""
-            team.source_updated_at = _to_aware(item.updated_at)
-            team.is_active = True
-            team.save()
-        teams_by_name[item.name] = team
-
-    tournaments_by_ext: Dict[str, Tournament] = {}
-    for item in tournaments:
-        start = item.start_date.date() if item.start_date else dj_timezone.now().date()
-        end = item.end_date.date() if item.end_date else start
-        tournament, _ = Tournament.objects.get_or_create(
-            name=item.name,
-            defaults={
-                "kind": _kind_by_discipline(item.discipline),
-                "discipline": (
-                    item.discipline
-                    if item.discipline in dict(Tournament.DISCIPLINE_CHOICES)
-                    else ""
-                ),
-                "location": item.location or "",
-                "start_date": start,
-                "end_date": end,
-            },
-        )
-        tournament.kind = _kind_by_discipline(item.discipline)
-        tournament.discipline = (
-            item.discipline if item.discipline in dict(Tournament.DISCIPLINE_CHOICES) else ""
         )
-        tournament.location = item.location or ""
-        tournament.start_date = start
-        tournament.end_date = end
-        tournament.source_url = item.source_url or ""
-        tournament.source_updated_at = _to_aware(item.updated_at)
-        tournament.save()
-        tournaments_by_ext[item.id] = tournament
-        tournaments_by_ext[item.name] = tournament
-
-    for item in matches:
-        team_a = teams_by_name.get(item.team_a)
-        team_b = teams_by_name.get(item.team_b)
-        tournament = tournaments_by_ext.get(item.tournament_id)
-        if not tournament:
-            tournament = tournaments_by_ext.get(item.tournament_id.replace("-", " ").title())
-        if not team_a or not team_b or not tournament:
-            continue
+    SyncProviderRun.objects.bulk_create(provider_runs)
+    keep = max(1, getattr(settings, "SYNC_RUNS_KEEP", DEFAULT_SYNC_RUNS_KEEP))
+    cutoff = list(
+        SyncRun.objects.order_by("-started_at").values_list("started_at", flat=True)[
+            keep - 1 : keep
+        ]
+    )
+    if cutoff:
+        SyncRun.objects.filter(started_at__lt=cutoff[0]).delete()
+    return run
 
-        start_time = _to_aware(item.start_time) or dj_timezone.now()
-        match, _ = Match.objects.get_or_create(
-            tournament=tournament,
-            team_a=team_a,
-            team_b=team_b,
-            datetime=start_time,
-            defaults={"stage": "", "status": _status_to_model(item.status)},
-        )
-        match.status = _status_to_model(item.status)
-        match.stream_url = item.stream_url or ""
-        match.source_url = item.source_url or tournament.source_url or ""
-        match.source_updated_at = _to_aware(item.updated_at)
-        match.save()
-
-        if item.score and ":" in item.score:
-            left, right = [part.strip() for part in item.score.split(":", 1)]
-            if left.isdigit() and right.isdigit():
-                a_score = int(left)
-                b_score = int(right)
-                winner = None
-                if a_score > b_score:
-                    winner = team_a
-                elif b_score > a_score:
-                    winner = team_b
-                MatchResult.objects.update_or_create(
-                    match=match,
-                    defaults={"score_a": a_score, "score_b": b_score, "winner": winner},
-                )
 
+# Incremental runs need a watermark and a full sync within SPORTS_FULL_RESYNC_HOURS; a provider
+# past that period gets a full run, which heals rows that drifted or were skipped by a delta.
+def _watermarks(providers, full):
+    if full:
+        return {}
+    hours = getattr(settings, "SPORTS_FULL_RESYNC_HOURS", DEFAULT_FULL_RESYNC_HOURS)
+    states = ProviderSyncState.objects.filter(
+        provider__in=[provider.name for provider in providers],
+        watermark__isnull=False,
+        last_full_sync_at__gte=dj_timezone.now() - timedelta(hours=hours),
+    )
+    return dict(states.values_list("provider", "watermark"))
+
+
+# Two phases: providers fetch into an in-memory snapshot with no transaction open and the
+# connection released, then write_snapshot applies the diff in one short transaction.
+def _run_sync(providers, refresh=False, full=False):
+    if connection.in_atomic_block:
+        raise RuntimeError("refresh_sports_data must not be called inside a transaction.")
+    watermarks = _watermarks(providers, full)
+    connection.close()
+
+    started_at = dj_timezone.now()
+    http_before = http_client.metrics()
+    started = time.monotonic()
+    snapshot = fetch_snapshot(providers, refresh=refresh, watermarks=watermarks)
+    fetched = time.monotonic()
+    http_stats = _http_delta(http_before, http_client.metrics())
+    # Breakers live in the fetching process (often the scheduler); the shared provider cache
+    # makes their state visible to the web workers as well.
+    breakers = http_client.breaker.states()
+    provider_cache().set(BREAKERS_KEY, breakers, None)
+    written = write_snapshot(snapshot.teams, snapshot.tournaments, snapshot.matches)
+    finished = time.monotonic()
+    logos = mirror_team_logos(snapshot.teams)
+    mirrored = time.monotonic()
+    finished_at = dj_timezone.now()
+    _record_provider_runs(started_at, finished_at, snapshot.provider_runs, providers)
+
+    timings = {
+        "fetch_seconds": round(fetched - started, 3),
+        "write_seconds": round(finished - fetched, 3),
+        "logo_seconds": round(mirrored - finished, 3),
+    }
+    logger.info(
+        "Sports data sync: fetch %.3fs, write %.3fs, logos %.3fs, %s; logos %s",
+        timings["fetch_seconds"],
+        timings["write_seconds"],
+        timings["logo_seconds"],
+        "; ".join(
+            f"{model} " + " ".join(f"{key}={value}" for key, value in counts.items())
+            for model, counts in written.items()
+        ),
+        " ".join(f"{key}={value}" for key, value in logos.items()),
+    )
     meta = {
-        "is_fallback": is_fallback,
-        "fetched_at": fetched_at,
-        "sources": sources,
+        "is_fallback": snapshot.is_fallback,
+        "fetched_at": snapshot.fetched_at,
+        "sources": snapshot.sources,
+        "timed_out": snapshot.timed_out,
+        "written": written,
+        "logos": logos,
+        "provider_runs": snapshot.provider_runs,
+        "timings": timings,
+        "http": http_stats,
+        "breakers": breakers,
     }
-    cache.set(CACHE_KEY, meta, CACHE_TTL_SECONDS)
+    meta["run_id"] = _record_sync_run(started_at, finished_at, meta, full).pk
     return meta
 
 
+# Single flight across workers: whoever gets the lock syncs; for everyone else this returns
+# None straight away instead of running a parallel sync. With only_due, providers whose next
+# run has not come yet are left out, and nothing runs (None) if no provider is due.
+def sync_providers(names=None, refresh=False, reuse_cached=False, full=False, only_due=False):
+    providers = get_providers(names)
+    if only_due:
+        providers = due_providers(providers)
+    if not providers:
+        return None
+    with single_flight(LOCK_NAME) as lock:
+        if not lock.acquired:
+            logger.info("Sports data sync already running")
+            return None
+        if reuse_cached:
+            cached = cache.get(CACHE_KEY)
+            if cached:
+                return cached
+
+        meta = _run_sync(providers, refresh, full)
+        meta["lock"] = lock.as_dict()
+        logger.info(
+            "Sports data sync lock: wait %.3fs, hold %.3fs",
+            meta["lock"]["wait_seconds"],
+            meta["lock"]["hold_seconds"],
+        )
+        cache.set(CACHE_KEY, meta, CACHE_TTL_SECONDS)
+        cache.set(LAST_META_KEY, meta, None)
+    return meta
+
+
+def refresh_sports_data(force: bool = False):
+    if not force:
+        cached = cache.get(CACHE_KEY)
+        if cached:
+            return cached
+    meta = sync_providers(reuse_cached=not force, only_due=not force)
+    return meta if meta is not None else get_data_meta()
+
+
+# The cached meta is per process; the provider states in the DB are what every worker (and
+# the scheduler process) share, so they decide freshness when they are newer.
 def get_data_meta():
-    return cache.get(CACHE_KEY) or {"is_fallback": True, "fetched_at": None, "sources": []}
+    cached = cache.get(CACHE_KEY) or cache.get(LAST_META_KEY)
+    meta = dict(cached or {"is_fallback": True, "fetched_at": None, "sources": []})
+    breakers = {**(provider_cache().get(BREAKERS_KEY) or {}), **http_client.breaker.states()}
+    if breakers:
+        meta["breakers"] = breakers
+    states = list(ProviderSyncState.objects.all())
+    if not states:
+        return meta
+
+    meta["providers"] = {state.provider: state.as_meta() for state in states}
+    successes = [state.last_success_at for state in states if state.last_success_at]
+    if successes and (meta["fetched_at"] is None or max(successes) > meta["fetched_at"]):
+        meta["fetched_at"] = max(successes)
+    if cached is None:
+        meta["is_fallback"] = any(
+            state.last_status != ProviderSyncState.STATUS_OK for state in states
+        )
+    return meta
@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, UnidentifiedImageError
+
+from core.page_cache import bump_page_generation
+from teams.models import Team
+
+from .data_providers.cache import provider_cache
+from .data_providers.fixtures import MODE_LIVE
+from .data_providers.http_utils import http_client
+from .data_providers.types import TeamEntity
+
+logger = logging.getLogger(__name__)
+
+LOGO_DIRECTORY = "logos/sync"
+VALIDATORS_KEY = "logo:{}"
+DEFAULT_WORKERS = 4
+BATCH_SIZE = 500
+USER_AGENT = "KZArenaData/1.0"
+# Same formats as dashboard uploads; SVG and anything else that is not a raster image stays
+# out, as MEDIA is served from the site's own origin.
+IMAGE_FORMATS = {"PNG": ".png", "JPEG": ".jpg", "WEBP": ".webp"}
+
+_store_lock = threading.Lock()
+
+
+def _counts():
+    return {"urls": 0, "downloaded": 0, "not_modified": 0, "deduplicated": 0, "failed": 0}
+
+
+# Decided by decoding the bytes, never by the upstream Content-Type or the URL.
+def _image_extension(body: bytes) -> Optional[str]:
+    try:
+        with Image.open(BytesIO(body)) as image:
+            image.verify()
+            return IMAGE_FORMATS.get(image.format)
+    except (UnidentifiedImageError, OSError, SyntaxError, ValueError):
+        return None
+
+
+# One badge URL: a conditional GET with the validators from the last run (kept in the shared
+# provider cache), then the body is stored under its content hash, so a badge served from
+# several URLs, or unchanged behind a new ETag, is written once. Returns (status, name).
+def _mirror(url, storage, client):
+    key = VALIDATORS_KEY.format(hashlib.sha256(url.encode("utf-8")).hexdigest()[:24])
+    known = provider_cache().get(key)
+    headers = {"User-Agent": USER_AGENT}
+    revalidate = bool(known) and storage.exists(known["name"])
+    if revalidate:
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+
+    status, response_headers, body = client.get_bytes(url, headers=headers)
+    if status == 304 and revalidate:
+        return "not_modified", known["name"]
+    extension = _image_extension(body)
+    if extension is None:
+        raise ValueError(f"{url} did not return a PNG, JPEG or WEBP image")
+
+    name = f"{LOGO_DIRECTORY}/{hashlib.sha256(body).hexdigest()[:32]}{extension}"
+    outcome = "deduplicated"
+    # Two URLs serving the same image must not both save it: the storage would rename the copy.
+    with _store_lock:
+        if not storage.exists(name):
+            name = storage.save(name, ContentFile(body))
+            outcome = "downloaded"
+    provider_cache().set(
+        key,
+        {
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "name": name,
+        },
+        None,
+    )
+    return outcome, name
+
+
+def _mirror_all(urls, storage, client, counts):
+    workers = max(1, getattr(settings, "SPORTS_LOGO_WORKERS", DEFAULT_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="logo-mirror") as executor:
+        futures = {url: executor.submit(_mirror, url, storage, client) for url in urls}
+    names = {}
+    for url, future in futures.items():
+        try:
+            outcome, name = future.result()
+        except Exception as error:
+            logger.warning("Mirroring team logo %s failed: %s", url, error)
+            counts["failed"] += 1
+            continue
+        counts[outcome] += 1
+        names[url] = name
+    return names
+
+
+# Copies provider badges (TeamEntity.logo) into the media storage and attaches them to the
+# synced teams. Manual teams keep whatever logo an editor gave them; a failed download keeps
+# the team's current logo. Runs after write_snapshot, outside its transaction; skipped when
+# SPORTS_LOGO_MIRROR is off and in fixture record/replay modes, which carry JSON only.
+def mirror_team_logos(teams: List[TeamEntity], client=None) -> Dict[str, int]:
+    counts = _counts()
+    counts["attached"] = 0
+    if client is None:
+        if getattr(settings, "SPORTS_HTTP_MODE", MODE_LIVE) != MODE_LIVE:
+            return counts
+        client = http_client
+    urls_by_name = {team.name: team.logo.strip() for team in teams if team.logo.strip()}
+    if not urls_by_name or not getattr(settings, "SPORTS_LOGO_MIRROR", True):
+        return counts
+
+    synced = list(Team.objects.filter(name__in=urls_by_name, is_manual=False))
+    urls = sorted({urls_by_name[team.name] for team in synced})
+    counts["urls"] = len(urls)
+    if not urls:
+        return counts
+
+    storage = Team._meta.get_field("logo").storage
+    names = _mirror_all(urls, storage, client, counts)
+    now = timezone.now()
+    changed = []
+    for team in synced:
+        name = names.get(urls_by_name[team.name])
+        if name is None or team.logo.name == name:
+            continue
+        team.logo = name
+        team.logo_url = storage.url(name)
+        team.updated_at = now
+        changed.append(team)
+    if changed:
+        Team.objects.bulk_update(changed, ["logo", "logo_url", "updated_at"], batch_size=BATCH_SIZE)
+        bump_page_generation("teams", "matches")
+    counts["attached"] = len(changed)
+    return counts
@@ -0,0 +1,108 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class _AdvisoryLock:
+    backend = "postgres_advisory"
+
+    def __init__(self, name):
+        digest = hashlib.sha256(name.encode()).digest()
+        self.key = int.from_bytes(digest[:8], "big", signed=True)
+        self.connection = None
+
+    def acquire(self):
+        # A session of its own, so the caller's connection can still be closed while the
+        # lock is held (the sync fetches over the network with no connection open).
+        self.connection = connections.create_connection(DEFAULT_DB_ALIAS)
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [self.key])
+            acquired = cursor.fetchone()[0]
+        if not acquired:
+            self.connection.close()
+        return acquired
+
+    def release(self):
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [self.key])
+        finally:
+            self.connection.close()
+
+
+class _FileLock:
+    backend = "file"
+
+    def __init__(self, name):
+        self.path = Path(settings.SYNC_LOCK_DIR) / f"{name}.lock"
+        self.handle = None
+
+    def acquire(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.handle = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            self.handle.close()
+            return False
+        return True
+
+    def release(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+            else:
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self.handle.close()
+
+
+class SingleFlight:
+    def __init__(self, backend, acquired, wait_seconds):
+        self.backend = backend
+        self.acquired = acquired
+        self.wait_seconds = wait_seconds
+        self.acquired_at = time.monotonic()
+
+    def held_seconds(self):
+        return round(time.monotonic() - self.acquired_at, 3) if self.acquired else 0.0
+
+    def as_dict(self):
+        return {
+            "backend": self.backend,
+            "wait_seconds": self.wait_seconds,
+            "hold_seconds": self.held_seconds(),
+        }
+
+
+# Cross-worker, non-blocking: exactly one caller gets acquired=True, the rest return at once.
+# PostgreSQL uses a session advisory lock, other databases (SQLite) a lock file.
+@contextmanager
+def single_flight(name):
+    if connections[DEFAULT_DB_ALIAS].vendor == "postgresql":
+        lock = _AdvisoryLock(name)
+    else:
+        lock = _FileLock(name)
+    started = time.monotonic()
+    acquired = lock.acquire()
+    state = SingleFlight(lock.backend, acquired, round(time.monotonic() - started, 3))
+    try:
+        yield state
+    finally:
+        if acquired:
+            lock.release()
@@ -0,0 +1,79 @@
+import math
+from typing import Dict, List, Optional
+
+from core.models import SyncRun
+
+PERCENTILES = (50, 90, 99)
+RUN_METRICS = ("duration_seconds", "fetch_seconds", "write_seconds", "logo_seconds")
+PROVIDER_METRICS = ("fetch_seconds", "http_requests", "http_bytes", "http_errors")
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 1000
+
+
+# Nearest-rank percentile; None when there is nothing to rank.
+def percentile(values: List[float], rank: int) -> Optional[float]:
+    values = sorted(value for value in values if value is not None)
+    if not values:
+        return None
+    return values[max(0, math.ceil(rank / 100 * len(values)) - 1)]
+
+
+def _percentiles(values):
+    return {f"p{rank}": percentile(values, rank) for rank in PERCENTILES}
+
+
+def _serialize_run(run):
+    return {
+        "id": run.pk,
+        "started_at": run.started_at,
+        "finished_at": run.finished_at,
+        "full": run.full,
+        "is_fallback": run.is_fallback,
+        **{metric: getattr(run, metric) for metric in RUN_METRICS},
+        "rows": {
+            "created": run.rows_created,
+            "updated": run.rows_updated,
+            "unchanged": run.rows_unchanged,
+            "skipped": run.rows_skipped,
+        },
+        "providers": {
+            provider_run.provider: {
+                "status": provider_run.status,
+                "mode": provider_run.mode,
+                "fetch_seconds": provider_run.fetch_seconds,
+                "http_requests": provider_run.http_requests,
+                "http_bytes": provider_run.http_bytes,
+                "http_errors": provider_run.http_errors,
+                "entities_received": provider_run.entities_received,
+                "entities_written": provider_run.entities_written,
+                "error": provider_run.error,
+            }
+            for provider_run in run.providers.all()
+        },
+    }
+
+
+# The last `limit` sync runs (newest first) with p50/p90/p99 of the phase timings over them,
+# and per provider of fetch time and HTTP calls, bytes and errors.
+def sync_report(limit: int = DEFAULT_LIMIT) -> Dict:
+    limit = max(1, min(limit, MAX_LIMIT))
+    runs = [
+        _serialize_run(run)
+        for run in SyncRun.objects.order_by("-started_at").prefetch_related("providers")[:limit]
+    ]
+    by_provider: Dict[str, Dict[str, list]] = {}
+    for run in runs:
+        for name, provider_run in run["providers"].items():
+            metrics = by_provider.setdefault(name, {metric: [] for metric in PROVIDER_METRICS})
+            for metric in PROVIDER_METRICS:
+                metrics[metric].append(provider_run[metric])
+    return {
+        "runs": runs,
+        "percentiles": {
+            **{metric: _percentiles([run[metric] for run in runs]) for metric in RUN_METRICS},
+            "providers": {
+                name: {metric: _percentiles(values) for metric, values in metrics.items()}
+                for name, metrics in sorted(by_provider.items())
+            },
+        },
+    }
@@ -0,0 +1,332 @@
+import logging
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.page_cache import bump_page_generation
+from core.utils import generate_unique_slugs
+from teams.models import Team
+from tournaments.models import Match, MatchResult, Tournament
+
+from .data_providers.types import (
+    EntityValidationError,
+    MatchEntity,
+    TeamEntity,
+    TournamentEntity,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+PAGE_NAMESPACES = ("teams", "tournaments", "matches")
+TEAM_FIELDS = ["kind", "discipline", "country", "city", "source_url", "is_active"]
+TOURNAMENT_FIELDS = ["kind", "discipline", "location", "start_date", "end_date", "source_url"]
+MATCH_FIELDS = ["status", "score_home", "score_away"]
+SOURCE_FIELDS = ["source_fingerprint", "source_updated_at", "updated_at"]
+RESULT_FIELDS = ["score_a", "score_b", "winner"]
+
+
+def _kind_by_discipline(discipline: str):
+    if discipline in {"football", "basketball"}:
+        return "sport"
+    return "esport"
+
+
+def _to_aware(dt: Optional[datetime]):
+    if dt is None:
+        return None
+    if timezone.is_naive(dt):
+        return timezone.make_aware(dt)
+    return dt
+
+
+def _to_date(dt: Optional[datetime]) -> Optional[date]:
+    if dt is None:
+        return None
+    return dt.date() if isinstance(dt, datetime) else dt
+
+
+def _counts():
+    return {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0}
+
+
+def _validated(entities: Iterable, counts, key):
+    valid = {}
+    for entity in entities:
+        try:
+            entity.validate()
+        except EntityValidationError as error:
+            counts["skipped"] += 1
+            logger.warning("Skipping %s %s: %s", type(entity).__name__, entity.id, error)
+            continue
+        valid.setdefault(key(entity), entity)
+    return list(valid.values())
+
+
+def _apply(instance, values):
+    changed = False
+    for field_name, value in values.items():
+        if getattr(instance, field_name) != value:
+            setattr(instance, field_name, value)
+            changed = True
+    return changed
+
+
+# An existing row is only touched when the entity's fingerprint differs from the stored one.
+# updated_at moves only with real content changes; a row whose fields already match (e.g.
+# written before fingerprints existed) just gets its fingerprint stored.
+def _update(instance, values, fingerprint, now, to_update, counts):
+    if instance.source_fingerprint == fingerprint:
+        counts["unchanged"] += 1
+        return False
+    changed = _apply(instance, values)
+    if changed:
+        instance.updated_at = now
+        counts["updated"] += 1
+    else:
+        counts["unchanged"] += 1
+    instance.source_fingerprint = fingerprint
+    to_update.append(instance)
+    return changed
+
+
+def _bulk_write(model, to_create, to_update, update_fields, counts):
+    if to_create:
+        model.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+    if to_update:
+        model.objects.bulk_update(to_update, update_fields, batch_size=BATCH_SIZE)
+    counts["created"] += len(to_create)
+
+
+def _write_teams(items: List[TeamEntity], now, counts) -> Dict[str, Team]:
+    items = _validated(items, counts, lambda item: item.name)
+    existing = {team.name: team for team in Team.objects.filter(name__in=[i.name for i in items])}
+    to_create, to_update = [], []
+
+    for item in items:
+        values = {
+            "kind": _kind_by_discipline(item.discipline),
+            "discipline": item.discipline,
+            "country": item.country,
+            "city": item.city,
+            "source_url": item.source_url,
+            "is_active": True,
+        }
+        team = existing.get(item.name)
+        if team is None:
+            team = Team(name=item.name, is_manual=False, **values)
+            team.source_updated_at = _to_aware(item.updated_at)
+            team.source_fingerprint = item.fingerprint()
+            existing[item.name] = team
+            to_create.append(team)
+        elif team.is_manual:
+            counts["unchanged"] += 1
+        elif _update(team, values, item.fingerprint(), now, to_update, counts):
+            team.source_updated_at = _to_aware(item.updated_at)
+
+    for team, slug in zip(to_create, generate_unique_slugs(Team, [t.name for t in to_create])):
+        team.slug = slug
+    _bulk_write(Team, to_create, to_update, TEAM_FIELDS + SOURCE_FIELDS, counts)
+    return {item.name: existing[item.name] for item in items}
+
+
+def _write_tournaments(items: List[TournamentEntity], now, counts) -> Dict[str, Tournament]:
+    items = _validated(items, counts, lambda item: item.name)
+    existing = {}
+    for tournament in Tournament.objects.filter(name__in=[i.name for i in items]).order_by("pk"):
+        existing.setdefault(tournament.name, tournament)
+    today = timezone.localdate()
+    to_create, to_update = [], []
+    by_reference = {}
+
+    for item in items:
+        tournament = existing.get(item.name)
+        start = _to_date(item.start_date) or (tournament.start_date if tournament else today)
+        end = _to_date(item.end_date) or max(start, tournament.end_date if tournament else start)
+        values = {
+            "kind": _kind_by_discipline(item.discipline),
+            "discipline": item.discipline,
+            "location": (tournament.city if tournament else "") or item.location,
+            "start_date": start,
+            "end_date": end,
+            "source_url": item.source_url,
+        }
+        if tournament is None:
+            tournament = Tournament(name=item.name, **values)
+            tournament.source_updated_at = _to_aware(item.updated_at)
+            tournament.source_fingerprint = item.fingerprint()
+            existing[item.name] = tournament
+            to_create.append(tournament)
+        elif _update(tournament, values, item.fingerprint(), now, to_update, counts):
+            tournament.source_updated_at = _to_aware(item.updated_at)
+        by_reference[item.id] = tournament
+        by_reference[item.name] = tournament
+
+    slugs = generate_unique_slugs(Tournament, [t.name for t in to_create])
+    for tournament, slug in zip(to_create, slugs):
+        tournament.slug = slug
+    _bulk_write(Tournament, to_create, to_update, TOURNAMENT_FIELDS + SOURCE_FIELDS, counts)
+    return by_reference
+
+
+def _tournament_name(reference):
+    return reference.replace("-", " ").title()
+
+
+# An incremental snapshot may carry a changed match without its (unchanged) teams or
+# tournament; those are looked up among the stored rows, one query per model at most.
+def _with_stored_references(items, teams_by_name, tournaments_by_reference):
+    team_names = {name for item in items for name in (item.team_a, item.team_b)}
+    missing_teams = team_names - set(teams_by_name)
+    if missing_teams:
+        teams_by_name = dict(teams_by_name)
+        teams_by_name.update(
+            (team.name, team) for team in Team.objects.filter(name__in=missing_teams)
+        )
+
+    missing_tournaments = {
+        reference
+        for item in items
+        for reference in (item.tournament_id, _tournament_name(item.tournament_id))
+        if item.tournament_id not in tournaments_by_reference
+        and _tournament_name(item.tournament_id) not in tournaments_by_reference
+    }
+    if missing_tournaments:
+        tournaments_by_reference = dict(tournaments_by_reference)
+        stored = Tournament.objects.filter(name__in=missing_tournaments).order_by("-pk")
+        tournaments_by_reference.update((tournament.name, tournament) for tournament in stored)
+    return teams_by_name, tournaments_by_reference
+
+
+def _write_matches(
+    items: List[MatchEntity], teams_by_name, tournaments_by_reference, now, counts, result_counts
+):
+    items = _validated(items, counts, lambda item: item.id)
+    teams_by_name, tournaments_by_reference = _with_stored_references(
+        items, teams_by_name, tournaments_by_reference
+    )
+    rows = {}
+    for item in items:
+        home_team = teams_by_name.get(item.team_a)
+        away_team = teams_by_name.get(item.team_b)
+        tournament = tournaments_by_reference.get(item.tournament_id)
+        if not tournament:
+            tournament = tournaments_by_reference.get(_tournament_name(item.tournament_id))
+        if not home_team or not away_team or not tournament:
+            counts["skipped"] += 1
+            continue
+        start_datetime = _to_aware(item.start_time)
+        key = (tournament.pk, home_team.pk, away_team.pk, start_datetime)
+        rows.setdefault(key, (item, tournament, home_team, away_team, start_datetime))
+    if not rows:
+        return
+
+    start_times = [row[4] for row in rows.values()]
+    existing = {
+        (match.tournament_id, match.home_team_id, match.away_team_id, match.start_datetime): match
+        for match in Match.objects.filter(
+            tournament_id__in={row[1].pk for row in rows.values()},
+            start_datetime__range=(min(start_times), max(start_times)),
+        )
+    }
+    to_create, to_update = [], []
+    scored = []
+
+    for key, (item, tournament, home_team, away_team, start_datetime) in rows.items():
+        score = item.parsed_score() if item.status != Match.STATUS_UPCOMING else None
+        values = {
+            "status": item.status,
+            "score_home": score[0] if score else None,
+            "score_away": score[1] if score else None,
+        }
+        fingerprint = item.fingerprint()
+        match = existing.get(key)
+        if match is None:
+            match = Match(
+                title=f"{home_team.name} vs {away_team.name}",
+                kind=tournament.kind,
+                discipline=item.discipline or tournament.discipline,
+                tournament=tournament,
+                home_team=home_team,
+                away_team=away_team,
+                start_datetime=start_datetime,
+                **values,
+            )
+            match.source_fingerprint = fingerprint
+            to_create.append(match)
+        elif match.source_fingerprint == fingerprint:
+            # Scores only come with the match, so its result is unchanged as well.
+            counts["unchanged"] += 1
+            continue
+        else:
+            _update(match, values, fingerprint, now, to_update, counts)
+        if score:
+            scored.append((match, score))
+
+    _bulk_write(
+        Match, to_create, to_update, MATCH_FIELDS + ["source_fingerprint", "updated_at"], counts
+    )
+    _write_results(scored, result_counts)
+
+
+def _write_results(scored, counts):
+    if not scored:
+        return
+    existing = {
+        result.match_id: result
+        for result in MatchResult.objects.filter(match_id__in=[match.pk for match, _ in scored])
+    }
+    to_create, to_update = [], []
+
+    for match, (score_a, score_b) in scored:
+        winner_id = None
+        if score_a > score_b:
+            winner_id = match.home_team_id
+        elif score_b > score_a:
+            winner_id = match.away_team_id
+        values = {"score_a": score_a, "score_b": score_b, "winner_id": winner_id}
+        result = existing.get(match.pk)
+        if result is None:
+            to_create.append(MatchResult(match=match, **values))
+        elif _apply(result, values):
+            to_update.append(result)
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+
+    _bulk_write(MatchResult, to_create, to_update, RESULT_FIELDS, counts)
+
+
+# Set-based upsert of one provider snapshot: rows are matched by natural key (team and
+# tournament name; tournament, teams and kick-off for matches) with one read per model, and
+# only new rows and rows whose fingerprint changed are written. Returns created / updated /
+# unchanged / skipped counts per model. Bulk writes skip save() and signals, so the entities
+# are validated up front and the public page caches are bumped here.
+def write_snapshot(
+    teams: List[TeamEntity], tournaments: List[TournamentEntity], matches: List[MatchEntity]
+):
+    now = timezone.now()
+    stats = {
+        "teams": _counts(),
+        "tournaments": _counts(),
+        "matches": _counts(),
+        "results": _counts(),
+    }
+
+    with transaction.atomic():
+        teams_by_name = _write_teams(teams, now, stats["teams"])
+        tournaments_by_reference = _write_tournaments(tournaments, now, stats["tournaments"])
+        _write_matches(
+            matches,
+            teams_by_name,
+            tournaments_by_reference,
+            now,
+            stats["matches"],
+            stats["results"],
+        )
+        if any(counts["created"] or counts["updated"] for counts in stats.values()):
+            transaction.on_commit(lambda: bump_page_generation(*PAGE_NAMESPACES))
+
+    return stats
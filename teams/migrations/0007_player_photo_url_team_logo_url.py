@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-17 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0006_team_is_example_alter_team_discipline"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="player",
+            name="photo_url",
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name="team",
+            name="logo_url",
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.28 on 2026-10-17 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0007_player_photo_url_team_logo_url"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="team",
+            name="source_fingerprint",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
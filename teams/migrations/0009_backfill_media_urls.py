@@ -0,0 +1,57 @@
+import posixpath
+
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def _existing_names(storage, names):
+    existing = set()
+    by_directory = {}
+    for name in names:
+        if name:
+            by_directory.setdefault(posixpath.dirname(name), set()).add(name)
+    for directory, wanted in by_directory.items():
+        try:
+            _, files = storage.listdir(directory)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        existing.update(wanted & {posixpath.join(directory, file_name) for file_name in files})
+    return existing
+
+
+def _backfill_urls(model, file_field, url_field, fallback=None):
+    storage = model._meta.get_field(file_field).storage
+    names = model.objects.exclude(**{f"{file_field}__isnull": True}).exclude(**{file_field: ""})
+    existing_names = _existing_names(storage, set(names.values_list(file_field, flat=True)))
+    changed = []
+    for instance in model.objects.order_by("pk").iterator(chunk_size=BATCH_SIZE):
+        field_file = getattr(instance, file_field)
+        url = ""
+        if field_file and field_file.name in existing_names:
+            try:
+                url = field_file.url
+            except Exception:
+                url = ""
+        if not url and fallback is not None:
+            url = fallback(instance)
+        if url != getattr(instance, url_field):
+            setattr(instance, url_field, url)
+            changed.append(instance)
+    model.objects.bulk_update(changed, [url_field], batch_size=BATCH_SIZE)
+
+
+def backfill_media_urls(apps, schema_editor):
+    _backfill_urls(apps.get_model("teams", "Team"), "logo", "logo_url")
+    _backfill_urls(apps.get_model("teams", "Player"), "photo", "photo_url")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("teams", "0008_team_source_fingerprint"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_media_urls, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,6 @@
 ﻿from django.db import models
 
-from core.utils import generate_unique_slug
+from core.utils import generate_unique_slug, resolve_file_url
 
 
 class Team(models.Model):
@@ -42,10 +42,12 @@ class Team(models.Model):
     discipline = models.CharField(max_length=20, choices=DISCIPLINE_CHOICES, blank=True)
     description = models.TextField(blank=True)
     logo = models.ImageField(upload_to="logos/", blank=True, null=True)
+    logo_url = models.CharField(max_length=500, blank=True, editable=False)
     country = models.CharField(max_length=80, default="Kazakhstan")
     city = models.CharField(max_length=120, blank=True)
     source_url = models.URLField(blank=True)
     source_updated_at = models.DateTimeField(blank=True, null=True)
+    source_fingerprint = models.CharField(max_length=64, blank=True, editable=False)
     is_manual = models.BooleanField(default=True)
     is_example = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
@@ -62,6 +64,13 @@ class Team(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = generate_unique_slug(self, self.name)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "logo" in update_fields:
+            self.logo_url = resolve_file_url(self.logo)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "logo_url"}
+
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -79,6 +88,7 @@ class Player(models.Model):
         related_name="players",
     )
     photo = models.ImageField(upload_to="players/", blank=True, null=True)
+    photo_url = models.CharField(max_length=500, blank=True, editable=False)
     position = models.CharField(max_length=120, blank=True)
     bio = models.TextField(blank=True)
     source_url = models.URLField(blank=True)
@@ -91,6 +101,13 @@ class Player(models.Model):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = generate_unique_slug(self, self.name)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "photo" in update_fields:
+            self.photo_url = resolve_file_url(self.photo)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "photo_url"}
+
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -29,13 +29,9 @@ def team_logo_url(team):
             TEAM_PLACEHOLDER_BY_DISCIPLINE.get(discipline, "placeholders/news/default.svg")
         )
 
-    logo = getattr(team, "logo", None)
-    if logo and getattr(logo, "name", ""):
-        try:
-            if logo.storage.exists(logo.name):
-                return logo.url
-        except Exception:
-            pass
+    logo_url = getattr(team, "logo_url", "")
+    if logo_url:
+        return logo_url
 
     mapped = resolve_team_logo_asset(getattr(team, "name", ""))
     if mapped:
@@ -45,11 +41,4 @@ def team_logo_url(team):
 
 @register.filter(name="player_photo_url")
 def player_photo_url(player):
-    photo = getattr(player, "photo", None)
-    if photo and getattr(photo, "name", ""):
-        try:
-            if photo.storage.exists(photo.name):
-                return photo.url
-        except Exception:
-            pass
-    return static("placeholders/players/default.svg")
+    return getattr(player, "photo_url", "") or static("placeholders/players/default.svg")
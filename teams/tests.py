@@ -1,12 +1,20 @@
+import shutil
+import tempfile
+from importlib import import_module
+from io import StringIO
 from unittest.mock import patch
 
+from django.apps import apps
 from django.contrib.auth.models import Group, User
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
 
 from articles.models import Article
 
 from .models import Player, Team
+from .templatetags.team_media import team_logo_url
 
 
 class TeamPublicPagesTests(TestCase):
@@ -60,7 +68,13 @@ class TeamPublicPagesTests(TestCase):
         astana_team = Team.objects.get(name="Astana")
         novaq_team = Team.objects.get(name="NOVAQ")
         golden_barys_team = Team.objects.get(name="Golden Barys")
-        for team in [self.featured_team, astana_team, novaq_team, golden_barys_team, *example_teams[:6]]:
+        for team in [
+            self.featured_team,
+            astana_team,
+            novaq_team,
+            golden_barys_team,
+            *example_teams[:6],
+        ]:
             Player.objects.create(
                 team=team,
                 name=f"Player for {team.name}",
@@ -206,3 +220,41 @@ class TeamDashboardCrudTests(TestCase):
         self.assertEqual(self.team.city, "Almaty")
         self.assertEqual(self.team.description, "Обновлено через dashboard.")
         self.assertTrue(self.team.players.filter(name="Macao", position="Support").exists())
+
+
+class TeamMediaUrlTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_logo_url_is_stored_on_save_and_reconciled_in_bulk(self):
+        team = Team(name="Media United", kind=Team.KIND_SPORT)
+        team.logo = SimpleUploadedFile("media-united.png", b"fake-png", content_type="image/png")
+        team.save()
+        team.refresh_from_db()
+        self.assertEqual(team.logo_url, team.logo.url)
+        self.assertEqual(team_logo_url(team), team.logo_url)
+
+        team.logo.storage.delete(team.logo.name)
+        call_command("reconcile_media_urls", "--model", "team", stdout=StringIO())
+
+        team.refresh_from_db()
+        self.assertEqual(team.logo_url, "")
+        self.assertTrue(team_logo_url(team).endswith(".svg"))
+
+    def test_migration_backfills_urls_of_existing_rows(self):
+        team = Team(name="Backfilled", kind=Team.KIND_SPORT)
+        team.logo = SimpleUploadedFile("backfilled.png", b"fake-png", content_type="image/png")
+        team.save()
+        missing = Team.objects.create(name="Missing logo", kind=Team.KIND_SPORT)
+        Team.objects.filter(pk=missing.pk).update(logo="logos/missing.png")
+        Team.objects.update(logo_url="")
+
+        migration = import_module("teams.migrations.0009_backfill_media_urls")
+        migration.backfill_media_urls(apps, None)
+
+        self.assertEqual(Team.objects.get(pk=team.pk).logo_url, team.logo.url)
+        self.assertEqual(Team.objects.get(pk=missing.pk).logo_url, "")
@@ -4,6 +4,7 @@ from django.shortcuts import get_object_or_404, render
 from django.utils import timezone
 
 from articles.models import Article
+from core.page_cache import cache_public_page, public_query_string
 from tournaments.models import Match
 
 from .models import Team
@@ -14,6 +15,8 @@ FEATURED_TEAM_KEYS = (
     ("novaq",),
     ("golden-barys",),
 )
+
+
 def _normalize_team_key(value):
     return (value or "").strip().lower()
 
@@ -56,6 +59,10 @@ def _build_public_team_collection(queryset):
     return decorated
 
 
+TEAM_LIST_PARAMS = ("kind", "discipline", "page")
+
+
+@cache_public_page(namespaces=("teams",), query_params=TEAM_LIST_PARAMS)
 def team_list(request):
     kind = request.GET.get("kind", "").strip()
     discipline = request.GET.get("discipline", "").strip()
@@ -72,9 +79,6 @@ def team_list(request):
     paginator = Paginator(public_teams, 12)
     page_obj = paginator.get_page(request.GET.get("page"))
 
-    query_params = request.GET.copy()
-    query_params.pop("page", None)
-
     return render(
         request,
         "teams/team_list.html",
@@ -86,7 +90,7 @@ def team_list(request):
                 "kind": kind,
                 "discipline": discipline,
             },
-            "pagination_query": query_params.urlencode(),
+            "pagination_query": public_query_string(request, TEAM_LIST_PARAMS),
             "discipline_choices": Team.DISCIPLINE_CHOICES,
             "breadcrumbs": [
                 {"label": "Главная", "url": "core:home"},
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.28 on 2026-10-17 17:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournaments", "0006_alter_match_options_alter_matchresult_options_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="tournament",
+            index=models.Index(fields=["start_date", "id"], name="tournaments_start_d_18f05d_idx"),
+        ),
+    ]
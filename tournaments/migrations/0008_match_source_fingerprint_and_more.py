@@ -0,0 +1,23 @@
+# Generated by Django 4.2.28 on 2026-10-17 18:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournaments", "0007_tournament_tournaments_start_d_18f05d_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="match",
+            name="source_fingerprint",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="tournament",
+            name="source_fingerprint",
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+    ]
@@ -63,6 +63,7 @@ class Tournament(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     source_url = models.URLField(blank=True)
     source_updated_at = models.DateTimeField(blank=True, null=True)
+    source_fingerprint = models.CharField(max_length=64, blank=True, editable=False)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -70,6 +71,7 @@ class Tournament(models.Model):
         indexes = [
             models.Index(fields=["kind", "discipline", "start_date"]),
             models.Index(fields=["status", "is_example"]),
+            models.Index(fields=["start_date", "id"]),
         ]
 
     def clean(self):
@@ -148,6 +150,7 @@ class Match(models.Model):
     score_home = models.PositiveIntegerField(blank=True, null=True)
     score_away = models.PositiveIntegerField(blank=True, null=True)
     is_example = models.BooleanField(default=False)
+    source_fingerprint = models.CharField(max_length=64, blank=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
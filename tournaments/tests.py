@@ -1,12 +1,63 @@
-from unittest.mock import patch
+import copy
+import json
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO, StringIO
+from unittest.mock import Mock, patch
 
 from django.contrib.auth.models import Group, User
-from django.test import TestCase
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from PIL import Image
 
+from core.models import ProviderSyncState, SyncRun
+from lib import data_sync
+from lib.data_providers import BaseProvider, EsportsProvider, get_providers
+from lib.data_providers.cache import _key_lock, _refresh_lock_name, cached_fetch
+from lib.data_providers.fixtures import (
+    FixtureClient,
+    FixtureMissing,
+    FixtureStore,
+    StandInClient,
+    StandInServer,
+)
+from lib.data_providers.http_utils import (
+    CircuitBreaker,
+    CircuitOpen,
+    HostRateLimiter,
+    HttpError,
+    ProviderHttpClient,
+    ResponseTooLarge,
+    fetch_json,
+    track_http_usage,
+    use_transport,
+    with_http_usage,
+)
+from lib.data_providers.types import (
+    MatchEntity,
+    ProviderResult,
+    SyncSnapshot,
+    TeamEntity,
+    TournamentEntity,
+)
+from lib.logo_mirror import mirror_team_logos
+from lib.sync_lock import single_flight
+from lib.sync_report import sync_report
+from lib.sync_writer import write_snapshot
 from teams.models import Team
 
-from .models import Match, Tournament
+from .models import Match, MatchResult, Tournament
 
 
 class TournamentPublicPagesTests(TestCase):
@@ -151,3 +202,884 @@ class MatchDashboardCrudTests(TestCase):
         response = self.client.get(reverse("dashboard:match_list"))
 
         self.assertEqual(response.status_code, 403)
+
+
+SYNC_KICKOFF = datetime(2026, 5, 1, 15, 0, tzinfo=dt_timezone.utc)
+# Sync and provider cache tests must not touch the file-based provider cache on disk.
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "providers": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "provider-tests",
+    },
+}
+
+
+def _sync_entities(size, score="", prefix="Sync"):
+    teams = [
+        TeamEntity(id=f"t{i}", name=f"{prefix} Team {i}", discipline="football", country="")
+        for i in range(size * 2)
+    ]
+    tournaments = [
+        TournamentEntity(
+            id="sync-cup",
+            name=f"{prefix} Cup",
+            discipline="football",
+            start_date=SYNC_KICKOFF,
+            end_date=SYNC_KICKOFF + timedelta(days=30),
+        )
+    ]
+    matches = [
+        MatchEntity(
+            id=f"m{i}",
+            discipline="football",
+            tournament_id="sync-cup",
+            team_a=f"{prefix} Team {2 * i}",
+            team_b=f"{prefix} Team {2 * i + 1}",
+            start_time=SYNC_KICKOFF + timedelta(days=i),
+            status="finished" if score else "upcoming",
+            score=score,
+        )
+        for i in range(size)
+    ]
+    return teams, tournaments, matches
+
+
+class SportsDataSyncWriterTests(TestCase):
+    def _count_queries(self, snapshot):
+        with CaptureQueriesContext(connection) as queries:
+            stats = write_snapshot(*snapshot)
+        return len(queries), stats
+
+    def test_snapshot_is_written_with_a_fixed_number_of_queries(self):
+        small_queries, _ = self._count_queries(_sync_entities(2))
+        large_queries, stats = self._count_queries(_sync_entities(20, prefix="Bulk"))
+
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(stats["matches"]["created"], 20)
+        team = Team.objects.get(name="Sync Team 0")
+        self.assertFalse(team.is_manual)
+        self.assertEqual(team.country, "Kazakhstan")
+        self.assertTrue(team.slug)
+        match = Match.objects.get(home_team=team)
+        self.assertEqual(match.title, "Sync Team 0 vs Sync Team 1")
+        self.assertEqual(match.kind, Tournament.KIND_SPORT)
+
+    def test_bench_sync_reports_every_phase_and_rolls_back(self):
+        out = StringIO()
+
+        call_command("bench_sync", "--teams", "4", "--matches", "6", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("fetch: ", output)
+        self.assertIn("write #1: ", output)
+        self.assertIn("matches created=0 updated=0 unchanged=6 skipped=0", output)
+        self.assertIn("bench_sync finished: matches=6", output)
+        self.assertFalse(Team.objects.filter(name__startswith="Bench Team").exists())
+
+    def test_only_changed_rows_are_updated(self):
+        write_snapshot(*_sync_entities(3))
+
+        unchanged_queries, stats = self._count_queries(_sync_entities(3))
+        self.assertEqual(
+            stats["matches"], {"created": 0, "updated": 0, "unchanged": 3, "skipped": 0}
+        )
+        self.assertEqual(stats["teams"]["unchanged"], 6)
+        self.assertLessEqual(unchanged_queries, 6)
+
+        stats = write_snapshot(*_sync_entities(3, score="2:1"))
+        self.assertEqual(stats["matches"]["updated"], 3)
+        self.assertEqual(stats["results"]["created"], 3)
+        result = MatchResult.objects.select_related("match").get(
+            match__home_team__name="Sync Team 0"
+        )
+        self.assertEqual((result.score_a, result.score_b), (2, 1))
+        self.assertEqual(result.winner_id, result.match.home_team_id)
+        self.assertEqual(result.match.status, Match.STATUS_FINISHED)
+
+    def test_rows_with_an_unchanged_fingerprint_are_not_rewritten(self):
+        write_snapshot(*_sync_entities(2))
+        team = Team.objects.get(name="Sync Team 0")
+        self.assertEqual(len(team.source_fingerprint), 64)
+        # Rows written before fingerprints existed only get the fingerprint stored.
+        Team.objects.filter(pk=team.pk).update(source_fingerprint="")
+        stale = timezone.now() - timedelta(days=1)
+        Match.objects.update(updated_at=stale)
+
+        stats = write_snapshot(*_sync_entities(2))
+
+        self.assertEqual(stats["teams"]["unchanged"], 4)
+        self.assertEqual(stats["teams"]["updated"], 0)
+        team.refresh_from_db()
+        self.assertEqual(len(team.source_fingerprint), 64)
+        self.assertFalse(Match.objects.exclude(updated_at=stale).exists())
+
+        teams, tournaments, matches = _sync_entities(2)
+        teams[0].city = "Almaty"
+        stats = write_snapshot(teams, tournaments, matches)
+        self.assertEqual(stats["teams"]["updated"], 1)
+        self.assertEqual(stats["teams"]["unchanged"], 3)
+        self.assertEqual(Team.objects.get(name="Sync Team 0").city, "Almaty")
+
+    def test_manual_teams_are_kept_and_invalid_entities_skipped(self):
+        manual = Team.objects.create(name="Sync Team 0", kind=Team.KIND_ESPORT, city="Taraz")
+        teams, tournaments, matches = _sync_entities(2)
+        matches.append(
+            MatchEntity(
+                id="bad",
+                discipline="football",
+                tournament_id="sync-cup",
+                team_a="Sync Team 1",
+                team_b="Sync Team 1",
+                start_time=SYNC_KICKOFF,
+                status="upcoming",
+            )
+        )
+
+        stats = write_snapshot(teams, tournaments, matches)
+
+        manual.refresh_from_db()
+        self.assertEqual(manual.city, "Taraz")
+        self.assertEqual(manual.kind, Team.KIND_ESPORT)
+        self.assertEqual(
+            stats["matches"], {"created": 2, "updated": 0, "unchanged": 0, "skipped": 1}
+        )
+
+
+@override_settings(SYNC_LOCK_DIR=tempfile.gettempdir(), CACHES=LOCMEM_CACHES)
+class SportsDataSyncPhasesTests(TransactionTestCase):
+    def setUp(self):
+        caches["default"].clear()
+        caches["providers"].clear()
+
+    def _snapshot(self):
+        teams, tournaments, matches = _sync_entities(2, prefix="Phase")
+        return SyncSnapshot(
+            teams=teams,
+            tournaments=tournaments,
+            matches=matches,
+            sources=["https://example.com/"],
+            is_fallback=False,
+            fetched_at=SYNC_KICKOFF,
+        )
+
+    def test_fetch_runs_outside_a_transaction_and_phases_are_timed(self):
+        def fetch(*args, **kwargs):
+            self.assertFalse(connection.in_atomic_block)
+            return self._snapshot()
+
+        with patch("lib.data_sync.fetch_snapshot", side_effect=fetch):
+            meta = data_sync.refresh_sports_data(force=True)
+
+        self.assertEqual(Match.objects.filter(tournament__name="Phase Cup").count(), 2)
+        self.assertEqual(meta["written"]["matches"]["created"], 2)
+        self.assertEqual(set(meta["timings"]), {"fetch_seconds", "write_seconds", "logo_seconds"})
+        self.assertEqual(meta["lock"]["backend"], "file")
+
+    def test_concurrent_caller_gets_previous_meta_while_a_sync_runs(self):
+        with patch("lib.data_sync.fetch_snapshot", return_value=self._snapshot()):
+            previous = data_sync.refresh_sports_data(force=True)
+        caches["default"].delete(data_sync.CACHE_KEY)
+
+        with patch("lib.data_sync.fetch_snapshot") as fetch, single_flight(data_sync.LOCK_NAME):
+            meta = data_sync.refresh_sports_data()
+
+        fetch.assert_not_called()
+        self.assertEqual(meta["fetched_at"], previous["fetched_at"])
+
+    def test_scheduler_runs_due_providers_and_records_their_state(self):
+        snapshot = self._snapshot()
+        snapshot.provider_runs = {
+            "football": {"status": "ok", "duration_seconds": 0.4, "error": ""},
+            "esports": {"status": "timeout", "duration_seconds": 30, "error": "late"},
+        }
+
+        with patch("lib.data_sync.fetch_snapshot", return_value=snapshot) as fetch:
+            call_command("run_sync_scheduler", "--once", stdout=StringIO())
+
+        self.assertTrue(fetch.call_args.kwargs["refresh"])
+        states = {state.provider: state for state in ProviderSyncState.objects.all()}
+        self.assertEqual(set(states), {"football", "basketball", "esports"})
+        self.assertGreater(states["basketball"].next_run_at, timezone.now())
+        self.assertEqual(states["football"].last_status, ProviderSyncState.STATUS_OK)
+        self.assertIsNotNone(states["football"].last_success_at)
+        self.assertEqual(states["esports"].last_status, ProviderSyncState.STATUS_TIMEOUT)
+        self.assertIsNone(states["esports"].last_success_at)
+
+        caches["default"].clear()
+        meta = data_sync.get_data_meta()
+        self.assertEqual(meta["fetched_at"], states["football"].last_success_at)
+        self.assertTrue(meta["is_fallback"])
+        self.assertEqual(meta["providers"]["football"]["last_duration_seconds"], 0.4)
+
+    def test_breaker_state_from_the_fetching_process_is_in_the_meta(self):
+        snapshot = self._snapshot()
+        states = {"liquipedia.net": {"state": "open", "failures": 5, "retry_at": SYNC_KICKOFF}}
+
+        with patch("lib.data_sync.fetch_snapshot", return_value=snapshot):
+            with patch.object(data_sync.http_client.breaker, "states", return_value=states):
+                meta = data_sync.refresh_sports_data(force=True)
+        self.assertEqual(meta["breakers"], states)
+
+        caches["default"].clear()
+        self.assertEqual(data_sync.get_data_meta()["breakers"], states)
+
+    @override_settings(SYNC_RUNS_KEEP=2)
+    def test_each_run_is_recorded_and_reported_with_percentiles(self):
+        for duration in (0.4, 0.2, 0.3):
+            snapshot = self._snapshot()
+            snapshot.provider_runs = {
+                "football": {
+                    "status": "ok",
+                    "duration_seconds": duration,
+                    "error": "",
+                    "mode": "full",
+                    "received": 6,
+                    "entities": 6,
+                    "http": {"requests": 2, "bytes": 512, "errors": 0, "rejected": 1},
+                }
+            }
+            with patch("lib.data_sync.fetch_snapshot", return_value=snapshot):
+                meta = data_sync.refresh_sports_data(force=True)
+
+        self.assertEqual(SyncRun.objects.count(), 2)
+        run = SyncRun.objects.get(pk=meta["run_id"])
+        self.assertEqual((run.rows_created, run.rows_updated), (0, 0))
+        self.assertEqual(run.rows_unchanged, 7)
+        provider_run = run.providers.get()
+        self.assertEqual(
+            (provider_run.http_requests, provider_run.http_bytes, provider_run.http_errors),
+            (2, 512, 1),
+        )
+
+        report = sync_report(10)
+        self.assertEqual([item["id"] for item in report["runs"]][0], run.pk)
+        self.assertEqual(
+            report["percentiles"]["providers"]["football"]["fetch_seconds"],
+            {"p50": 0.2, "p90": 0.3, "p99": 0.3},
+        )
+        output = StringIO()
+        call_command("sync_report", "--last", "1", stdout=output)
+        self.assertIn("football: ok full", output.getvalue())
+        self.assertIn("sync_report finished: runs=1", output.getvalue())
+
+    def test_refusing_to_fetch_inside_an_open_transaction(self):
+        with patch("lib.data_sync.fetch_snapshot") as fetch, transaction.atomic():
+            with self.assertRaises(RuntimeError):
+                data_sync.refresh_sports_data(force=True)
+
+        fetch.assert_not_called()
+
+
+class _StubProvider(BaseProvider):
+    def __init__(self, name, teams, release=None, **options):
+        super().__init__(**options)
+        self.name = name
+        self.teams = teams
+        self.release = release
+
+    def fetch(self, refresh=False):
+        if self.release is not None:
+            self.release.wait(5)
+        return ProviderResult(
+            teams=self.teams,
+            tournaments=[],
+            matches=[],
+            is_fallback=False,
+            fetched_at=SYNC_KICKOFF,
+            sources=[f"https://{self.name}.example.com/"],
+        )
+
+
+class SportsProviderFetchTests(SimpleTestCase):
+    def test_slow_provider_is_dropped_at_the_deadline(self):
+        teams, _, _ = _sync_entities(1, prefix="Fast")
+        release = threading.Event()
+        providers = [
+            _StubProvider("fast", teams),
+            _StubProvider("slow", _sync_entities(1, prefix="Slow")[0], release=release),
+        ]
+
+        started = time.monotonic()
+        try:
+            snapshot = data_sync.fetch_snapshot(providers, deadline_seconds=0.3)
+        finally:
+            release.set()
+
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(snapshot.timed_out, ["slow"])
+        self.assertIn("Fast Team 0", [team.name for team in snapshot.teams])
+        self.assertNotIn("Slow Team 0", [team.name for team in snapshot.teams])
+
+    def test_empty_provider_list_falls_back_without_fetching(self):
+        snapshot = data_sync.fetch_snapshot([], deadline_seconds=0.3)
+
+        self.assertTrue(snapshot.is_fallback)
+        self.assertEqual((snapshot.provider_runs, snapshot.timed_out), ({}, []))
+
+    def test_rate_limiter_spaces_requests_per_host(self):
+        limiter = HostRateLimiter({"liquipedia.net": 0.1})
+        self.assertEqual(limiter.interval_for("example.com"), 0)
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            list(pool.map(lambda _: limiter.wait("liquipedia.net"), range(3)))
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+
+
+class ProviderRegistryTests(SimpleTestCase):
+    @override_settings(
+        SPORTS_PROVIDERS={
+            "football": {
+                "BACKEND": "lib.data_providers.FootballProvider",
+                "OPTIONS": {"ttl_minutes": 1},
+            },
+            "esports": {
+                "BACKEND": "lib.data_providers.EsportsProvider",
+                "OPTIONS": {"priority": 99},
+            },
+            "basketball": None,
+        }
+    )
+    def test_settings_configure_options_order_and_disabled_sources(self):
+        providers = get_providers()
+
+        self.assertEqual([provider.name for provider in providers], ["esports", "football"])
+        self.assertEqual(providers[1].ttl_minutes, 1)
+        self.assertEqual(providers[1].cache_key, "provider:football")
+        self.assertEqual([provider.name for provider in get_providers(["football"])], ["football"])
+
+    @override_settings(
+        SPORTS_PROVIDERS={
+            "football": {"BACKEND": "lib.data_providers.FootballProvider", "OPTIONS": {"ttl": 1}}
+        }
+    )
+    def test_unknown_option_is_a_configuration_error(self):
+        with self.assertRaises(ImproperlyConfigured):
+            get_providers()
+
+    @override_settings(SPORTS_SYNC_COST_BUDGET=3)
+    def test_only_due_providers_run_within_the_cost_budget(self):
+        providers = [
+            _StubProvider("live", [], cost=1, priority=30),
+            _StubProvider("rosters", [], cost=5, priority=20),
+            _StubProvider("wiki", [], cost=2, priority=10),
+            _StubProvider("later", [], cost=1, priority=0),
+        ]
+        now = timezone.now()
+        next_runs = {"live": now, "rosters": now, "later": now + timedelta(hours=1)}
+
+        due = data_sync.due_providers(providers, next_runs, now)
+
+        self.assertEqual([provider.name for provider in due], ["live", "wiki"])
+
+    def test_entities_outside_the_declared_types_are_dropped(self):
+        teams, _, _ = _sync_entities(1, prefix="Undeclared")
+        provider = _StubProvider("schedule", teams, entity_types=("matches",))
+
+        snapshot = data_sync.fetch_snapshot([provider])
+
+        self.assertNotIn("Undeclared Team 0", [team.name for team in snapshot.teams])
+        self.assertEqual(snapshot.provider_runs["schedule"]["entities"], 0)
+
+
+LIQUIPEDIA_QUERY_FIXTURES = {
+    EsportsProvider.liq_cs_api: {
+        "query": {
+            "redirects": [{"from": "PGL Major", "to": "PGL Major Championship"}],
+            "pages": [
+                {"pageid": 1, "title": "AVANGAR", "touched": "2026-04-02T08:00:00Z"},
+                {"pageid": 2, "title": "K23", "touched": "2026-03-15T12:30:00Z"},
+                {"pageid": 3, "title": "PGL Major Championship", "touched": "2026-04-01T10:00:00Z"},
+            ],
+        }
+    },
+    EsportsProvider.liq_dota_api: {
+        "query": {
+            "normalized": [{"from": "dreamLeague", "to": "DreamLeague"}],
+            "pages": [
+                {"pageid": 4, "title": "Kazakhstan", "touched": "2026-02-20T09:00:00Z"},
+                {"pageid": 5, "title": "DreamLeague", "touched": "2026-04-03T18:45:00Z"},
+            ],
+        }
+    },
+    EsportsProvider.liq_pubg_api: {
+        "query": {
+            "pages": [
+                {"pageid": 6, "title": "Kazakhstan", "touched": "2026-01-10T07:00:00Z"},
+                {"pageid": 7, "title": "PUBG Continental Series"},
+                {"title": "PUBG Nations Cup", "missing": True},
+            ],
+        }
+    },
+}
+
+
+class EsportsProviderBatchingTests(SimpleTestCase):
+    def _fetch(self, provider):
+        calls = []
+
+        def fake_fetch_json(url, params=None, **kwargs):
+            calls.append((url, params))
+            return LIQUIPEDIA_QUERY_FIXTURES[url]
+
+        with patch("lib.data_providers.esports_provider.fetch_json", side_effect=fake_fetch_json):
+            return provider._fetch_live(), calls
+
+    def test_seven_tracked_titles_take_one_request_per_wiki(self):
+        result, calls = self._fetch(EsportsProvider())
+
+        # One opensearch request per tracked title used to make this 7 requests.
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(
+            sorted(params["titles"] for _, params in calls),
+            [
+                "AVANGAR|K23|PGL Major",
+                "Kazakhstan|DreamLeague",
+                "Kazakhstan|PUBG Continental Series",
+            ],
+        )
+        self.assertEqual(
+            [(team.id, team.name, team.source_url) for team in result.teams],
+            [
+                ("cs2-avangar", "AVANGAR", "https://liquipedia.net/counterstrike/AVANGAR"),
+                ("cs2-k23", "K23", "https://liquipedia.net/counterstrike/K23"),
+                (
+                    "dota2-kazakhstan",
+                    "Team Kazakhstan (Dota 2)",
+                    "https://liquipedia.net/dota2/Kazakhstan",
+                ),
+                ("pubg-kazakhstan", "Kazakhstan", "https://liquipedia.net/pubg/Kazakhstan"),
+            ],
+        )
+        self.assertEqual(
+            [(tournament.id, tournament.name) for tournament in result.tournaments],
+            [
+                ("cs2-pgl%20major", "PGL Major"),
+                ("dota2-dreamleague", "DreamLeague"),
+                ("pubg-pubg%20continental%20series", "PUBG Continental Series"),
+            ],
+        )
+        self.assertFalse(result.is_fallback)
+
+    def test_normalized_titles_match_and_missing_pages_are_skipped(self):
+        provider = EsportsProvider()
+        provider.tracked_tournaments = [
+            ("dota2", "dreamLeague", "https://liquipedia.net/dota2/DreamLeague"),
+            ("pubg", "PUBG Nations Cup", "https://liquipedia.net/pubg/PUBG_Nations_Cup"),
+        ]
+
+        result, calls = self._fetch(provider)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual([tournament.name for tournament in result.tournaments], ["dreamLeague"])
+
+
+@override_settings(SYNC_LOCK_DIR=tempfile.gettempdir(), CACHES=LOCMEM_CACHES)
+class IncrementalSyncTests(TransactionTestCase):
+    def setUp(self):
+        self.fixtures = copy.deepcopy(LIQUIPEDIA_QUERY_FIXTURES)
+        patcher = patch(
+            "lib.data_providers.esports_provider.fetch_json",
+            side_effect=lambda url, params=None, **kwargs: self.fixtures[url],
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _sync(self, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            meta = data_sync.sync_providers(["esports"], refresh=True, **kwargs)
+        return meta["provider_runs"]["esports"], len(queries)
+
+    # Replays the recorded Liquipedia answers: a full run, an unchanged incremental run and
+    # one with a single touched page, comparing entities processed and queries issued.
+    def test_incremental_runs_process_only_pages_touched_after_the_watermark(self):
+        full, full_queries = self._sync()
+        unchanged, unchanged_queries = self._sync()
+        self.fixtures[EsportsProvider.liq_cs_api]["query"]["pages"][1][
+            "touched"
+        ] = "2026-05-01T00:00:00Z"
+        delta, _ = self._sync()
+
+        self.assertEqual((full["mode"], full["received"], full["entities"]), ("full", 7, 7))
+        self.assertEqual((unchanged["mode"], unchanged["entities"]), ("delta", 1))
+        self.assertEqual((delta["mode"], delta["entities"]), ("delta", 2))
+        self.assertLess(unchanged_queries, full_queries)
+        state = ProviderSyncState.objects.get(provider="esports")
+        self.assertEqual(state.watermark, datetime(2026, 5, 1, tzinfo=dt_timezone.utc))
+        self.assertIsNotNone(state.last_full_sync_at)
+
+        with override_settings(SPORTS_FULL_RESYNC_HOURS=0):
+            resync, _ = self._sync()
+        self.assertEqual((resync["mode"], resync["entities"]), ("full", 7))
+        self.assertEqual(self._sync(full=True)[0]["mode"], "full")
+
+
+class ProviderFixtureTests(SimpleTestCase):
+    def setUp(self):
+        scratch = tempfile.TemporaryDirectory()
+        self.addCleanup(scratch.cleanup)
+        self.store = FixtureStore(scratch.name)
+
+    def _record_liquipedia(self):
+        live = Mock()
+        live.get_json.side_effect = lambda url, **kwargs: LIQUIPEDIA_QUERY_FIXTURES[url]
+        with use_transport(FixtureClient(self.store, "record", live)):
+            recorded = EsportsProvider()._fetch_live()
+        return recorded, live
+
+    def test_recorded_answers_replay_without_the_network(self):
+        recorded, live = self._record_liquipedia()
+        self.assertEqual(live.get_json.call_count, 3)
+
+        with override_settings(
+            SPORTS_HTTP_MODE="replay", SPORTS_HTTP_FIXTURES_DIR=self.store.directory
+        ):
+            replayed = EsportsProvider()._fetch_live()
+            with self.assertRaises(FixtureMissing):
+                fetch_json("https://liquipedia.net/dota2/api.php", params={"titles": "Unknown"})
+
+        self.assertEqual(replayed.teams, recorded.teams)
+        self.assertEqual(live.get_json.call_count, 3)
+
+    def test_stand_in_server_serves_fixtures_over_http_with_revalidation(self):
+        self._record_liquipedia()
+        client = ProviderHttpClient(HostRateLimiter({}))
+        self.addCleanup(client.close)
+
+        with StandInServer(self.store) as server:
+            with use_transport(StandInClient(client, server.base_url)):
+                first = EsportsProvider()._fetch_live()
+                second = EsportsProvider()._fetch_live()
+
+        self.assertEqual(first.teams, second.teams)
+        self.assertEqual(len(first.teams), 4)
+        metrics = client.metrics()["127.0.0.1"]
+        self.assertEqual((metrics["requests"], metrics["not_modified"]), (6, 3))
+
+
+def _png_bytes():
+    output = BytesIO()
+    Image.new("RGB", (2, 2), "red").save(output, "PNG")
+    return output.getvalue()
+
+
+BADGE_PNG = _png_bytes()
+BADGE_SVG = b'<svg xmlns="http://www.w3.org/2000/svg"><script>alert(1)</script></svg>'
+
+
+class _ProviderStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections = 0
+    flaky_calls = 0
+    badge_calls = []
+
+    def setup(self):
+        type(self).connections += 1
+        super().setup()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self._send(304, headers={"ETag": '"v1"'})
+            else:
+                self._send(200, json.dumps({"teams": ["A"]}).encode(), {"ETag": '"v1"'})
+        elif self.path == "/flaky":
+            type(self).flaky_calls += 1
+            if self.flaky_calls == 1:
+                self._send(503, b"busy")
+            else:
+                self._send(200, b'{"ok": true}')
+        elif self.path == "/down":
+            self._send(503, b"down")
+        elif self.path == "/big":
+            self._send(200, b"[" + b"1," * 2000 + b"1]")
+        elif self.path in ("/badge.png", "/badge-copy.png"):
+            type(self).badge_calls.append(self.headers.get("If-None-Match"))
+            if self.headers.get("If-None-Match") == '"b1"':
+                self._send(304, headers={"ETag": '"b1"'})
+            else:
+                self._send(200, BADGE_PNG, {"ETag": '"b1"', "Content-Type": "image/png"})
+        elif self.path == "/not-an-image":
+            self._send(200, b"<html></html>", {"Content-Type": "text/html"})
+        elif self.path == "/badge.svg":
+            self._send(200, BADGE_SVG, {"Content-Type": "image/svg+xml"})
+        elif self.path == "/html-as.png":
+            self._send(
+                200, b"<html><script>alert(1)</script></html>", {"Content-Type": "image/png"}
+            )
+        else:
+            self._send(404)
+
+
+class ProviderHttpClientTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ProviderStubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        _ProviderStubHandler.connections = 0
+        _ProviderStubHandler.flaky_calls = 0
+        self.client = ProviderHttpClient(HostRateLimiter({}), backoff_seconds=0.01, max_bytes=1000)
+        self.addCleanup(self.client.close)
+
+    def test_revalidation_reuses_body_and_connection(self):
+        first = self.client.get_json(f"{self.base_url}/etag")
+        second = self.client.get_json(f"{self.base_url}/etag")
+
+        self.assertEqual(first, second)
+        self.assertEqual(_ProviderStubHandler.connections, 1)
+        metrics = self.client.metrics()["127.0.0.1"]
+        self.assertEqual((metrics["requests"], metrics["not_modified"]), (2, 1))
+        self.assertGreater(metrics["bytes"], 0)
+
+    def test_retryable_status_is_retried(self):
+        self.assertEqual(self.client.get_json(f"{self.base_url}/flaky"), {"ok": True})
+        self.assertEqual(self.client.metrics()["127.0.0.1"]["retries"], 1)
+
+    def test_oversized_body_is_rejected(self):
+        with self.assertRaises(ResponseTooLarge):
+            self.client.get_json(f"{self.base_url}/big")
+
+    def test_usage_is_counted_for_the_tracking_caller_and_its_pool(self):
+        with track_http_usage() as usage:
+            self.client.get_json(f"{self.base_url}/etag")
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                pool.submit(with_http_usage(self.client.get_json), f"{self.base_url}/etag").result()
+        self.client.get_json(f"{self.base_url}/etag")
+
+        counted = usage.as_dict()
+        self.assertEqual((counted["requests"], counted["not_modified"]), (2, 1))
+        self.assertEqual(self.client.metrics()["127.0.0.1"]["requests"], 3)
+
+    def test_breaker_opens_after_repeated_failures_and_probes_after_cool_down(self):
+        client = ProviderHttpClient(
+            HostRateLimiter({}),
+            CircuitBreaker(failure_threshold=2, cooldown_seconds=0.2),
+            max_retries=0,
+        )
+        self.addCleanup(client.close)
+        for _ in range(2):
+            with self.assertRaises(HttpError):
+                client.get_json(f"{self.base_url}/down")
+
+        with self.assertRaises(CircuitOpen):
+            client.get_json(f"{self.base_url}/etag")
+        metrics = client.metrics()["127.0.0.1"]
+        self.assertEqual((metrics["requests"], metrics["rejected"]), (2, 1))
+        self.assertEqual(client.breaker.states()["127.0.0.1"]["state"], CircuitBreaker.OPEN)
+
+        time.sleep(0.25)
+        self.assertEqual(client.get_json(f"{self.base_url}/etag"), {"teams": ["A"]})
+        self.assertEqual(client.breaker.states()["127.0.0.1"]["state"], CircuitBreaker.CLOSED)
+
+    def test_every_failed_attempt_counts_towards_the_breaker(self):
+        client = ProviderHttpClient(
+            HostRateLimiter({}),
+            CircuitBreaker(failure_threshold=3, cooldown_seconds=60),
+            max_retries=5,
+            backoff_seconds=0.01,
+        )
+        self.addCleanup(client.close)
+        with self.assertRaises(HttpError):
+            client.get_json(f"{self.base_url}/down")
+
+        # Retries stop as soon as the third failed attempt opens the circuit.
+        self.assertEqual(client.metrics()["127.0.0.1"]["requests"], 3)
+        self.assertEqual(client.breaker.states()["127.0.0.1"]["state"], CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpen):
+            client.get_json(f"{self.base_url}/down")
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class TeamLogoMirrorTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _ProviderStubHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        _ProviderStubHandler.badge_calls = []
+        self.client = ProviderHttpClient(HostRateLimiter({}), max_retries=0)
+        self.addCleanup(self.client.close)
+
+    def _entities(self, *paths):
+        return [
+            TeamEntity(
+                id=f"logo-{index}",
+                name=f"Logo Team {index}",
+                discipline="football",
+                country="",
+                logo=f"{self.base_url}{path}",
+            )
+            for index, path in enumerate(paths)
+        ]
+
+    def test_badges_are_mirrored_once_per_content_for_synced_teams_only(self):
+        entities = self._entities("/badge.png", "/badge-copy.png", "/not-an-image", "/badge.png")
+        write_snapshot(entities, [], [])
+        Team.objects.filter(name="Logo Team 3").update(is_manual=True)
+
+        counts = mirror_team_logos(entities, client=self.client)
+
+        self.assertEqual(
+            counts,
+            {
+                "urls": 3,
+                "downloaded": 1,
+                "not_modified": 0,
+                "deduplicated": 1,
+                "failed": 1,
+                "attached": 2,
+            },
+        )
+        teams = {team.name: team for team in Team.objects.filter(name__startswith="Logo Team")}
+        self.assertEqual(teams["Logo Team 0"].logo.name, teams["Logo Team 1"].logo.name)
+        self.assertTrue(teams["Logo Team 0"].logo.name.startswith("logos/sync/"))
+        self.assertEqual(teams["Logo Team 0"].logo_url, teams["Logo Team 0"].logo.url)
+        with teams["Logo Team 0"].logo.open("rb") as stored:
+            self.assertEqual(stored.read(), BADGE_PNG)
+        self.assertFalse(teams["Logo Team 2"].logo)
+        self.assertFalse(teams["Logo Team 3"].logo)
+
+    def test_svg_and_markup_served_as_images_are_not_mirrored(self):
+        entities = self._entities("/badge.svg", "/html-as.png")
+        write_snapshot(entities, [], [])
+
+        counts = mirror_team_logos(entities, client=self.client)
+
+        self.assertEqual((counts["failed"], counts["downloaded"], counts["attached"]), (2, 0, 0))
+        self.assertFalse(
+            Team.objects.filter(name__startswith="Logo Team").exclude(logo="").exists()
+        )
+
+    def test_unchanged_badges_are_revalidated_without_writing(self):
+        entities = self._entities("/badge.png")
+        write_snapshot(entities, [], [])
+        mirror_team_logos(entities, client=self.client)
+        updated_at = Team.objects.get(name="Logo Team 0").updated_at
+
+        counts = mirror_team_logos(entities, client=self.client)
+
+        self.assertEqual((counts["not_modified"], counts["attached"]), (1, 0))
+        self.assertEqual(_ProviderStubHandler.badge_calls, [None, '"b1"'])
+        self.assertEqual(Team.objects.get(name="Logo Team 0").updated_at, updated_at)
+
+    @override_settings(SPORTS_HTTP_MODE="replay")
+    def test_replay_mode_does_not_download_badges(self):
+        entities = self._entities("/badge.png")
+        write_snapshot(entities, [], [])
+
+        self.assertEqual(mirror_team_logos(entities)["urls"], 0)
+        self.assertEqual(_ProviderStubHandler.badge_calls, [])
+
+
+@override_settings(SYNC_LOCK_DIR=tempfile.gettempdir(), CACHES=LOCMEM_CACHES)
+class ProviderCacheTests(SimpleTestCase):
+    def setUp(self):
+        caches["providers"].clear()
+
+    def _expire(self, key):
+        entry = caches["providers"].get(key)
+        entry["fresh_until"] = 0
+        caches["providers"].set(key, entry, None)
+
+    def _cached_value(self, key):
+        return caches["providers"].get(key)["value"]
+
+    # The background refresh holds the key lock until it has stored its result or given up.
+    def _wait_for_refresh(self, key):
+        self.assertTrue(_key_lock(key).acquire(timeout=5))
+        _key_lock(key).release()
+
+    def test_fresh_entry_is_served_without_fetching(self):
+        self.assertEqual(cached_fetch("k", 20, lambda: "v1", lambda: "failed"), "v1")
+        fetch = Mock(return_value="v2")
+
+        self.assertEqual(cached_fetch("k", 20, fetch, lambda: "failed"), "v1")
+        fetch.assert_not_called()
+
+    def test_stale_entry_is_served_while_refreshing_in_background(self):
+        cached_fetch("k", 20, lambda: "v1", lambda: "failed")
+        self._expire("k")
+
+        self.assertEqual(cached_fetch("k", 20, lambda: "v2", lambda: "failed"), "v1")
+        self._wait_for_refresh("k")
+        self.assertEqual(self._cached_value("k"), "v2")
+
+    def test_background_refresh_is_skipped_while_another_worker_holds_the_key(self):
+        cached_fetch("k", 20, lambda: "v1", lambda: "failed")
+        self._expire("k")
+        fetch = Mock(return_value="v2")
+
+        with single_flight(_refresh_lock_name("k")) as flight:
+            self.assertTrue(flight.acquired)
+            self.assertEqual(cached_fetch("k", 20, fetch, lambda: "failed"), "v1")
+            self._wait_for_refresh("k")
+
+        fetch.assert_not_called()
+        self.assertEqual(self._cached_value("k"), "v1")
+
+    def test_failed_refresh_keeps_the_last_good_value(self):
+        cached_fetch("k", 20, lambda: "v1", lambda: "failed")
+        self._expire("k")
+
+        def fetch():
+            raise OSError("upstream down")
+
+        self.assertEqual(cached_fetch("k", 20, fetch, lambda: "failed"), "v1")
+        self._wait_for_refresh("k")
+        self.assertEqual(self._cached_value("k"), "v1")
+
+    def test_open_circuit_keeps_the_last_good_value_until_the_probe_is_due(self):
+        cached_fetch("k", 20, lambda: "v1", lambda: "failed")
+        fetch = Mock(side_effect=CircuitOpen("liquipedia.net", 600))
+
+        self.assertEqual(cached_fetch("k", 20, fetch, lambda: "failed", refresh=True), "v1")
+        entry = caches["providers"].get("k")
+        self.assertGreater(entry["fresh_until"], time.time() + 500)
+
+    def test_cold_miss_fetches_once_for_concurrent_callers(self):
+        fetch = Mock(side_effect=lambda: time.sleep(0.1) or "v1")
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            values = list(
+                pool.map(lambda _: cached_fetch("k", 20, fetch, lambda: "failed"), range(4))
+            )
+
+        self.assertEqual(values, ["v1"] * 4)
+        self.assertEqual(fetch.call_count, 1)
@@ -2,10 +2,14 @@ from django.core.paginator import Paginator
 from django.shortcuts import get_object_or_404, render
 
 from articles.models import Article
+from core.page_cache import cache_public_page, public_query_string
 
 from .models import Match, Tournament
 
+TOURNAMENT_LIST_PARAMS = ("kind", "discipline", "page")
 
+
+@cache_public_page(namespaces=("tournaments",), query_params=TOURNAMENT_LIST_PARAMS)
 def tournament_list(request):
     kind = request.GET.get("kind", "").strip()
     discipline = request.GET.get("discipline", "").strip()
@@ -21,9 +25,6 @@ def tournament_list(request):
     paginator = Paginator(queryset, 9)
     page_obj = paginator.get_page(request.GET.get("page"))
 
-    query_params = request.GET.copy()
-    query_params.pop("page", None)
-
     return render(
         request,
         "tournaments/tournament_list.html",
@@ -35,7 +36,7 @@ def tournament_list(request):
                 "kind": kind,
                 "discipline": discipline,
             },
-            "pagination_query": query_params.urlencode(),
+            "pagination_query": public_query_string(request, TOURNAMENT_LIST_PARAMS),
             "discipline_choices": Tournament.DISCIPLINE_CHOICES,
             "breadcrumbs": [
                 {"label": "Главная", "url": "core:home"},
@@ -80,6 +81,10 @@ def tournament_detail(request, slug):
     )
 
 
+@cache_public_page(
+    namespaces=("matches",),
+    query_params=("category", "kind", "discipline", "status"),
+)
 def match_list(request):
     queryset = Match.objects.select_related("home_team", "away_team", "tournament")
 
@@ -138,7 +143,8 @@ def match_detail(request, pk):
     related_articles = (
         Article.objects.filter(
             status=Article.STATUS_PUBLISHED,
-            discipline=match.discipline or (match.tournament.discipline if match.tournament_id else ""),
+            discipline=match.discipline
+            or (match.tournament.discipline if match.tournament_id else ""),
         )
         .select_related("author")
         .prefetch_related("categories", "tags")